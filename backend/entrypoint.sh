@@ -69,10 +69,25 @@ else
     THREADS=${GUNICORN_THREADS:-2}
     BIND=${GUNICORN_BIND:-0.0.0.0:8000}
     TIMEOUT=${GUNICORN_TIMEOUT:-300}
+    SERVER_MODE=${SERVER_MODE:-wsgi}
 
-    echo "워커: $WORKERS, 스레드: $THREADS"
+    echo "모드: $SERVER_MODE, 워커: $WORKERS, 스레드: $THREADS"
     echo "바인드: $BIND, 타임아웃: ${TIMEOUT}초"
 
+    if [ "$SERVER_MODE" = "asgi" ]; then
+        # ASGI (uvicorn 워커): 비동기 뷰(/api/v1/chat/complete/async/)가 스레드 없이 동시 요청 처리
+        exec gunicorn \
+            --workers $WORKERS \
+            --worker-class uvicorn.workers.UvicornWorker \
+            --bind $BIND \
+            --timeout $TIMEOUT \
+            --access-logfile - \
+            --error-logfile - \
+            --log-level debug \
+            --capture-output \
+            weavai.asgi:application
+    fi
+
     # Gunicorn 실행 (디버그: 상세 로그 출력)
     exec gunicorn \
         --workers $WORKERS \
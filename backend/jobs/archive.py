@@ -0,0 +1,129 @@
+# WEAV AI Jobs 보관 (hot/cold)
+# 오래된 종료 작업을 MinIO gzip JSONL 세그먼트로 옮기고 ArchivedJob 색인만 DB에 남김
+
+import gzip
+import json
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from weavai.apps.storage.s3 import S3Storage
+from .models import ArchivedJob, Artifact, Job
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_KEY = 'archive/jobs/{date}/{segment_id}.jsonl.gz'
+
+
+def _fields(instance) -> Dict[str, Any]:
+    """모델 인스턴스의 컬럼 값 (FK는 *_id)"""
+    return {field.attname: field.value_from_object(instance) for field in instance._meta.concrete_fields}
+
+
+def _restore(model, data: Dict[str, Any]):
+    """_fields로 저장한 dict를 저장되지 않은 모델 인스턴스로 복원 (JSON 문자열 → datetime/UUID 등)"""
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in data:
+            value = data[field.attname]
+            values[field.attname] = field.to_python(value) if value is not None else None
+    return model(**values)
+
+
+def serialize_job(job: Job) -> bytes:
+    """작업 + 아티팩트를 JSONL 한 줄로 직렬화 (job.artifacts는 prefetch된 상태)"""
+    record = {
+        'job': _fields(job),
+        'artifacts': [_fields(artifact) for artifact in job.artifacts.all()],
+    }
+    return (json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def write_segment(storage: S3Storage, jobs: List[Job]) -> List[ArchivedJob]:
+    """
+    작업 묶음을 세그먼트 하나로 업로드
+
+    레코드마다 별도 gzip 멤버로 압축해 이어 붙임 — 파일 전체는 일반 .jsonl.gz로 읽히고
+    레코드 하나는 (offset, length) 구간만 내려받아 풀 수 있음.
+
+    Returns:
+        저장되지 않은 ArchivedJob 색인 목록
+
+    Raises:
+        ClientError: 업로드 실패
+    """
+    now = timezone.now()
+    key = SEGMENT_KEY.format(date=now.strftime('%Y/%m/%d'), segment_id=uuid.uuid4().hex)
+
+    body = bytearray()
+    entries = []
+    for job in jobs:
+        member = gzip.compress(serialize_job(job))
+        entries.append(ArchivedJob(
+            id=job.id,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            user_id=job.user_id,
+            status=job.status,
+            provider=job.provider,
+            model=job.model,
+            model_type=job.model_type,
+            artifact_count=len(job.artifacts.all()),
+            segment_key=key,
+            offset=len(body),
+            length=len(member),
+        ))
+        body.extend(member)
+
+    storage.upload_file(bytes(body), key, content_type='application/gzip',
+                        metadata={'jobs': str(len(entries))})
+    return entries
+
+
+def archive_job_chunk(storage: S3Storage, job_ids: list) -> int:
+    """
+    작업 한 묶음을 세그먼트로 옮기고 hot 테이블에서 삭제 (업로드 성공 후 짧은 트랜잭션 하나)
+
+    Returns:
+        보관된 작업 수
+    """
+    jobs = list(Job.objects.filter(id__in=job_ids).prefetch_related('artifacts'))
+    if not jobs:
+        return 0
+
+    entries = write_segment(storage, jobs)
+    archived_ids = [entry.id for entry in entries]
+    with transaction.atomic():
+        ArchivedJob.objects.bulk_create(entries)
+        Artifact.objects.filter(job_id__in=archived_ids).delete()
+        Job.objects.filter(id__in=archived_ids).only('id').delete()
+    return len(entries)
+
+
+def load_archived_job(storage: S3Storage, entry: ArchivedJob) -> Job:
+    """
+    색인이 가리키는 레코드를 Range 요청으로 읽어 저장되지 않은 Job으로 복원
+
+    아티팩트는 job.artifacts.all()로 읽히도록 prefetch 캐시에 넣고,
+    MinIO에 수집된 파일은 presigned URL을 새로 발급 (보관 시점의 URL은 만료됨).
+
+    Raises:
+        ClientError: 세그먼트 읽기 실패
+    """
+    raw = storage.download_range(entry.segment_key, entry.offset, entry.length)
+    record = json.loads(gzip.decompress(raw))
+
+    job = _restore(Job, record['job'])
+    artifacts = [_restore(Artifact, data) for data in record.get('artifacts', [])]
+
+    expires_in = storage.presigned_url_expiration
+    for artifact in artifacts:
+        artifact.job = job
+        if artifact.checksum and artifact.s3_key and not artifact.s3_key.startswith(('http://', 'https://')):
+            artifact.presigned_url = storage.generate_presigned_url(artifact.s3_key, expires_in)
+            artifact.presigned_url_expires_at = timezone.now() + timedelta(seconds=expires_in)
+    job._prefetched_objects_cache = {'artifacts': artifacts}
+    return job
@@ -0,0 +1,45 @@
+# WEAV AI 작업 상태 이벤트
+# 상태가 바뀔 때마다 Redis pub/sub으로 발행 → GET /api/v1/jobs/<id>/events/ (SSE)가 구독해 즉시 전달
+
+import json
+import logging
+from typing import Iterable
+import redis
+from django.db import transaction
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'jobs:events:{job_id}'
+ACTIVE_STATUSES = ('PENDING', 'IN_QUEUE', 'SUBMITTED', 'IN_PROGRESS')
+TERMINAL_STATUSES = ('COMPLETED', 'FAILED', 'CANCELLED')
+
+
+def channel(job_id) -> str:
+    return CHANNEL.format(job_id=job_id)
+
+
+def _publish(messages) -> None:
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for job_id, message in messages:
+            pipe.publish(channel(job_id), json.dumps(message, ensure_ascii=False))
+        pipe.execute()
+    except redis.RedisError as e:
+        # 구독자는 스트림 종료 후 상세 조회로 보정하므로 발행 실패는 무시
+        logger.warning(f"작업 상태 이벤트 발행 실패: {e}")
+
+
+def publish_status(job) -> None:
+    """작업 상태 변경 발행 (트랜잭션 커밋 후 — 구독자가 다시 조회했을 때 변경이 보이도록)"""
+    message = {'id': str(job.id), 'status': job.status}
+    if job.error:
+        message['error'] = job.error
+    transaction.on_commit(lambda: _publish([(job.id, message)]))
+
+
+def publish_statuses(job_ids: Iterable, status: str) -> None:
+    """여러 작업의 같은 상태 변경을 한 번에 발행 (일괄 update 후)"""
+    messages = [(job_id, {'id': str(job_id), 'status': status}) for job_id in job_ids]
+    if messages:
+        transaction.on_commit(lambda: _publish(messages))
@@ -1,16 +1,28 @@
 # WEAV AI FAL.ai Queue API 유틸리티
 # FAL.ai의 Queue API를 사용하여 비동기 작업 처리
-# 현재는 주석 처리되어 있음 - 추후 확장 예정
+# FAL_QUEUE_MODEL_TYPES에 포함된 모델 타입은 run_ai_job이 이 클라이언트로 제출
 
 import requests
 import json
 import logging
 from typing import Dict, Any, Optional, Tuple
 from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from weavai.apps.ai.transport import get_transport
 
 logger = logging.getLogger(__name__)
 
 
+def queue_app_id(model: str) -> str:
+    """
+    Queue 조회/취소 경로의 앱 ID ({owner}/{alias})
+
+    제출은 모델 전체 경로('fal-ai/sora-2/text-to-video')로 하지만
+    status/result/cancel은 앱 단위 경로('fal-ai/sora-2/requests/{id}')에서만 제공됨.
+    """
+    return '/'.join(model.strip('/').split('/')[:2])
+
+
 class FalQueueClient:
     """
     FAL.ai Queue API 클라이언트
@@ -32,23 +44,29 @@ class FalQueueClient:
         if not self.api_key:
             raise ValueError("FAL_KEY 설정이 필요합니다")
 
-        self.session = requests.Session()
-        self.session.headers.update({
+        # 커넥션 풀은 FalClient와 공유 (weavai.apps.ai.transport)
+        self.transport = get_transport()
+        self.headers = {
             'Authorization': f'Key {self.api_key}',
             'Content-Type': 'application/json',
-        })
+        }
+
+    def _requests_base(self, model: str = None) -> str:
+        """request_id 기반 조회/취소 URL의 공통 prefix (모델 경로가 아닌 앱 ID 기준, queue_app_id 참고)"""
+        if model:
+            return f"{self.BASE_URL}/{queue_app_id(model)}/requests"
+        return f"{self.BASE_URL}/requests"
 
     def submit_job(self, model: str, arguments: Dict[str, Any],
-                   webhook_url: str = None, webhook_secret: str = None,
+                   webhook_url: str = None,
                    object_lifecycle: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         새 작업을 FAL.ai Queue에 제출
 
         Args:
             model: AI 모델명 (예: 'fal-ai/flux-2')
-            arguments: 모델 입력 파라미터
-            webhook_url: 작업 완료 시 호출할 웹훅 URL
-            webhook_secret: 웹훅 서명용 시크릿
+            arguments: 모델 입력 파라미터 (요청 본문으로 그대로 전송)
+            webhook_url: 작업 완료 시 호출할 웹훅 URL (서명 토큰 포함, build_webhook_url 참고)
             object_lifecycle: 파일 라이프사이클 설정
 
         Returns:
@@ -60,16 +78,13 @@ class FalQueueClient:
         """
         url = f"{self.BASE_URL}/{model}"
 
-        # 요청 데이터 구성
-        data = {
-            "input": arguments,
-        }
+        # 요청 데이터 구성 (Queue API는 모델 입력을 본문으로 받음)
+        data = arguments
 
-        # 웹훅 설정 (선택사항)
+        # 웹훅 설정 (선택사항) - fal은 fal_webhook 쿼리 파라미터로 콜백 URL을 받음
+        params = {}
         if webhook_url:
-            data["webhook_url"] = webhook_url
-        if webhook_secret:
-            data["webhook_secret"] = webhook_secret
+            params["fal_webhook"] = webhook_url
 
         # Object Lifecycle 설정 (선택사항)
         headers = {}
@@ -80,10 +95,13 @@ class FalQueueClient:
         logger.debug(f"요청 데이터: {data}")
 
         try:
-            response = self.session.post(
+            response = self.transport.request(
+                'POST',
                 url,
+                endpoint=model,
                 json=data,
-                headers=headers,
+                params=params,
+                headers={**self.headers, **headers},
                 timeout=self.TIMEOUT
             )
             response.raise_for_status()
@@ -97,12 +115,13 @@ class FalQueueClient:
             logger.error(f"FAL.ai 작업 제출 실패: {e}")
             raise
 
-    def get_job_status(self, request_id: str) -> Dict[str, Any]:
+    def get_job_status(self, request_id: str, model: str = None) -> Dict[str, Any]:
         """
         작업 상태 조회
 
         Args:
             request_id: FAL.ai에서 반환한 request_id
+            model: 제출 시 사용한 모델명 (지정 시 모델별 requests 경로 사용)
 
         Returns:
             작업 상태 정보
@@ -110,12 +129,12 @@ class FalQueueClient:
         Raises:
             requests.RequestException: API 호출 실패
         """
-        url = f"{self.BASE_URL}/requests/{request_id}/status"
+        url = f"{self._requests_base(model)}/{request_id}/status"
 
         logger.debug(f"FAL.ai 작업 상태 조회: {request_id}")
 
         try:
-            response = self.session.get(url, timeout=self.TIMEOUT)
+            response = self.transport.request('GET', url, endpoint='queue/status', headers=self.headers, timeout=self.TIMEOUT)
             response.raise_for_status()
 
             result = response.json()
@@ -127,12 +146,13 @@ class FalQueueClient:
             logger.error(f"FAL.ai 작업 상태 조회 실패: {e}")
             raise
 
-    def get_job_result(self, request_id: str) -> Dict[str, Any]:
+    def get_job_result(self, request_id: str, model: str = None) -> Dict[str, Any]:
         """
         작업 결과 조회
 
         Args:
             request_id: FAL.ai에서 반환한 request_id
+            model: 제출 시 사용한 모델명 (지정 시 모델별 requests 경로 사용)
 
         Returns:
             작업 결과 데이터
@@ -140,12 +160,12 @@ class FalQueueClient:
         Raises:
             requests.RequestException: API 호출 실패
         """
-        url = f"{self.BASE_URL}/requests/{request_id}"
+        url = f"{self._requests_base(model)}/{request_id}"
 
         logger.debug(f"FAL.ai 작업 결과 조회: {request_id}")
 
         try:
-            response = self.session.get(url, timeout=self.TIMEOUT)
+            response = self.transport.request('GET', url, endpoint='queue/result', headers=self.headers, timeout=self.TIMEOUT)
             response.raise_for_status()
 
             result = response.json()
@@ -157,12 +177,13 @@ class FalQueueClient:
             logger.error(f"FAL.ai 작업 결과 조회 실패: {e}")
             raise
 
-    def cancel_job(self, request_id: str) -> Dict[str, Any]:
+    def cancel_job(self, request_id: str, model: str = None) -> Dict[str, Any]:
         """
         작업 취소
 
         Args:
             request_id: FAL.ai에서 반환한 request_id
+            model: 제출 시 사용한 모델명 (지정 시 모델별 requests 경로 사용)
 
         Returns:
             취소 결과
@@ -170,12 +191,12 @@ class FalQueueClient:
         Raises:
             requests.RequestException: API 호출 실패
         """
-        url = f"{self.BASE_URL}/requests/{request_id}/cancel"
+        url = f"{self._requests_base(model)}/{request_id}/cancel"
 
         logger.info(f"FAL.ai 작업 취소: {request_id}")
 
         try:
-            response = self.session.post(url, timeout=self.TIMEOUT)
+            response = self.transport.request('POST', url, endpoint='queue/cancel', headers=self.headers, timeout=self.TIMEOUT)
             response.raise_for_status()
 
             result = response.json()
@@ -204,7 +225,7 @@ class FalQueueClient:
         logger.info(f"FAL.ai 파일 다운로드: {file_url}")
 
         try:
-            response = self.session.get(file_url, timeout=timeout)
+            response = self.transport.request('GET', file_url, endpoint='download', timeout=timeout)
             response.raise_for_status()
 
             logger.info(f"FAL.ai 파일 다운로드 성공: {len(response.content)} bytes")
@@ -215,6 +236,42 @@ class FalQueueClient:
             raise
 
 
+# ===== 웹훅 서명 =====
+# fal 웹훅은 제출 시 넘긴 URL을 그대로 호출하므로, 작업별 HMAC 토큰을 URL에 넣어 검증
+
+WEBHOOK_SIGNING_SALT = 'jobs.fal_queue.webhook'
+
+
+def sign_webhook_token(job_id: str) -> str:
+    """작업 ID에 대한 웹훅 서명 토큰 생성"""
+    secret = getattr(settings, 'FAL_WEBHOOK_SECRET', '') or None
+    return salted_hmac(WEBHOOK_SIGNING_SALT, str(job_id), secret=secret, algorithm='sha256').hexdigest()
+
+
+def verify_webhook_token(job_id: str, token: str) -> bool:
+    """웹훅 요청의 서명 토큰 검증 (상수 시간 비교)"""
+    if not job_id or not token:
+        return False
+    return constant_time_compare(sign_webhook_token(job_id), token)
+
+
+def build_webhook_url(job_id: str) -> Optional[str]:
+    """
+    작업별 서명 웹훅 URL 생성
+
+    Returns:
+        FAL_WEBHOOK_BASE_URL이 설정되지 않았으면 None (폴링만 사용)
+    """
+    base_url = getattr(settings, 'FAL_WEBHOOK_BASE_URL', '')
+    if not base_url:
+        return None
+    from django.urls import reverse
+
+    # 토큰은 경로에 포함 (쿼리 문자열은 프록시·접근 로그에 남기 쉬움)
+    path = reverse('jobs:fal-webhook', kwargs={'job_id': job_id, 'token': sign_webhook_token(job_id)})
+    return f"{base_url.rstrip('/')}{path}"
+
+
 # 글로벌 클라이언트 인스턴스
 _fal_client = None
 
@@ -0,0 +1,76 @@
+# WEAV AI 작업 실행 heartbeat
+# 실행 중인 워커가 주기적으로 Job.heartbeat_at을 갱신 — 갱신이 끊긴 작업은 reap_stuck_jobs가 회수
+
+import logging
+import threading
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from . import slots
+
+logger = logging.getLogger(__name__)
+
+
+def timeout_for(model_type: str) -> int:
+    """
+    모델 타입별 heartbeat 유실 판단 시간 (초)
+
+    JOB_HEARTBEAT_TIMEOUTS('video=600,image=300')에 없는 타입은 JOB_HEARTBEAT_TIMEOUT 사용
+    """
+    for entry in getattr(settings, 'JOB_HEARTBEAT_TIMEOUTS', []):
+        name, _, value = str(entry).partition('=')
+        if name.strip() == model_type and value.strip().isdigit():
+            return int(value)
+    return settings.JOB_HEARTBEAT_TIMEOUT
+
+
+def min_timeout() -> int:
+    """설정된 타입별 유실 판단 시간 중 가장 짧은 값 (reaper 1차 필터용)"""
+    timeouts = [settings.JOB_HEARTBEAT_TIMEOUT]
+    for entry in getattr(settings, 'JOB_HEARTBEAT_TIMEOUTS', []):
+        value = str(entry).partition('=')[2].strip()
+        if value.isdigit():
+            timeouts.append(int(value))
+    return min(timeouts)
+
+
+class JobHeartbeat:
+    """
+    실행 중인 작업의 heartbeat 유지 (JOB_HEARTBEAT_INTERVAL마다 갱신, 슬롯 임대도 함께 연장)
+
+    갱신은 같은 실행 시도(attempts)의 IN_PROGRESS 행에만 적용 — reaper가 회수한 작업을 되살리지 않음.
+    updated_at은 건드리지 않으므로 ETag/since 기반 클라이언트 캐시에 영향 없음.
+    """
+
+    def __init__(self, job, model_type: str):
+        from .models import Job
+
+        self.queryset = Job.objects.filter(id=job.id, status='IN_PROGRESS', attempts=job.attempts)
+        self.job_id = job.id
+        self.user_id = job.user_id
+        self.model_type = model_type
+        self.interval = settings.JOB_HEARTBEAT_INTERVAL
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._keep_alive, daemon=True)
+
+    def _keep_alive(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not self.queryset.update(heartbeat_at=timezone.now()):
+                        logger.warning(f"Job {self.job_id} heartbeat 중단: 작업이 취소되었거나 다른 실행이 가져감")
+                        return
+                    slots.renew(self.user_id, self.model_type, self.job_id)
+                except Exception as e:
+                    logger.warning(f"Job {self.job_id} heartbeat 갱신 실패: {e}")
+        finally:
+            # 스레드 전용 DB 연결 정리
+            connection.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        return False
@@ -0,0 +1,67 @@
+# WEAV AI Jobs 결과 파일 수집
+# 제공자 임시 URL의 생성 결과를 MinIO로 스트리밍 저장 (워커 메모리는 청크 크기만큼만 사용)
+
+import logging
+import mimetypes
+from datetime import timedelta
+from typing import Dict, Any
+from django.utils import timezone
+from weavai.apps.ai.transport import get_transport
+from weavai.apps.storage.s3 import S3Storage
+from .models import Artifact
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 다운로드 청크 크기 (1MB)
+DOWNLOAD_TIMEOUT = (10, 300)       # (연결, 청크 간 읽기) 타임아웃 (초)
+
+
+def artifact_object_key(artifact: Artifact, content_type: str) -> str:
+    """아티팩트의 MinIO 객체 키 (jobs/<job_id>/<artifact_id>.<ext>)"""
+    extension = mimetypes.guess_extension(content_type or '') or ''
+    return f"jobs/{artifact.job_id}/{artifact.id}{extension}"
+
+
+def ingest_artifact(storage: S3Storage, artifact: Artifact) -> Dict[str, Any]:
+    """
+    아티팩트의 제공자 URL을 스트리밍으로 내려받아 MinIO에 업로드
+
+    DB 갱신은 하지 않고 갱신할 필드만 반환 (스레드 풀에서 실행되므로 DB 반영은 호출한 쪽에서).
+
+    Args:
+        storage: 공유 S3Storage (boto3 클라이언트는 스레드 안전)
+        artifact: 수집할 아티팩트 (presigned_url에 제공자 URL 보관)
+
+    Returns:
+        Artifact 갱신 필드 (s3_key, mime_type, size_bytes, checksum, presigned_url, presigned_url_expires_at)
+
+    Raises:
+        requests.RequestException: 다운로드 실패
+        ClientError: 업로드 실패
+    """
+    source_url = artifact.presigned_url
+    logger.info(f"아티팩트 수집 시작: {artifact.id} <- {source_url}")
+
+    with get_transport().request('GET', source_url, endpoint='download', stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip()
+        if not content_type or content_type == 'application/octet-stream':
+            content_type = artifact.mime_type or 'application/octet-stream'
+
+        key = artifact_object_key(artifact, content_type)
+        uploaded = storage.upload_stream(
+            response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE),
+            key,
+            content_type=content_type,
+            metadata={'job-id': str(artifact.job_id), 'artifact-id': str(artifact.id)},
+        )
+
+    expires_in = storage.presigned_url_expiration
+    return {
+        's3_key': uploaded['key'],
+        'mime_type': content_type,
+        'size_bytes': uploaded['size'],
+        'checksum': uploaded['sha256'],
+        'presigned_url': storage.generate_presigned_url(uploaded['key'], expires_in),
+        'presigned_url_expires_at': timezone.now() + timedelta(seconds=expires_in),
+    }
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_rename_model_id_to_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='checksum',
+            field=models.CharField(blank=True, help_text='SHA-256 체크섬 (MinIO 저장 완료 시 기록)', max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_artifact_checksum'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='jobs_job_user_id_215471_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_user_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='실행 시도 횟수 (워커 유실로 재실행되면 증가)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='실행 중인 워커의 마지막 heartbeat 시각', null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0006_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', '대기 중'), ('SUBMITTED', '제출됨'), ('IN_QUEUE', '큐 대기 중'), ('IN_PROGRESS', '진행 중'), ('COMPLETED', '완료됨'), ('FAILED', '실패함')], max_length=20)),
+                ('provider', models.CharField(choices=[('fal', 'FAL.ai')], max_length=20)),
+                ('model', models.CharField(max_length=100)),
+                ('artifact_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('segment_key', models.CharField(help_text='MinIO 세그먼트 객체 키 (gzip JSONL)', max_length=500)),
+                ('offset', models.PositiveBigIntegerField(help_text='세그먼트 내 레코드 시작 바이트')),
+                ('length', models.PositiveIntegerField(help_text='레코드 gzip 멤버 크기 (바이트)')),
+                ('user', models.ForeignKey(blank=True, help_text='작업을 생성한 사용자', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at', 'id'], name='jobs_archiv_user_id_805a11_idx')],
+            },
+        ),
+    ]
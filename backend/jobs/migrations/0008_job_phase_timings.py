@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_archived_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, help_text='COMPLETED/FAILED로 종료된 시각', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='provider_finished_at',
+            field=models.DateTimeField(blank=True, help_text='AI 제공자 응답(또는 Queue 결과) 수신 시각', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='provider_started_at',
+            field=models.DateTimeField(blank=True, help_text='AI 제공자 호출(또는 Queue 제출) 시각', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='queued_at',
+            field=models.DateTimeField(blank=True, help_text='워커 큐에 들어간 시각 (재실행 시 갱신)', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text='워커가 실행을 시작한 시각', null=True),
+        ),
+    ]
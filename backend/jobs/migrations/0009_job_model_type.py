@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:17
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def populate_model_type(apps, schema_editor):
+    """기존 작업의 model_type 채우기 (카탈로그 도입 전 모델명 부분 문자열 규칙)"""
+    is_video = Q(model__icontains='sora') | Q(model__icontains='video')
+    is_image = Q(model__icontains='flux') | Q(model__icontains='banana') | Q(model__icontains='image')
+    for name in ('Job', 'ArchivedJob'):
+        model = apps.get_model('jobs', name)
+        model.objects.filter(is_video).update(model_type='video')
+        model.objects.filter(is_image & ~is_video).update(model_type='image')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_phase_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedjob',
+            name='model_type',
+            field=models.CharField(choices=[('text', '텍스트'), ('image', '이미지'), ('video', '비디오')], default='text', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='model_type',
+            field=models.CharField(choices=[('text', '텍스트'), ('image', '이미지'), ('video', '비디오')], default='text', help_text='모델 타입 (생성 시 모델 카탈로그에서 결정)', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjob',
+            index=models.Index(fields=['user', 'model_type', 'created_at', 'id'], name='jobs_archiv_user_id_c2a004_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'model_type', 'created_at', 'id'], name='jobs_job_user_id_331aab_idx'),
+        ),
+        migrations.RunPython(populate_model_type, migrations.RunPython.noop),
+    ]
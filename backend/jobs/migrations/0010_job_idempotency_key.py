@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_model_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='작업 생성 요청의 Idempotency-Key (사용자별 고유)', max_length=210, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(fields=('user', 'idempotency_key'), name='jobs_job_user_idempotency_key_uniq'),
+        ),
+    ]
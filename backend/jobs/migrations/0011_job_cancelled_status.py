@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedjob',
+            name='status',
+            field=models.CharField(choices=[('PENDING', '대기 중'), ('SUBMITTED', '제출됨'), ('IN_QUEUE', '큐 대기 중'), ('IN_PROGRESS', '진행 중'), ('COMPLETED', '완료됨'), ('FAILED', '실패함'), ('CANCELLED', '취소됨')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='status',
+            field=models.CharField(choices=[('PENDING', '대기 중'), ('SUBMITTED', '제출됨'), ('IN_QUEUE', '큐 대기 중'), ('IN_PROGRESS', '진행 중'), ('COMPLETED', '완료됨'), ('FAILED', '실패함'), ('CANCELLED', '취소됨')], db_index=True, default='PENDING', max_length=20),
+        ),
+    ]
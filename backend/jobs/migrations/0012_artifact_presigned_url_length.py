@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_cancelled_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artifact',
+            name='presigned_url',
+            field=models.URLField(blank=True, help_text='임시 접근 URL (만료됨, SigV4 서명 URL은 200자를 넘음)', max_length=2048, null=True),
+        ),
+    ]
@@ -21,6 +21,7 @@ class Job(models.Model):
         ('IN_PROGRESS', '진행 중'),       # 처리 중
         ('COMPLETED', '완료됨'),          # 작업 성공적으로 완료됨
         ('FAILED', '실패함'),             # 작업 실패
+        ('CANCELLED', '취소됨'),          # 사용자가 취소 (슬롯 즉시 반환)
     ]
 
     # 제공자 정의 (확장 가능)
@@ -29,6 +30,13 @@ class Job(models.Model):
         # 향후 확장: ('replicate', 'Replicate')
     ]
 
+    # 모델 타입 정의 (weavai.apps.ai.catalog 기준)
+    MODEL_TYPE_CHOICES = [
+        ('text', '텍스트'),
+        ('image', '이미지'),
+        ('video', '비디오'),
+    ]
+
     # 기본 필드
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -59,12 +67,26 @@ class Job(models.Model):
         max_length=100,
         help_text='AI 모델명 (예: fal-ai/flux-2)'
     )
+    model_type = models.CharField(
+        max_length=10,
+        choices=MODEL_TYPE_CHOICES,
+        default='text',
+        help_text='모델 타입 (생성 시 모델 카탈로그에서 결정)'
+    )
 
     # 작업 파라미터 (JSON)
     arguments = models.JSONField(
         help_text='AI 모델에 전달할 파라미터들'
     )
 
+    # 클라이언트 재시도 중복 방지 (Idempotency-Key 헤더, 일괄 생성은 '<키>#<순번>')
+    idempotency_key = models.CharField(
+        max_length=210,
+        blank=True,
+        null=True,
+        help_text='작업 생성 요청의 Idempotency-Key (사용자별 고유)'
+    )
+
     # 결과 저장 옵션
     store_result = models.BooleanField(
         default=True,
@@ -103,6 +125,44 @@ class Job(models.Model):
         help_text='외부 AI 서비스의 작업 ID'
     )
 
+    # 단계별 시각 (대기/제공자/마무리 소요 시간 분리, jobs.timings 집계용)
+    queued_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='워커 큐에 들어간 시각 (재실행 시 갱신)'
+    )
+    started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='워커가 실행을 시작한 시각'
+    )
+    provider_started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='AI 제공자 호출(또는 Queue 제출) 시각'
+    )
+    provider_finished_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='AI 제공자 응답(또는 Queue 결과) 수신 시각'
+    )
+    completed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='COMPLETED/FAILED로 종료된 시각'
+    )
+
+    # 실행 추적 (워커 유실 감지용)
+    heartbeat_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='실행 중인 워커의 마지막 heartbeat 시각'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='실행 시도 횟수 (워커 유실로 재실행되면 증가)'
+    )
+
     # 오류 정보
     error = models.TextField(
         blank=True,
@@ -124,6 +184,11 @@ class Job(models.Model):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['provider', 'status']),
             models.Index(fields=['user', 'status']),
+            models.Index(fields=['user', 'created_at', 'id']),  # 목록 커서 페이지네이션
+            models.Index(fields=['user', 'model_type', 'created_at', 'id']),  # 타입 필터 목록
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'], name='jobs_job_user_idempotency_key_uniq'),
         ]
 
     def __str__(self):
@@ -141,9 +206,10 @@ class Job(models.Model):
 
     @property
     def duration(self):
-        """작업 소요 시간 (완료된 경우만)"""
-        if self.is_completed and self.updated_at and self.created_at:
-            return (self.updated_at - self.created_at).total_seconds()
+        """작업 소요 시간 (완료된 경우만, completed_at이 없는 이전 작업은 updated_at 기준)"""
+        finished_at = self.completed_at or self.updated_at
+        if self.is_completed and finished_at and self.created_at:
+            return (finished_at - self.created_at).total_seconds()
         return None
 
 
@@ -198,12 +264,19 @@ class Artifact(models.Model):
         null=True,
         help_text='파일 크기 (바이트)'
     )
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text='SHA-256 체크섬 (MinIO 저장 완료 시 기록)'
+    )
 
     # Presigned URL (임시 접근용)
     presigned_url = models.URLField(
+        max_length=2048,
         blank=True,
         null=True,
-        help_text='임시 접근 URL (만료됨)'
+        help_text='임시 접근 URL (만료됨, SigV4 서명 URL은 200자를 넘음)'
     )
 
     # 텍스트 콘텐츠 (텍스트 결과용)
@@ -237,3 +310,50 @@ class Artifact(models.Model):
 
         from django.utils import timezone
         return timezone.now() < self.presigned_url_expires_at
+
+
+class ArchivedJob(models.Model):
+    """
+    보관된 작업 색인 모델
+
+    오래된 종료 작업은 MinIO의 gzip JSONL 세그먼트로 옮기고 여기에는 목록/조회용 요약과 위치만 남김.
+    각 레코드는 독립된 gzip 멤버라 (segment_key, offset, length) Range 요청 한 번으로 복원 가능.
+    """
+
+    # 원본 작업 필드 (id는 원본 작업 id 그대로)
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='archived_jobs',
+        help_text='작업을 생성한 사용자'
+    )
+    status = models.CharField(max_length=20, choices=Job.STATUS_CHOICES)
+    provider = models.CharField(max_length=20, choices=Job.PROVIDER_CHOICES)
+    model = models.CharField(max_length=100)
+    model_type = models.CharField(max_length=10, choices=Job.MODEL_TYPE_CHOICES, default='text')
+    artifact_count = models.PositiveIntegerField(default=0)
+
+    # 보관 위치
+    archived_at = models.DateTimeField(auto_now_add=True)
+    segment_key = models.CharField(
+        max_length=500,
+        help_text='MinIO 세그먼트 객체 키 (gzip JSONL)'
+    )
+    offset = models.PositiveBigIntegerField(help_text='세그먼트 내 레코드 시작 바이트')
+    length = models.PositiveIntegerField(help_text='레코드 gzip 멤버 크기 (바이트)')
+
+    class Meta:
+        app_label = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id']),  # 목록 커서 페이지네이션
+            models.Index(fields=['user', 'model_type', 'created_at', 'id']),  # 타입 필터 목록
+        ]
+
+    def __str__(self):
+        return f"{self.provider} 보관 작업 {self.id} ({self.status})"
@@ -0,0 +1,87 @@
+# WEAV AI Jobs 앱 페이지네이션
+# (created_at, id) 키셋 커서 — 이력이 길어져도 페이지마다 인덱스 범위 스캔 한 번
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class JobCursorPagination(BasePagination):
+    """
+    작업 목록 키셋 페이지네이션 (최신순)
+
+    Query: ?cursor=<이전 응답의 next 커서>&limit=<1~100, 기본 PAGE_SIZE>
+    Response: {"next": "다음 페이지 URL 또는 null", "results": [...]}
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    max_limit = 100
+
+    def _limit(self, request) -> int:
+        default = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, default))
+        except (TypeError, ValueError):
+            limit = default
+        return max(1, min(limit, self.max_limit))
+
+    @staticmethod
+    def encode_cursor(obj) -> str:
+        raw = json.dumps([obj.created_at.isoformat(), str(obj.id)])
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, obj_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return datetime.fromisoformat(created_at), uuid.UUID(obj_id)
+        except (ValueError, TypeError, AttributeError, UnicodeError):
+            raise NotFound('잘못된 커서입니다.')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request)
+
+    def paginate_querysets(self, querysets, request):
+        """
+        여러 쿼리셋(예: 작업 + 보관 작업)을 같은 커서로 병합해 한 페이지 구성
+
+        쿼리셋마다 limit + 1개만 읽어 (created_at, id) 순으로 합침 — 쿼리셋당 인덱스 범위 스캔 한 번.
+        """
+        self.request = request
+        limit = self._limit(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        cursor_filter = None
+        if cursor:
+            created_at, obj_id = self.decode_cursor(cursor)
+            cursor_filter = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=obj_id)
+
+        # limit + 1개를 읽어 다음 페이지 존재 여부 확인 (COUNT 쿼리 없음)
+        page = []
+        for queryset in querysets:
+            if cursor_filter is not None:
+                queryset = queryset.filter(cursor_filter)
+            page.extend(queryset.order_by('-created_at', '-id')[:limit + 1])
+        if len(querysets) > 1:
+            page.sort(key=lambda obj: (obj.created_at, obj.id), reverse=True)
+        self.has_next = len(page) > limit
+        page = page[:limit]
+        self.next_cursor = self.encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
@@ -1,8 +1,10 @@
 # WEAV AI Jobs 앱 시리얼라이저
 # Job 및 Artifact 모델을 JSON으로 변환
 
+from pydantic import ValidationError as SchemaValidationError
 from rest_framework import serializers
-from .models import Job, Artifact
+from weavai.apps.ai.catalog import get_catalog
+from .models import ArchivedJob, Job, Artifact
 
 
 class ArtifactSerializer(serializers.ModelSerializer):
@@ -16,9 +18,9 @@ class ArtifactSerializer(serializers.ModelSerializer):
         model = Artifact
         fields = [
             'id', 'created_at', 'kind', 's3_key',
-            'mime_type', 'size_bytes', 'presigned_url'
+            'mime_type', 'size_bytes', 'checksum', 'presigned_url'
         ]
-        read_only_fields = ['id', 'created_at', 's3_key', 'mime_type', 'size_bytes']
+        read_only_fields = ['id', 'created_at', 's3_key', 'mime_type', 'size_bytes', 'checksum']
 
 
 class JobCreateSerializer(serializers.ModelSerializer):
@@ -26,6 +28,7 @@ class JobCreateSerializer(serializers.ModelSerializer):
     Job 생성용 시리얼라이저
 
     새 작업을 생성할 때 사용하는 입력 데이터 검증
+    (모델 카탈로그로 모델·arguments까지 검증하고 기본 인자와 model_type을 채움)
     """
 
     model = serializers.CharField()
@@ -55,6 +58,30 @@ class JobCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("arguments는 JSON 객체여야 합니다")
         return value
 
+    def validate(self, attrs):
+        """모델 카탈로그 기준 검증 (워커에서 실패하기 전에 제출 시점에 거절)"""
+        spec = get_catalog().resolve(attrs['model'])
+        if spec is None:
+            raise serializers.ValidationError({'model': f"지원하지 않는 모델입니다: {attrs['model']}"})
+        provider = attrs.get('provider', 'fal')
+        if spec.provider != provider:
+            raise serializers.ValidationError({'model': f"{provider} 제공자에서 사용할 수 없는 모델입니다: {spec.id}"})
+
+        arguments = {**spec.default_arguments, **attrs['arguments']}
+        try:
+            spec.schema(**{**arguments, 'model': spec.id})
+        except SchemaValidationError as e:
+            raise serializers.ValidationError({
+                'arguments': [
+                    f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            })
+
+        attrs['arguments'] = arguments
+        attrs['model_type'] = spec.model_type
+        return attrs
+
 
 class JobDetailSerializer(serializers.ModelSerializer):
     """
@@ -87,19 +114,25 @@ class JobListSerializer(serializers.ModelSerializer):
     """
     Job 목록용 시리얼라이저
 
-    목록 표시용으로 간단한 정보만 포함
+    목록 표시용으로 간단한 정보만 포함 (ArchivedJob 색인도 같은 형식으로 표시)
     """
 
     artifact_count = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
     model = serializers.CharField()
 
     class Meta:
         model = Job
         fields = [
             'id', 'created_at', 'status', 'provider',
-            'model', 'artifact_count'
+            'model', 'artifact_count', 'archived'
         ]
 
     def get_artifact_count(self, obj):
-        """생성된 아티팩트 수"""
-        return obj.artifacts.count()
+        """생성된 아티팩트 수 (목록 쿼리에서 annotate한 값 우선)"""
+        count = getattr(obj, 'artifact_count', None)
+        return count if count is not None else obj.artifacts.count()
+
+    def get_archived(self, obj):
+        """보관된 작업인지 (목록은 작업과 ArchivedJob 색인을 함께 표시)"""
+        return isinstance(obj, ArchivedJob)
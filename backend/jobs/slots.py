@@ -0,0 +1,154 @@
+# WEAV AI 사용자별 동시 작업 슬롯
+# Redis 정렬 집합 세마포어 (멤버: job_id, 점수: 임대 만료 시각) — 워커가 죽어도 임대 만료 후 슬롯 회수
+
+import logging
+from typing import Iterable, List, Optional, Tuple
+import redis
+from django.conf import settings
+from weavai.apps.ai.catalog import get_catalog
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+SLOT_KEY = 'jobs:slots:{user_id}:{model_type}'
+
+# 만료 임대 정리 → 이미 보유 중이면 갱신 → 여유가 있으면 획득 (시계는 Redis 서버 기준)
+_ACQUIRE_SCRIPT = """
+local t = redis.call('time')
+local now = tonumber(t[1])
+local lease = tonumber(ARGV[3])
+redis.call('zremrangebyscore', KEYS[1], '-inf', now)
+if not redis.call('zscore', KEYS[1], ARGV[1]) and redis.call('zcard', KEYS[1]) >= tonumber(ARGV[2]) then
+  return 0
+end
+redis.call('zadd', KEYS[1], now + lease, ARGV[1])
+redis.call('expire', KEYS[1], lease)
+return 1
+"""
+
+# 임대 연장 (만료로 정리된 멤버도 다시 추가 — 호출한 쪽이 DB에서 진행 중인 작업만 넘김)
+_RENEW_SCRIPT = """
+local t = redis.call('time')
+local lease = tonumber(ARGV[2])
+redis.call('zadd', KEYS[1], tonumber(t[1]) + lease, ARGV[1])
+redis.call('expire', KEYS[1], lease)
+return 1
+"""
+
+
+def _key(user_id, model_type: str) -> str:
+    return SLOT_KEY.format(user_id=user_id, model_type=model_type or 'text')
+
+
+def slot_limit(model_type: str) -> int:
+    """
+    모델 타입별 사용자당 동시 작업 수
+
+    JOB_SLOT_LIMITS('video=2,image=4')에 없는 타입은 MAX_CONCURRENT_JOBS_PER_USER 사용
+    (모델 카탈로그에 동시 실행 한도가 있는 타입은 그 값이 더 작으면 그 값)
+    """
+    for entry in getattr(settings, 'JOB_SLOT_LIMITS', []):
+        name, _, value = str(entry).partition('=')
+        if name.strip() == model_type and value.strip().isdigit():
+            return int(value)
+    limit = settings.MAX_CONCURRENT_JOBS_PER_USER
+    return min(limit, get_catalog().type_concurrency.get(model_type, limit))
+
+
+def acquire(user_id, model_type: str, job_id) -> Optional[bool]:
+    """
+    작업 슬롯 획득
+
+    Returns:
+        True(획득) / False(한도 초과) / None(Redis 장애 — 호출한 쪽에서 대체 검사)
+    """
+    try:
+        acquired = get_redis().register_script(_ACQUIRE_SCRIPT)(
+            keys=[_key(user_id, model_type)],
+            args=[str(job_id), slot_limit(model_type), settings.JOB_SLOT_LEASE_SECONDS],
+        )
+        return bool(acquired)
+    except redis.RedisError as e:
+        logger.warning(f"작업 슬롯 획득 실패 (Redis): {e}")
+        return None
+
+
+def acquire_many(user_id, entries: List[Tuple[str, object]]) -> Optional[bool]:
+    """
+    여러 작업 슬롯을 한 번에 획득 (일괄 생성용, 전부 획득하거나 하나도 획득하지 않음)
+
+    Args:
+        entries: (model_type, job_id) 목록
+
+    Returns:
+        True(전부 획득) / False(하나라도 한도 초과 — 획득한 슬롯은 반환) / None(Redis 장애)
+    """
+    try:
+        client = get_redis()
+        acquire_script = client.register_script(_ACQUIRE_SCRIPT)
+        # MULTI/EXEC로 묶어 다른 요청의 획득이 중간에 끼어들지 않도록 함
+        pipe = client.pipeline(transaction=True)
+        for model_type, job_id in entries:
+            acquire_script(
+                keys=[_key(user_id, model_type)],
+                args=[str(job_id), slot_limit(model_type), settings.JOB_SLOT_LEASE_SECONDS],
+                client=pipe,
+            )
+        results = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"작업 슬롯 일괄 획득 실패 (Redis): {e}")
+        return None
+
+    if all(results):
+        return True
+    release_many(user_id, [entry for entry, acquired in zip(entries, results) if acquired])
+    return False
+
+
+def renew_many(slots: Iterable[Tuple[object, str, object]]) -> None:
+    """
+    진행 중인 작업들의 임대 연장
+
+    임대가 이미 만료돼 정리됐으면 다시 추가 — 큐에서 JOB_SLOT_LEASE_SECONDS보다 오래 기다린 작업도 슬롯을 유지.
+    해제된 슬롯을 되살리지 않도록 DB에서 진행 중(ACTIVE_STATUSES)인 작업만 넘길 것.
+
+    Args:
+        slots: (user_id, model_type, job_id) 목록
+    """
+    try:
+        client = get_redis()
+        renew = client.register_script(_RENEW_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for user_id, model_type, job_id in slots:
+            renew(keys=[_key(user_id, model_type)], args=[str(job_id), settings.JOB_SLOT_LEASE_SECONDS], client=pipe)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"작업 슬롯 임대 연장 실패 (Redis): {e}")
+
+
+def renew(user_id, model_type: str, job_id) -> None:
+    """진행 중인 작업의 임대 연장 (renew_many 참고)"""
+    renew_many([(user_id, model_type, job_id)])
+
+
+def release_many(user_id, entries: List[Tuple[str, object]]) -> None:
+    """
+    작업 슬롯 반환 (이미 반환/만료된 경우 무시)
+
+    Args:
+        entries: (model_type, job_id) 목록
+    """
+    if not entries:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for model_type, job_id in entries:
+            pipe.zrem(_key(user_id, model_type), str(job_id))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"작업 슬롯 반환 실패 (Redis): {e}")
+
+
+def release(user_id, model_type: str, job_id) -> None:
+    """작업 슬롯 반환 (이미 반환/만료된 경우 무시)"""
+    release_many(user_id, [(model_type, job_id)])
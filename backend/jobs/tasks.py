@@ -2,10 +2,21 @@
 # AI 작업 처리 (fal.ai 통합)
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+import requests
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from .models import Job, Artifact
-# from .fal_queue import get_fal_client  # FAL.ai 제외
+from . import events, heartbeat, slots, timings
+from .fal_queue import get_fal_client, build_webhook_url
 from weavai.apps.storage.s3 import S3Storage
 from weavai.apps.ai.system_rules import prepend_model_rule
 
@@ -14,16 +25,161 @@ logger = logging.getLogger(__name__)
 
 # ===== AI 작업 비동기 처리 =====
 
-MAX_CONCURRENT_JOBS_PER_USER = 4
+# FAL Queue에 제출되어 폴러/웹훅이 완료를 기다리는 상태
+FAL_QUEUE_ACTIVE_STATUSES = ('SUBMITTED', 'IN_PROGRESS')
+FAL_QUEUE_POLL_LOCK_KEY = 'jobs:poll_fal_queue_jobs:lock'
+CLEANUP_PROGRESS_KEY = 'jobs:cleanup_old_jobs:progress'  # 마지막 정리 실행의 진행 상황
+
+
+def _uses_fal_queue(job: Job, model_type: str) -> bool:
+    """Queue 모드 대상인지 (이미지/비디오 중 FAL_QUEUE_MODEL_TYPES에 포함된 타입)"""
+    if job.provider != 'fal' or model_type not in ('image', 'video'):
+        return False
+    return model_type in getattr(settings, 'FAL_QUEUE_MODEL_TYPES', ())
+
+
+def _on_job_finished(job: Job) -> None:
+    """종료(COMPLETED/FAILED/CANCELLED)된 작업 후처리: 동시 실행 슬롯 반환 + 상태 이벤트 발행 + 소요 시간 집계 (트랜잭션 커밋 후)"""
+    user_id, model_type, job_id = job.user_id, job.model_type, job.id
+    transaction.on_commit(lambda: slots.release(user_id, model_type, job_id))
+    transaction.on_commit(lambda: timings.record_job(job))
+    events.publish_status(job)
+
+
+def _save_terminal(job: Job, fields: list) -> bool:
+    """
+    종료 상태 저장 — 아직 종료되지 않은 작업만 (실행 중 취소된 작업의 결과로 CANCELLED를 덮어쓰지 않음)
+
+    Returns:
+        저장 여부
+    """
+    job.updated_at = timezone.now()
+    values = {field: getattr(job, field) for field in fields}
+    return bool(
+        Job.objects.filter(id=job.id)
+        .exclude(status__in=events.TERMINAL_STATUSES)
+        .update(updated_at=job.updated_at, **values)
+    )
+
+
+def _fail_job(job: Job, error: str) -> None:
+    """작업을 FAILED로 종료 (종료 시각 기록 후 _on_job_finished)"""
+    job.status = 'FAILED'
+    job.error = error
+    job.completed_at = timezone.now()
+    if not _save_terminal(job, ['status', 'error', 'provider_started_at', 'provider_finished_at', 'completed_at']):
+        logger.info(f"Job {job.id} already finished (cancelled), drop failure: {error}")
+        return
+    _on_job_finished(job)
+
+
+def _complete_job(job: Job, ai_result: dict, model_type: str) -> None:
+    """표준화된 AI 결과를 Job/Artifact에 반영"""
+    job.status = 'COMPLETED'
+    job.result_json = ai_result
+    job.completed_at = timezone.now()
+    if not _save_terminal(job, ['status', 'result_json', 'provider_started_at', 'provider_finished_at', 'completed_at']):
+        logger.info(f"Job {job.id} already finished (cancelled), drop result")
+        return
+
+    if ai_result.get('text'):
+        Artifact.objects.create(job=job, kind='text', text_content=ai_result['text'])
+    elif ai_result.get('url'):
+        kind = 'image' if model_type == 'image' else 'video' if model_type == 'video' else 'file'
+        Artifact.objects.bulk_create([
+            Artifact(
+                job=job,
+                kind=kind,
+                s3_key=url,
+                presigned_url=url,
+                mime_type=ai_result.get('mime_type') or ('image/png' if kind == 'image' else 'video/mp4'),
+                size_bytes=ai_result.get('size_bytes')
+            )
+            for url in (ai_result.get('urls') or [ai_result['url']])
+        ])
+        if job.store_result:
+            # 제공자 URL은 만료되므로 커밋 후 MinIO로 수집
+            job_id = str(job.id)
+            transaction.on_commit(lambda: ingest_job_artifacts.delay(job_id))
+    _on_job_finished(job)
+    logger.info(f"AI job completed: {job.id}")
+
+
+def _submit_to_fal_queue(job: Job, model_type: str, arguments: dict) -> None:
+    """FAL Queue에 제출하고 request_id를 저장 (결과는 웹훅 또는 poll_fal_queue_jobs가 처리)"""
+    from weavai.apps.ai import circuit_breaker, rate_limit
+    from weavai.apps.ai.errors import AIQuotaExceededError
+    from weavai.apps.ai.router import ai_router
+
+    endpoint, payload = ai_router.prepare_media_request(job.provider, model_type, arguments)
+    circuit_breaker.guard(job.provider, endpoint)
+
+    def submit():
+        job.provider_started_at = timezone.now()
+        try:
+            return get_fal_client().submit_job(endpoint, payload, webhook_url=build_webhook_url(job.id))
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 429:
+                raise AIQuotaExceededError(job.provider) from e
+            raise
+
+    # 동기 호출과 같은 (제공자, 모델) 버킷을 공유
+    submitted = rate_limit.call(job.provider, endpoint, submit)
+    request_id = submitted.get('request_id')
+    if not request_id:
+        raise ValueError('FAL Queue 응답에 request_id가 없습니다')
+
+    job.status = 'SUBMITTED'
+    job.external_job_id = request_id
+    job.updated_at = timezone.now()
+    submitted = Job.objects.filter(id=job.id, status='IN_PROGRESS').update(
+        status='SUBMITTED', external_job_id=request_id, provider_started_at=job.provider_started_at,
+        updated_at=job.updated_at
+    )
+    if not submitted:
+        # 제출 응답보다 웹훅이 먼저 와서 이미 완료됐을 수 있음 — 취소된 경우에만 제공자 요청도 취소
+        current = Job.objects.filter(id=job.id).values_list('status', flat=True).first()
+        if current == 'CANCELLED':
+            cancel_fal_queue_request.delay(str(job.id), request_id, endpoint)
+            logger.info(f"AI job cancelled while submitting to FAL queue: {job.id} request_id={request_id}")
+        else:
+            logger.info(f"AI job finished before FAL queue submission was recorded: {job.id} status={current}")
+        return
+    events.publish_status(job)
+    logger.info(f"AI job submitted to FAL queue: {job.id} request_id={request_id}")
+
+def _requeue_job(job: Job) -> bool:
+    """
+    실행 중인 작업을 IN_QUEUE로 되돌리기 (제공자 한도 초과 후 재시도용)
+
+    Returns:
+        되돌렸는지 여부 (그 사이 취소·종료됐으면 False)
+    """
+    now = timezone.now()
+    # 제공자가 처리하지 않은 실행이므로 attempts(유실 재실행 한도)에서 제외
+    requeued = Job.objects.filter(id=job.id, status='IN_PROGRESS').update(
+        status='IN_QUEUE', queued_at=now, started_at=None, heartbeat_at=None,
+        provider_started_at=None, provider_finished_at=None, attempts=F('attempts') - 1, updated_at=now
+    )
+    if not requeued:
+        return False
+    job.refresh_from_db(fields=['status', 'queued_at', 'started_at', 'heartbeat_at', 'attempts', 'updated_at'])
+    job.provider_started_at = job.provider_finished_at = None
+    events.publish_status(job)
+    return True
+
 
 @shared_task(bind=True, max_retries=3)
-def run_ai_job(self, job_id: str) -> None:
+def run_ai_job(self, job_id: str, model_type: str = None) -> None:
     """
     AI 작업 실행 Celery 태스크.
     Job을 IN_PROGRESS로 두고 ai_router로 실제 호출 후, 결과를 Job/Artifact에 반영.
+
+    model_type은 큐 라우팅용 (config_celery.route_ai_job) — 실행 시에는 job.model_type 사용.
+    태스크 id는 작업 id (job_signature) — 시작 전에 취소되면 cancel_job이 메시지를 revoke.
     """
     from weavai.apps.ai.router import ai_router
-    from weavai.apps.ai.errors import AIProviderError, AIRequestError, AIQuotaExceededError
+    from weavai.apps.ai.errors import AIProviderError, AIRequestError, AIQuotaExceededError, AICircuitOpenError
 
     try:
         job = Job.objects.get(id=job_id)
@@ -31,20 +187,20 @@ def run_ai_job(self, job_id: str) -> None:
         logger.error(f"Job not found: {job_id}")
         return
 
-    if job.status not in ('PENDING', 'IN_QUEUE'):
+    # 상태 확인과 전이를 한 번에 (재전달된 메시지와 reaper 재실행이 겹쳐도 한 번만 실행)
+    now = timezone.now()
+    claimed = Job.objects.filter(id=job_id, status__in=('PENDING', 'IN_QUEUE')).update(
+        status='IN_PROGRESS', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1, updated_at=now
+    )
+    if not claimed:
         logger.warning(f"Job {job_id} already processed (status={job.status})")
         return
+    job.refresh_from_db(fields=['status', 'started_at', 'heartbeat_at', 'attempts', 'updated_at'])
+    events.publish_status(job)
 
-    job.status = 'IN_PROGRESS'
-    job.save(update_fields=['status', 'updated_at'])
-
-    model = (job.model or '').lower()
-    if any(token in model for token in ('sora', 'video')):
-        model_type = 'video'
-    elif any(token in model for token in ('flux', 'banana', 'image')):
-        model_type = 'image'
-    else:
-        model_type = 'text'
+    model_type = job.model_type
+    # 큐 대기 중 줄어든 임대를 실행 시작 시점 기준으로 연장
+    slots.renew(job.user_id, model_type, job.id)
 
     try:
         # arguments에 model 추가 (이미지/비디오 생성 시 모델 선택용)
@@ -70,48 +226,461 @@ def run_ai_job(self, job_id: str) -> None:
                         system_prompt = f"이전 대화:\n{history_text}"
                     arguments['system_prompt'] = system_prompt
             arguments.pop('history', None)
-        
-        ai_result = ai_router.route_and_run(
-            provider=job.provider,
-            model_type=model_type,
-            arguments=arguments
-        )
-    except AIQuotaExceededError as e:
-        job.status = 'FAILED'
-        job.error = f"quota_exceeded: {e}"
-        job.save(update_fields=['status', 'error', 'updated_at'])
-        logger.error(f"AI job quota exceeded: {job_id} - {e}")
+
+        if _uses_fal_queue(job, model_type):
+            # 제출만 하고 워커 반환 — 완료는 poll_fal_queue_jobs에서 처리
+            _submit_to_fal_queue(job, model_type, arguments)
+            return
+
+        job.provider_started_at = timezone.now()
+        try:
+            with heartbeat.JobHeartbeat(job, model_type):
+                ai_result = ai_router.route_and_run(
+                    provider=job.provider,
+                    model_type=model_type,
+                    arguments=arguments,
+                    user_id=job.user_id,
+                )
+        finally:
+            job.provider_finished_at = timezone.now()
+    except (AIQuotaExceededError, AICircuitOpenError) as e:
+        reason = 'circuit_open' if isinstance(e, AICircuitOpenError) else 'quota_exceeded'
+        if self.request.retries < self.max_retries and _requeue_job(job):
+            # 제공자 한도 초과·서킷 열림 — 실패시키지 않고 큐에 되돌려 나중에 다시 실행 (재시도마다 대기 시간 2배)
+            countdown = max(settings.AI_RATE_LIMIT_RETRY_DELAY * 2 ** self.request.retries, getattr(e, 'retry_after', None) or 0)
+            logger.warning(f"AI job {reason}, retrying in {countdown}s: {job_id}")
+            raise self.retry(countdown=countdown, exc=e)
+        _fail_job(job, f"{reason}: {e}")
+        logger.error(f"AI job {reason}: {job_id} - {e}")
         return
     except (AIProviderError, AIRequestError) as e:
-        job.status = 'FAILED'
-        job.error = f"provider_error: {e}"
-        job.save(update_fields=['status', 'error', 'updated_at'])
+        _fail_job(job, f"provider_error: {e}")
         logger.error(f"AI job failed: {job_id} - {e}")
         return
     except Exception as e:
-        job.status = 'FAILED'
-        job.error = str(e)
-        job.save(update_fields=['status', 'error', 'updated_at'])
+        _fail_job(job, str(e))
         logger.exception(f"AI job error: {job_id}")
         return
 
-    job.status = 'COMPLETED'
-    job.result_json = ai_result
-    job.save(update_fields=['status', 'result_json', 'updated_at'])
+    _complete_job(job, ai_result, model_type)
 
-    if ai_result.get('text'):
-        Artifact.objects.create(job=job, kind='text', text_content=ai_result['text'])
-    elif ai_result.get('url'):
-        kind = 'image' if model_type == 'image' else 'video' if model_type == 'video' else 'file'
-        Artifact.objects.create(
-            job=job,
-            kind=kind,
-            s3_key=ai_result.get('url'),
-            presigned_url=ai_result['url'],
-            mime_type=ai_result.get('mime_type') or ('image/png' if kind == 'image' else 'video/mp4'),
-            size_bytes=ai_result.get('size_bytes')
+
+def job_signature(job_id, model_type: str):
+    """run_ai_job 시그니처 (태스크 id = 작업 id, 모델 타입별 큐로 라우팅)"""
+    return run_ai_job.signature((str(job_id),), {'model_type': model_type}, task_id=str(job_id))
+
+
+# ===== 작업 취소 =====
+
+def cancel_job(job: Job) -> bool:
+    """
+    진행 중인 작업 취소 (CANCELLED 전이 + 슬롯 반환 + 상태 이벤트, 트랜잭션 커밋 후)
+
+    시작 전(PENDING/IN_QUEUE)이면 큐에 남은 run_ai_job 메시지를 revoke하고,
+    FAL Queue에 제출된 요청은 cancel_fal_queue_request로 제공자에도 취소 요청.
+    동기 호출 중인 작업은 제공자 호출을 중단할 수 없으므로 워커가 끝날 때 결과를 버림 (_save_terminal).
+
+    Returns:
+        취소 여부 (이미 종료된 작업은 False)
+    """
+    from weavai.config_celery import app
+
+    now = timezone.now()
+    with transaction.atomic():
+        cancelled = Job.objects.filter(id=job.id, status__in=events.ACTIVE_STATUSES).update(
+            status='CANCELLED', completed_at=now, updated_at=now
         )
-    logger.info(f"AI job completed: {job_id}")
+        if not cancelled:
+            return False
+        previous_status = job.status
+        job.refresh_from_db(fields=['status', 'external_job_id', 'completed_at', 'updated_at'])
+        _on_job_finished(job)
+
+    if job.external_job_id:
+        cancel_fal_queue_request.delay(str(job.id), job.external_job_id, job.model)
+    elif previous_status in ('PENDING', 'IN_QUEUE'):
+        # 아직 시작하지 않은 메시지는 워커가 받자마자 버림 (이미 받았어도 run_ai_job의 상태 검사에서 건너뜀)
+        try:
+            app.control.revoke(str(job.id))
+        except Exception as e:
+            logger.warning(f"Job {job.id} 태스크 revoke 실패: {e}")
+    logger.info(f"AI job cancelled: {job.id} (was {previous_status})")
+    return True
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def cancel_fal_queue_request(self, job_id: str, request_id: str, model: str) -> bool:
+    """
+    취소된 작업의 FAL Queue 요청 취소 (제공자 처리량 반환)
+
+    Returns:
+        제공자가 취소를 받아들였는지 (이미 완료된 요청 등 4xx는 재시도하지 않고 False)
+    """
+    try:
+        get_fal_client().cancel_job(request_id, model=model)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code < 500:
+            logger.info(f"FAL queue request not cancellable: {job_id} request_id={request_id} ({e.response.status_code})")
+            return False
+        raise self.retry(exc=e)
+    except requests.RequestException as e:
+        raise self.retry(exc=e)
+    return True
+
+
+# ===== 결과 파일 MinIO 수집 =====
+
+@shared_task(bind=True, max_retries=3)
+def ingest_job_artifacts(self, job_id: str) -> int:
+    """
+    완료된 작업의 결과 파일을 제공자 URL에서 MinIO로 스트리밍 저장
+
+    아티팩트 여러 개는 스레드 풀로 동시에 수집하고 DB 반영은 현재 스레드에서 처리.
+    수집 완료 여부는 checksum으로 판단하므로 재시도 시 이미 저장된 파일은 건너뜀.
+
+    Returns:
+        이번 실행에서 저장된 아티팩트 수
+    """
+    from .ingestion import ingest_artifact
+
+    artifacts = list(
+        Artifact.objects.filter(
+            job_id=job_id,
+            kind__in=('image', 'video', 'file'),
+            checksum__isnull=True,
+            presigned_url__isnull=False,
+        )
+    )
+    if not artifacts:
+        return 0
+
+    started = time.monotonic()
+    storage = S3Storage()
+    max_workers = max(1, min(settings.ARTIFACT_INGEST_CONCURRENCY, len(artifacts)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(artifact, executor.submit(ingest_artifact, storage, artifact)) for artifact in artifacts]
+
+    ingested = 0
+    failed = []
+    for artifact, future in futures:
+        try:
+            fields = future.result()
+        except Exception as e:
+            logger.warning(f"아티팩트 수집 실패: {artifact.id} - {e}")
+            failed.append(e)
+            continue
+        for name, value in fields.items():
+            setattr(artifact, name, value)
+        artifact.save(update_fields=list(fields.keys()))
+        ingested += 1
+
+    if ingested:
+        # 아티팩트만 바뀌었으므로 작업 버전(updated_at)을 올려 상세 ETag/캐시를 갱신
+        Job.objects.filter(id=job_id).update(updated_at=timezone.now())
+    logger.info(f"아티팩트 수집 완료: job={job_id} {ingested}/{len(artifacts)}")
+    if ingested and not failed:
+        model = Job.objects.filter(id=job_id).values_list('model', flat=True).first()
+        if model:
+            timings.record(model, {timings.INGEST_PHASE: time.monotonic() - started})
+    if failed and self.request.retries < self.max_retries:
+        raise self.retry(countdown=30, exc=failed[0])
+    return ingested
+
+# ===== FAL Queue 완료 폴링 =====
+
+def _fetch_fal_status(client, job: Job):
+    """
+    FAL 작업 상태 조회 (스레드 풀에서 실행)
+
+    Returns:
+        (fal 상태, 오류 메시지) — 둘 다 None이면 일시적 오류로 다음 주기에 재시도
+        제공자가 요청을 모르는 경우(404/410)만 오류로 종료, 그 밖의 4xx는 warning 후 재시도 (FAL_QUEUE_MAX_AGE가 상한)
+    """
+    try:
+        return client.get_job_status(job.external_job_id, model=job.model).get('status'), None
+    except requests.HTTPError as e:
+        response = e.response
+        if response is not None and 400 <= response.status_code < 500:
+            logger.warning(
+                f"FAL queue status rejected: {job.id} request_id={job.external_job_id} "
+                f"({response.status_code}) {response.text[:500]}"
+            )
+            if response.status_code in (404, 410):
+                return None, f"provider_error: FAL queue request not found ({response.status_code})"
+            return None, None
+        logger.warning(f"FAL queue status check failed: {job.id} - {e}")
+        return None, None
+    except requests.RequestException as e:
+        logger.warning(f"FAL queue status check failed: {job.id} - {e}")
+        return None, None
+
+
+def _fetch_fal_result(client, job: Job):
+    """
+    FAL 작업 결과 조회 (스레드 풀에서 실행)
+
+    Returns:
+        (결과 데이터, 오류 메시지) — 둘 다 None이면 일시적 오류로 다음 주기에 재시도
+    """
+    try:
+        return client.get_job_result(job.external_job_id, model=job.model), None
+    except requests.HTTPError as e:
+        response = e.response
+        if response is not None and 400 <= response.status_code < 500:
+            # 생성 실패는 결과 조회가 4xx로 응답됨
+            return None, f"provider_error: {response.text[:1000]}"
+        logger.warning(f"FAL queue result fetch failed: {job.id} - {e}")
+        return None, None
+    except requests.RequestException as e:
+        logger.warning(f"FAL queue result fetch failed: {job.id} - {e}")
+        return None, None
+
+
+def _finish_fal_queue_job(job_id, data: dict = None, error: str = None) -> bool:
+    """
+    Queue 작업을 COMPLETED/FAILED로 전환 (폴러·웹훅 공용)
+
+    행 잠금 후 상태를 다시 확인하므로 같은 작업이 두 번 완료 처리되지 않음.
+
+    Returns:
+        이번 호출에서 상태를 전환했는지 여부
+    """
+    from weavai.apps.ai.router import ai_router
+    from weavai.apps.ai.errors import AIServiceError
+
+    with transaction.atomic():
+        job = Job.objects.select_for_update().filter(id=job_id).first()
+        if job is None or job.status not in FAL_QUEUE_ACTIVE_STATUSES:
+            return False
+        job.provider_finished_at = timezone.now()
+
+        if error is None:
+            model_type = job.model_type
+            try:
+                ai_result = ai_router.parse_media_result(job.provider, model_type, job.model, data or {})
+            except AIServiceError as e:
+                error = f"provider_error: {e}"
+            else:
+                _complete_job(job, ai_result, model_type)
+                return True
+
+        _fail_job(job, error)
+        logger.error(f"AI job failed in FAL queue: {job.id} - {error}")
+        return True
+
+
+@shared_task
+def poll_fal_queue_jobs() -> int:
+    """
+    FAL Queue에 제출된 작업들을 한 번에 폴링하는 주기적 작업
+
+    상태/결과 조회는 스레드 풀로 동시에 수행하고, DB 반영은 현재 스레드에서 처리.
+    Beat 주기가 겹쳐도 캐시 락으로 한 번에 하나의 폴러만 실행.
+    웹훅이 설정된 경우 FAL_WEBHOOK_POLL_FALLBACK_AFTER초 동안 갱신되지 않은 작업만 조회 (유실 대비).
+
+    Returns:
+        이번 주기에 완료/실패 처리된 작업 수
+    """
+    if not cache.add(FAL_QUEUE_POLL_LOCK_KEY, '1', timeout=settings.FAL_QUEUE_POLL_LOCK_TTL):
+        logger.debug("FAL queue poller already running, skip")
+        return 0
+
+    try:
+        qs = Job.objects.filter(
+            provider='fal',
+            status__in=FAL_QUEUE_ACTIVE_STATUSES,
+            external_job_id__isnull=False,
+        )
+        # 제공자 처리를 기다리는 작업은 워커가 없으므로 폴러가 슬롯 임대를 연장
+        slots.renew_many(
+            (user_id, model_type, job_id)
+            for job_id, user_id, model_type in qs.values_list('id', 'user_id', 'model_type')
+        )
+
+        # 제출 후 FAL_QUEUE_MAX_AGE가 지나도 끝나지 않은 작업은 실패 처리 (슬롯을 영구 점유하지 않도록)
+        expired = list(
+            qs.annotate(submitted_at=Coalesce('provider_started_at', 'updated_at'))
+            .filter(submitted_at__lt=timezone.now() - timedelta(seconds=settings.FAL_QUEUE_MAX_AGE))
+            .values_list('id', 'external_job_id', 'model')
+        )
+        timed_out = 0
+        for job_id, request_id, model in expired:
+            if _finish_fal_queue_job(job_id, error=f"queue_timeout: {settings.FAL_QUEUE_MAX_AGE}초 안에 완료되지 않음"):
+                cancel_fal_queue_request.delay(str(job_id), request_id, model)
+                timed_out += 1
+        if expired:
+            qs = qs.exclude(id__in=[job_id for job_id, _, _ in expired])
+        if settings.FAL_WEBHOOK_BASE_URL:
+            stale_before = timezone.now() - timedelta(seconds=settings.FAL_WEBHOOK_POLL_FALLBACK_AFTER)
+            qs = qs.filter(updated_at__lt=stale_before)
+        jobs = list(qs.order_by('updated_at')[:settings.FAL_QUEUE_POLL_BATCH_SIZE])
+        if not jobs:
+            return timed_out
+
+        client = get_fal_client()
+        max_workers = max(1, min(settings.FAL_QUEUE_POLL_CONCURRENCY, len(jobs)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            checks = list(executor.map(lambda job: _fetch_fal_status(client, job), jobs))
+            statuses = [fal_status for fal_status, _ in checks]
+            completed = [job for job, fal_status in zip(jobs, statuses) if fal_status == 'COMPLETED']
+            results = list(executor.map(lambda job: _fetch_fal_result(client, job), completed))
+
+        started_ids = [
+            job.id for job, fal_status in zip(jobs, statuses)
+            if fal_status == 'IN_PROGRESS' and job.status == 'SUBMITTED'
+        ]
+        if started_ids:
+            Job.objects.filter(id__in=started_ids, status='SUBMITTED').update(
+                status='IN_PROGRESS', updated_at=timezone.now()
+            )
+            events.publish_statuses(started_ids, 'IN_PROGRESS')
+
+        finished = timed_out
+        for job, (data, error) in zip(completed, results):
+            if data is None and error is None:
+                continue
+            if _finish_fal_queue_job(job.id, data=data, error=error):
+                finished += 1
+        for job, (_, error) in zip(jobs, checks):
+            # 제공자가 모르는 요청 (상태 조회 404/410)
+            if error and _finish_fal_queue_job(job.id, error=error):
+                finished += 1
+
+        logger.info(
+            f"FAL queue poll: {len(jobs)} in flight, {len(started_ids)} started, {finished} finished ({timed_out} timed out)"
+        )
+        return finished
+
+    finally:
+        cache.delete(FAL_QUEUE_POLL_LOCK_KEY)
+
+
+@shared_task
+def archive_old_jobs(days: int = None, batch_size: int = None) -> int:
+    """
+    오래된 종료 작업을 MinIO 세그먼트로 옮기는 주기적 작업 (hot 테이블을 작게 유지)
+
+    cleanup_old_jobs와 같은 방식으로 ID를 스트리밍하며 batch_size개마다 세그먼트 하나를 업로드하고
+    ArchivedJob 색인 생성 + Job/Artifact 삭제를 한 트랜잭션으로 처리. 결과 파일(MinIO 객체)은 그대로 둠.
+    업로드에 실패한 묶음은 hot 테이블에 남아 다음 실행에서 다시 시도.
+
+    Args:
+        days: 생성 후 며칠이 지난 작업을 보관할지 (기본값은 JOB_ARCHIVE_AFTER_DAYS, 0이면 비활성화)
+        batch_size: 세그먼트당 작업 수 (기본값은 JOB_ARCHIVE_SEGMENT_SIZE)
+
+    Returns:
+        보관된 작업 수
+    """
+    from .archive import archive_job_chunk
+
+    days = settings.JOB_ARCHIVE_AFTER_DAYS if days is None else days
+    if days <= 0:
+        return 0
+    batch_size = max(1, batch_size or settings.JOB_ARCHIVE_SEGMENT_SIZE)
+    cutoff_date = timezone.now() - timedelta(days=days)
+    started = time.monotonic()
+
+    job_ids = (
+        Job.objects
+        .filter(status__in=events.TERMINAL_STATUSES, created_at__lt=cutoff_date)
+        .order_by()
+        .values_list('id', flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+
+    storage = S3Storage()
+    archived = 0
+    segments = 0
+    while True:
+        chunk = list(islice(job_ids, batch_size))
+        if not chunk:
+            break
+        try:
+            archived += archive_job_chunk(storage, chunk)
+            segments += 1
+        except Exception as e:
+            logger.error(f"작업 보관 묶음 실패 ({len(chunk)}개, 다음 실행에서 재시도): {e}")
+
+    logger.info(f"오래된 작업 보관 완료: {archived}개 ({segments}개 세그먼트, {time.monotonic() - started:.1f}초)")
+    return archived
+
+
+@shared_task
+def reap_stuck_jobs() -> int:
+    """
+    heartbeat가 끊긴 IN_PROGRESS 작업을 회수하는 주기적 작업
+
+    워커가 죽으면 작업이 IN_PROGRESS로 남아 run_ai_job 상태 검사에 막히고 슬롯도 계속 점유됨.
+    모델 타입별 유실 판단 시간(heartbeat.timeout_for)이 지난 작업은
+    시도 횟수가 JOB_MAX_ATTEMPTS 미만이면 PENDING으로 되돌려 다시 큐에 넣고, 아니면 FAILED 처리.
+    FAL Queue에 제출된 작업(external_job_id)은 poll_fal_queue_jobs가 관리하므로 제외.
+    PENDING/IN_QUEUE로 JOB_QUEUE_MAX_AGE 넘게 시작되지 않은 작업(큐 메시지 유실 등)도 FAILED 처리하고,
+    아직 기다리는 작업은 슬롯 임대를 연장 (실행 중인 작업은 heartbeat, FAL Queue 작업은 폴러가 연장).
+    상태 전이는 조건부 UPDATE라 Beat 주기가 겹치거나 워커가 살아 있어도 한 번만 적용됨.
+
+    Returns:
+        회수된 (재실행 + 실패 처리) 작업 수
+    """
+    now = timezone.now()
+    candidates = (
+        Job.objects
+        .filter(status='IN_PROGRESS', external_job_id__isnull=True)
+        .annotate(last_beat=Coalesce('heartbeat_at', 'updated_at'))
+        .filter(last_beat__lt=now - timedelta(seconds=heartbeat.min_timeout()))
+        .values_list('id', 'model_type', 'attempts', 'last_beat')
+    )
+
+    requeued = []
+    failed = 0
+    for job_id, model_type, attempts, last_beat in candidates:
+        if last_beat >= now - timedelta(seconds=heartbeat.timeout_for(model_type)):
+            continue
+
+        stale = Job.objects.filter(id=job_id, status='IN_PROGRESS', attempts=attempts)
+        if attempts < settings.JOB_MAX_ATTEMPTS:
+            if stale.update(status='PENDING', queued_at=now, started_at=None, heartbeat_at=None,
+                            provider_started_at=None, provider_finished_at=None, updated_at=now):
+                requeued.append((job_id, model_type))
+                logger.warning(f"Job {job_id} heartbeat 유실 ({last_beat.isoformat()}), 재실행 ({attempts}회 시도)")
+            continue
+
+        if stale.update(status='FAILED', error=f"worker_lost: {attempts}회 시도 모두 heartbeat 유실",
+                        completed_at=now, updated_at=now):
+            _on_job_finished(Job.objects.get(id=job_id))
+            failed += 1
+            logger.error(f"Job {job_id} heartbeat 유실, 최대 시도 횟수 초과로 실패 처리")
+
+    waiting = (
+        Job.objects
+        .filter(status__in=('PENDING', 'IN_QUEUE'))
+        .annotate(waiting_since=Coalesce('queued_at', 'created_at'))
+        .filter(waiting_since__lt=now - timedelta(seconds=settings.JOB_QUEUE_MAX_AGE))
+        .values_list('id', 'status')
+    )
+    for job_id, job_status in waiting:
+        if Job.objects.filter(id=job_id, status=job_status).update(
+            status='FAILED', error=f"queue_timeout: {settings.JOB_QUEUE_MAX_AGE}초 동안 시작되지 않음",
+            completed_at=now, updated_at=now
+        ):
+            _on_job_finished(Job.objects.get(id=job_id))
+            failed += 1
+            logger.error(f"Job {job_id} {job_status} 상태로 시작되지 않아 실패 처리")
+
+    # 큐 대기가 길어져도(Celery 적체) 임대 만료로 슬롯을 잃지 않도록
+    slots.renew_many(
+        Job.objects
+        .filter(status__in=('PENDING', 'IN_QUEUE'), user__isnull=False)
+        .values_list('user_id', 'model_type', 'id')
+    )
+
+    if requeued:
+        events.publish_statuses([job_id for job_id, _ in requeued], 'PENDING')
+        for job_id, model_type in requeued:
+            job_signature(job_id, model_type).apply_async()
+
+    if requeued or failed:
+        logger.info(f"Stuck job reaper: {len(requeued)} requeued, {failed} failed")
+    return len(requeued) + failed
 
 
 # ===== AI 작업 관련 Celery 작업들 - 추후 구현 예정 =====
@@ -312,48 +881,124 @@ def run_ai_job(self, job_id: str) -> None:
 #             pass
 
 
+def _cleanup_job_chunk(storage: S3Storage, job_ids: list) -> dict:
+    """
+    작업 한 묶음의 MinIO 객체와 DB 행을 삭제 (묶음마다 짧은 트랜잭션)
+
+    Args:
+        storage: 실행 전체에서 공유하는 S3Storage
+        job_ids: 삭제할 작업 ID 목록
+
+    Returns:
+        묶음 처리 결과 카운터
+    """
+    keys = [
+        key for key in Artifact.objects
+        .filter(job_id__in=job_ids)
+        .exclude(s3_key__isnull=True)
+        .exclude(s3_key='')
+        .values_list('s3_key', flat=True)
+    ]
+    # 수집 전 아티팩트는 s3_key에 제공자 URL이 들어 있으므로 MinIO 삭제 대상이 아님
+    object_keys = [key for key in keys if not key.startswith(('http://', 'https://'))]
+
+    failed = []
+    if object_keys:
+        try:
+            failed = storage.delete_files(object_keys)
+        except Exception as e:
+            logger.warning(f"S3 일괄 삭제 실패: {len(object_keys)}개 - {e}")
+            failed = object_keys
+
+    with transaction.atomic():
+        artifacts_deleted, _ = Artifact.objects.filter(job_id__in=job_ids).delete()
+        _, per_model = Job.objects.filter(id__in=job_ids).only('id').delete()
+
+    return {
+        'jobs_deleted': per_model.get(Job._meta.label, 0),
+        'artifacts_deleted': artifacts_deleted,
+        's3_deleted': len(object_keys) - len(failed),
+        's3_failed': len(failed),
+        's3_skipped': len(keys) - len(object_keys),
+    }
+
+
 @shared_task
-def cleanup_old_jobs(days: int = 30) -> int:
+def cleanup_old_jobs(days: int = 30, batch_size: int = None) -> int:
     """
     오래된 완료된 작업들을 정리하는 주기적 작업
 
+    ID를 서버 측 커서로 스트리밍하며 batch_size 단위로 MinIO 객체를 delete_objects로,
+    DB 행을 집합 단위로 삭제. 묶음마다 커밋되므로 중간에 중단돼도 다음 실행이 남은 작업부터 이어감.
+    진행 상황은 CLEANUP_PROGRESS_KEY 캐시에 묶음마다 기록.
+
+    보관(JOB_ARCHIVE_AFTER_DAYS)이 켜져 있으면 이력을 지우지 않고 바로 반환.
+
     Args:
         days: 몇 일 이상 된 작업들을 삭제할지
+        batch_size: 묶음 크기 (기본값은 JOB_CLEANUP_BATCH_SIZE)
 
     Returns:
         삭제된 작업 수
     """
-    from django.utils import timezone
-    from datetime import timedelta
+    if settings.JOB_ARCHIVE_AFTER_DAYS > 0:
+        # 보관 모드: 오래된 작업은 archive_old_jobs가 MinIO로 옮기므로 이력을 삭제하지 않음
+        logger.info("JOB_ARCHIVE_AFTER_DAYS 설정됨, 오래된 작업 삭제 건너뜀 (archive_old_jobs가 보관)")
+        return 0
 
+    batch_size = max(1, batch_size or settings.JOB_CLEANUP_BATCH_SIZE)
     cutoff_date = timezone.now() - timedelta(days=days)
-
-    # 오래된 완료된 작업들 조회
-    old_jobs = Job.objects.filter(
-        status__in=['COMPLETED', 'FAILED'],
-        created_at__lt=cutoff_date
+    started = time.monotonic()
+
+    progress = {
+        'started_at': timezone.now().isoformat(),
+        'finished_at': None,
+        'cutoff': cutoff_date.isoformat(),
+        'chunks': 0,
+        'jobs_deleted': 0,
+        'artifacts_deleted': 0,
+        's3_deleted': 0,
+        's3_failed': 0,
+        's3_skipped': 0,
+        'elapsed_seconds': 0.0,
+    }
+
+    job_ids = (
+        Job.objects
+        .filter(status__in=events.TERMINAL_STATUSES, created_at__lt=cutoff_date)
+        .order_by()
+        .values_list('id', flat=True)
+        .iterator(chunk_size=batch_size)
     )
 
-    deleted_count = 0
-    for job in old_jobs:
+    storage = S3Storage()
+    while True:
+        chunk = list(islice(job_ids, batch_size))
+        if not chunk:
+            break
         try:
-            # 관련 아티팩트들도 함께 삭제
-            artifacts = job.artifacts.all()
-            for artifact in artifacts:
-                # S3에서 파일 삭제 (선택사항)
-                try:
-                    storage = S3Storage()
-                    storage.delete_file(artifact.s3_key)
-                except Exception as e:
-                    logger.warning(f"S3 파일 삭제 실패: {artifact.s3_key} - {e}")
-
-                artifact.delete()
-
-            job.delete()
-            deleted_count += 1
-
+            counters = _cleanup_job_chunk(storage, chunk)
         except Exception as e:
-            logger.error(f"작업 삭제 실패: {job.id} - {e}")
+            logger.error(f"작업 정리 묶음 실패 ({len(chunk)}개, 다음 실행에서 재시도): {e}")
+            continue
+
+        progress['chunks'] += 1
+        for name, value in counters.items():
+            progress[name] += value
+        progress['elapsed_seconds'] = round(time.monotonic() - started, 3)
+        cache.set(CLEANUP_PROGRESS_KEY, progress, timeout=None)
+        logger.info(
+            f"오래된 작업 정리 진행: 묶음 {progress['chunks']}, "
+            f"작업 {progress['jobs_deleted']}개, 아티팩트 {progress['artifacts_deleted']}개, "
+            f"S3 {progress['s3_deleted']}개 삭제 (실패 {progress['s3_failed']}개)"
+        )
 
-    logger.info(f"오래된 작업 정리 완료: {deleted_count}개 삭제됨")
-    return deleted_count
+    progress['finished_at'] = timezone.now().isoformat()
+    progress['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    cache.set(CLEANUP_PROGRESS_KEY, progress, timeout=None)
+
+    logger.info(
+        f"오래된 작업 정리 완료: {progress['jobs_deleted']}개 삭제됨 "
+        f"({progress['chunks']}개 묶음, {progress['elapsed_seconds']}초)"
+    )
+    return progress['jobs_deleted']
@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from jobs import tasks
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import LOCMEM_CACHES
+
+
+@LOCMEM_CACHES
+class CleanupOldJobsTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='cleanup')
+        self.old = Job.objects.create(user=user, model='fal-ai/flux-2', model_type='image', status='COMPLETED', arguments={})
+        Job.objects.filter(id=self.old.id).update(created_at=timezone.now() - timedelta(days=40))
+        self.recent = Job.objects.create(user=user, model='fal-ai/flux-2', model_type='image', status='COMPLETED', arguments={})
+
+    def test_deletes_old_jobs_by_default(self):
+        self.assertEqual(tasks.cleanup_old_jobs(days=30), 1)
+        self.assertFalse(Job.objects.filter(id=self.old.id).exists())
+        self.assertTrue(Job.objects.filter(id=self.recent.id).exists())
+
+    @override_settings(JOB_ARCHIVE_AFTER_DAYS=7)
+    def test_archiving_replaces_deletion(self):
+        self.assertEqual(tasks.cleanup_old_jobs(days=30), 0)
+        self.assertTrue(Job.objects.filter(id=self.old.id).exists())
@@ -0,0 +1,26 @@
+from unittest import mock
+import redis
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import LOCMEM_CACHES
+
+
+@LOCMEM_CACHES
+class JobEventsTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='events')
+        self.job = Job.objects.create(user=user, model='fal-ai/flux-2', model_type='image', status='IN_QUEUE', arguments={})
+        self.auth = f'Bearer {AccessToken.for_user(user)}'
+
+    async def read_events(self):
+        response = await self.async_client.get(f'/api/v1/jobs/{self.job.id}/events/', headers={'Authorization': self.auth})
+        self.assertEqual(response.status_code, 200)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return [block.split('\n', 1)[0].removeprefix('event: ') for block in body.strip().split('\n\n')]
+
+    async def test_subscribe_failure_tells_client_to_poll(self):
+        pubsub = mock.Mock(subscribe=mock.AsyncMock(side_effect=redis.ConnectionError('down')), aclose=mock.AsyncMock())
+        with mock.patch('jobs.views.get_async_redis', return_value=mock.Mock(pubsub=mock.Mock(return_value=pubsub))):
+            self.assertEqual(await self.read_events(), ['status', 'unavailable'])
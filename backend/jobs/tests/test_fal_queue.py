@@ -0,0 +1,127 @@
+import os
+from datetime import timedelta
+from unittest import mock
+import requests
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from jobs import tasks
+from jobs.fal_queue import FalQueueClient, queue_app_id
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import LOCMEM_CACHES, FakeRedisMixin
+
+
+def http_error(status_code: int, text: str = '') -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode()
+    return requests.HTTPError(response=response)
+
+
+@override_settings(FAL_KEY='test-key')
+class QueueUrlTests(TestCase):
+    def setUp(self):
+        self.client = FalQueueClient()
+        self.transport = mock.patch.object(self.client, 'transport').start()
+        self.addCleanup(mock.patch.stopall)
+        self.transport.request.return_value.json.return_value = {}
+
+    def requested_url(self):
+        return self.transport.request.call_args[0][1]
+
+    def test_app_id_drops_model_subpath(self):
+        self.assertEqual(queue_app_id('fal-ai/sora-2/text-to-video'), 'fal-ai/sora-2')
+        self.assertEqual(queue_app_id('fal-ai/kling-video/v2.1/standard/image-to-video'), 'fal-ai/kling-video')
+        self.assertEqual(queue_app_id('/fal-ai/flux-2/'), 'fal-ai/flux-2')
+
+    def test_status_result_cancel_use_app_path(self):
+        model = 'fal-ai/sora-2/text-to-video'
+        self.client.get_job_status('req-1', model=model)
+        self.assertEqual(self.requested_url(), 'https://queue.fal.run/fal-ai/sora-2/requests/req-1/status')
+        self.client.get_job_result('req-1', model=model)
+        self.assertEqual(self.requested_url(), 'https://queue.fal.run/fal-ai/sora-2/requests/req-1')
+        self.client.cancel_job('req-1', model=model)
+        self.assertEqual(self.requested_url(), 'https://queue.fal.run/fal-ai/sora-2/requests/req-1/cancel')
+
+    def test_submit_uses_full_model_path(self):
+        self.client.submit_job('fal-ai/sora-2/text-to-video', {'prompt': 'x'})
+        self.assertEqual(self.requested_url(), 'https://queue.fal.run/fal-ai/sora-2/text-to-video')
+
+
+@LOCMEM_CACHES
+@override_settings(FAL_KEY='test-key', FAL_WEBHOOK_BASE_URL='', FAL_QUEUE_MAX_AGE=3600)
+class PollFalQueueJobsTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='poller')
+        self.fal = mock.Mock()
+        patcher = mock.patch.object(tasks, 'get_fal_client', return_value=self.fal)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(tasks.cancel_fal_queue_request, 'delay')
+        self.cancel = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submitted_job(self, submitted_ago=timedelta(seconds=30)):
+        return Job.objects.create(
+            user=self.user, model='fal-ai/sora-2/text-to-video', model_type='video', status='SUBMITTED',
+            external_job_id='req-1', provider_started_at=timezone.now() - submitted_ago, arguments={},
+        )
+
+    def test_unknown_request_fails_job(self):
+        job = self.submitted_job()
+        self.fal.get_job_status.side_effect = http_error(404, 'not found')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tasks.poll_fal_queue_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIn('not found', job.error)
+
+    def test_other_client_error_is_retried(self):
+        job = self.submitted_job()
+        self.fal.get_job_status.side_effect = http_error(403, 'forbidden')
+        with self.assertLogs('jobs.tasks', level='WARNING') as logs:
+            self.assertEqual(tasks.poll_fal_queue_jobs(), 0)
+        self.assertIn('403', '\n'.join(logs.output))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUBMITTED')
+
+    def test_expired_submission_fails_and_cancels(self):
+        job = self.submitted_job(submitted_ago=timedelta(hours=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tasks.poll_fal_queue_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertTrue(job.error.startswith('queue_timeout'))
+        self.cancel.assert_called_once_with(str(job.id), 'req-1', job.model)
+        self.fal.get_job_status.assert_not_called()
+
+    @mock.patch.dict(os.environ, {'FAL_KEY': 'test-key'})
+    @mock.patch.object(tasks.ingest_job_artifacts, 'delay')
+    def test_completed_job_is_finished(self, ingest):
+        job = self.submitted_job()
+        self.fal.get_job_status.return_value = {'status': 'COMPLETED'}
+        self.fal.get_job_result.return_value = {'video': {'url': 'https://fal.media/v.mp4'}}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tasks.poll_fal_queue_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.artifacts.get().s3_key, 'https://fal.media/v.mp4')
+        ingest.assert_called_once_with(str(job.id))
+
+
+@LOCMEM_CACHES
+@override_settings(JOB_QUEUE_MAX_AGE=3600)
+class QueueDeadlineTests(FakeRedisMixin, TestCase):
+    def test_job_never_started_is_failed(self):
+        user = User.objects.create(username='waiting')
+        old = Job.objects.create(user=user, model='fal-ai/flux-2', model_type='image', status='IN_QUEUE',
+                                 queued_at=timezone.now() - timedelta(hours=2), arguments={})
+        fresh = Job.objects.create(user=user, model='fal-ai/flux-2', model_type='image', status='IN_QUEUE',
+                                   queued_at=timezone.now(), arguments={})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tasks.reap_stuck_jobs(), 1)
+        old.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(old.status, 'FAILED')
+        self.assertEqual(fresh.status, 'IN_QUEUE')
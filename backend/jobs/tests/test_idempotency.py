@@ -0,0 +1,80 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core import idempotency
+from weavai.apps.core.testing import FakeRedisMixin
+
+BODY = {'model': 'fal-ai/flux-2', 'arguments': {'prompt': 'a cat'}}
+
+
+@override_settings(IDEMPOTENCY_TTL=3600, IDEMPOTENCY_LOCK_TTL=60)
+class JobCreateIdempotencyTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='retrier')
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        patcher = mock.patch('jobs.views.job_signature')
+        self.signature = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create(self, body=BODY, key='key-1'):
+        return self.api.post('/api/v1/jobs/', body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        first = self.create()
+        second = self.create()
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(second[idempotency.REPLAYED_HEADER], 'true')
+        self.assertNotIn(idempotency.REPLAYED_HEADER, first)
+        self.assertEqual(Job.objects.count(), 1)
+        self.signature.assert_called_once()
+
+    def test_key_reused_for_other_body(self):
+        self.create()
+        response = self.create(body={**BODY, 'arguments': {'prompt': 'a dog'}})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data['error_code'], 'idempotency_key_reused')
+
+    def test_first_request_still_running(self):
+        idempotency.begin('jobs:create', self.user.id, 'key-1', idempotency.request_hash(BODY))
+        response = self.create()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_lost_record_falls_back_to_stored_job(self):
+        first = self.create()
+        self.redis.flushall()
+        second = self.create()
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(second[idempotency.REPLAYED_HEADER], 'true')
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_rejected_request_can_be_retried(self):
+        with override_settings(JOB_SLOT_LIMITS=['image=0']):
+            self.assertEqual(self.create().status_code, 429)
+        self.assertEqual(self.create().status_code, 202)
+
+    def test_invalid_key(self):
+        self.assertEqual(self.create(key='bad key!').status_code, 400)
+
+    def test_keys_are_per_user(self):
+        first = self.create()
+        other = User.objects.create(username='other')
+        self.api.force_authenticate(other)
+        second = self.create()
+        self.assertNotEqual(second.data['id'], first.data['id'])
+
+    def test_batch_retry_after_lost_record_returns_same_ids(self):
+        body = {'jobs': [BODY, {**BODY, 'arguments': {'prompt': 'a dog'}}]}
+        with mock.patch('jobs.views.group'):
+            first = self.api.post('/api/v1/jobs/batch/', body, format='json', HTTP_IDEMPOTENCY_KEY='batch-1')
+            self.redis.flushall()
+            second = self.api.post('/api/v1/jobs/batch/', body, format='json', HTTP_IDEMPOTENCY_KEY='batch-1')
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.data['ids'], first.data['ids'])
+        self.assertEqual(Job.objects.count(), 2)
@@ -0,0 +1,90 @@
+import base64
+import json
+import uuid
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from jobs.models import ArchivedJob, Job
+from jobs.pagination import JobCursorPagination
+from users.models import User
+
+
+def next_cursor(response) -> str:
+    return parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+
+
+class JobListCursorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='lister')
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        self.base = timezone.now() - timedelta(days=1)
+
+    def create_job(self, minutes, **fields):
+        job = Job.objects.create(user=self.user, model='fal-ai/flux-2', model_type='image',
+                                 status='COMPLETED', arguments={}, **fields)
+        Job.objects.filter(id=job.id).update(created_at=self.base + timedelta(minutes=minutes))
+        return job.id
+
+    def list_all(self, limit, **params):
+        ids, pages, cursor = [], 0, None
+        while True:
+            query = {'limit': limit, **params, **({'cursor': cursor} if cursor else {})}
+            response = self.api.get('/api/v1/jobs/', query)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            pages += 1
+            if not response.data['next']:
+                return ids, pages
+            cursor = next_cursor(response)
+
+    def test_pages_cover_every_job_once_newest_first(self):
+        expected = [str(self.create_job(minutes)) for minutes in range(5)][::-1]
+        ids, pages = self.list_all(limit=2)
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_ties_on_created_at_break_by_id(self):
+        for _ in range(4):
+            self.create_job(0)
+        ids, _ = self.list_all(limit=1)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(ids)), 4)
+
+    def test_new_jobs_do_not_shift_later_pages(self):
+        for minutes in range(3):
+            self.create_job(minutes)
+        first = self.api.get('/api/v1/jobs/', {'limit': 2})
+        self.create_job(10)  # 첫 페이지 이후 새 작업
+        second = self.api.get('/api/v1/jobs/', {'limit': 2, 'cursor': next_cursor(first)})
+        first, second = first.data, second.data
+        seen = [item['id'] for item in first['results'] + second['results']]
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(len(set(seen)), 3)
+
+    def test_archived_jobs_continue_history(self):
+        live = str(self.create_job(5))
+        archived = ArchivedJob.objects.create(
+            id=uuid.uuid4(), user=self.user, created_at=self.base, updated_at=self.base,
+            status='COMPLETED', provider='fal', model='fal-ai/flux-2', model_type='image', segment_key='s', offset=0, length=0,
+        )
+        ids, _ = self.list_all(limit=1)
+        self.assertEqual(ids, [live, str(archived.id)])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.api.get('/api/v1/jobs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_non_uuid_id_is_not_found(self):
+        for obj_id in ('x', 123, None):
+            raw = json.dumps(['2024-01-01T00:00:00+00:00', obj_id]).encode('utf-8')
+            cursor = base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+            response = self.api.get('/api/v1/jobs/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404)
+
+    def test_cursor_round_trip(self):
+        job = Job.objects.get(id=self.create_job(1))
+        created_at, job_id = JobCursorPagination.decode_cursor(JobCursorPagination.encode_cursor(job))
+        self.assertEqual((created_at, job_id), (job.created_at, job.id))
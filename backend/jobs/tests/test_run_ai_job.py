@@ -0,0 +1,79 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from jobs import tasks
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import LOCMEM_CACHES, FakeRedisMixin
+
+
+@LOCMEM_CACHES
+@override_settings(FAL_QUEUE_MODEL_TYPES=[], JOB_MAX_ATTEMPTS=2)
+class RunAiJobClaimTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='runner')
+        patcher = mock.patch('weavai.apps.ai.router.ai_router.route_and_run', return_value={'text': 'done'})
+        self.route = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_job(self, status='IN_QUEUE', **fields):
+        return Job.objects.create(user=self.user, model='openai/gpt-4o-mini', model_type='text',
+                                  status=status, arguments={'input_text': 'hi'}, **fields)
+
+    def run_job(self, job):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.run_ai_job.apply(args=(str(job.id),), kwargs={'model_type': job.model_type})
+        job.refresh_from_db()
+
+    def test_claims_and_completes_queued_job(self):
+        job = self.create_job()
+        self.run_job(job)
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.started_at)
+        self.assertEqual(self.route.call_args.kwargs['user_id'], self.user.id)
+
+    def test_redelivered_message_does_not_run_again(self):
+        job = self.create_job(status='IN_PROGRESS', attempts=1)
+        self.run_job(job)
+        self.route.assert_not_called()
+        self.assertEqual(job.status, 'IN_PROGRESS')
+        self.assertEqual(job.attempts, 1)
+
+    def test_cancelled_job_is_skipped(self):
+        job = self.create_job(status='CANCELLED')
+        self.run_job(job)
+        self.route.assert_not_called()
+        self.assertEqual(job.status, 'CANCELLED')
+
+
+@LOCMEM_CACHES
+@override_settings(JOB_MAX_ATTEMPTS=2, JOB_HEARTBEAT_TIMEOUT=180, JOB_HEARTBEAT_TIMEOUTS=[])
+class ReaperTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='reaped')
+        patcher = mock.patch.object(tasks, 'job_signature')
+        self.signature = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stale_job(self, attempts):
+        return Job.objects.create(user=self.user, model='openai/gpt-4o-mini', model_type='text', status='IN_PROGRESS',
+                                  attempts=attempts, heartbeat_at=timezone.now() - timedelta(minutes=10), arguments={})
+
+    def test_lost_job_is_requeued(self):
+        job = self.stale_job(attempts=1)
+        self.assertEqual(tasks.reap_stuck_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'PENDING')
+        self.signature.assert_called_once_with(job.id, 'text')
+
+    def test_lost_job_fails_after_max_attempts(self):
+        job = self.stale_job(attempts=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(tasks.reap_stuck_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertTrue(job.error.startswith('worker_lost'))
@@ -0,0 +1,109 @@
+import uuid
+from unittest import mock
+from django.test import TestCase, override_settings
+from jobs import slots, tasks
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import LOCMEM_CACHES, FakeRedisMixin
+
+
+@override_settings(JOB_SLOT_LIMITS=['video=2'], JOB_SLOT_LEASE_SECONDS=900)
+class SlotTests(FakeRedisMixin, TestCase):
+    user_id = 7
+
+    def key(self, model_type='video'):
+        return slots._key(self.user_id, model_type)
+
+    def expire(self, job_id, model_type='video'):
+        self.redis.zadd(self.key(model_type), {str(job_id): 1})
+
+    def test_acquire_up_to_limit(self):
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        self.assertTrue(slots.acquire(self.user_id, 'video', first))
+        self.assertTrue(slots.acquire(self.user_id, 'video', second))
+        self.assertFalse(slots.acquire(self.user_id, 'video', third))
+        # 이미 보유한 작업은 한도와 무관하게 갱신
+        self.assertTrue(slots.acquire(self.user_id, 'video', first))
+
+    def test_limits_are_per_model_type(self):
+        slots.acquire(self.user_id, 'video', uuid.uuid4())
+        slots.acquire(self.user_id, 'video', uuid.uuid4())
+        self.assertTrue(slots.acquire(self.user_id, 'image', uuid.uuid4()))
+
+    def test_release_frees_slot(self):
+        first, second = uuid.uuid4(), uuid.uuid4()
+        slots.acquire(self.user_id, 'video', first)
+        slots.acquire(self.user_id, 'video', second)
+        slots.release(self.user_id, 'video', first)
+        self.assertTrue(slots.acquire(self.user_id, 'video', uuid.uuid4()))
+
+    def test_expired_lease_is_reclaimed(self):
+        first, second = uuid.uuid4(), uuid.uuid4()
+        slots.acquire(self.user_id, 'video', first)
+        slots.acquire(self.user_id, 'video', second)
+        self.expire(first)
+        self.assertTrue(slots.acquire(self.user_id, 'video', uuid.uuid4()))
+
+    def test_renew_readds_expired_lease(self):
+        job_id = uuid.uuid4()
+        slots.acquire(self.user_id, 'video', job_id)
+        self.expire(job_id)
+        slots.acquire(self.user_id, 'video', uuid.uuid4())  # 만료 멤버 정리
+        self.assertIsNone(self.redis.zscore(self.key(), str(job_id)))
+
+        slots.renew(self.user_id, 'video', job_id)
+        self.assertGreater(self.redis.zscore(self.key(), str(job_id)), 1)
+
+    def test_acquire_many_is_all_or_nothing(self):
+        slots.acquire(self.user_id, 'video', uuid.uuid4())
+        entries = [('image', uuid.uuid4()), ('video', uuid.uuid4()), ('video', uuid.uuid4())]
+        self.assertFalse(slots.acquire_many(self.user_id, entries))
+        self.assertEqual(self.redis.zcard(self.key('image')), 0)
+        self.assertEqual(self.redis.zcard(self.key('video')), 1)
+
+        self.assertTrue(slots.acquire_many(self.user_id, entries[:2]))
+        self.assertEqual(self.redis.zcard(self.key('video')), 2)
+
+
+@LOCMEM_CACHES
+@override_settings(JOB_SLOT_LEASE_SECONDS=900, JOB_QUEUE_MAX_AGE=3600)
+class WaitingLeaseTests(FakeRedisMixin, TestCase):
+    def test_reaper_renews_waiting_jobs(self):
+        user = User.objects.create(username='waiting-lease')
+        job = Job.objects.create(user=user, model='fal-ai/sora-2', model_type='video', status='IN_QUEUE', arguments={})
+        key = slots._key(user.id, 'video')
+        self.redis.zadd(key, {str(job.id): 1})  # 큐 대기 중 만료된 임대
+
+        tasks.reap_stuck_jobs()
+
+        self.assertGreater(self.redis.zscore(key, str(job.id)), 1)
+
+
+class SlotFallbackTests(TestCase):
+    """Redis 장애 시 DB 집계도 모델 타입별"""
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+        self.user = User.objects.create(username='fallback')
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        for name in ('acquire', 'acquire_many'):
+            patcher = mock.patch.object(slots, name, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('jobs.views.job_signature')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create(self, model):
+        return self.api.post('/api/v1/jobs/', {'model': model, 'arguments': {'prompt': 'x'}}, format='json')
+
+    @override_settings(JOB_SLOT_LIMITS=['video=1'])
+    def test_counts_active_jobs_of_same_type(self):
+        Job.objects.create(user=self.user, model='fal-ai/flux-2', model_type='image', status='IN_QUEUE', arguments={})
+        response = self.create('fal-ai/sora-2/text-to-video')
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual(Job.objects.get(id=response.data['id']).model_type, 'video')
+
+        response = self.create('fal-ai/sora-2/text-to-video')
+        self.assertEqual(response.status_code, 429)
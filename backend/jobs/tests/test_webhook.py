@@ -0,0 +1,130 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from jobs import tasks
+from jobs.fal_queue import build_webhook_url, sign_webhook_token, verify_webhook_token
+from jobs.models import Job
+from users.models import User
+from weavai.apps.core.testing import FakeRedisMixin
+
+
+@override_settings(FAL_WEBHOOK_SECRET='webhook-secret', FAL_WEBHOOK_BASE_URL='https://api.example.com')
+class WebhookTokenTests(TestCase):
+    def test_token_is_bound_to_job(self):
+        token = sign_webhook_token('job-a')
+        self.assertTrue(verify_webhook_token('job-a', token))
+        self.assertFalse(verify_webhook_token('job-b', token))
+        self.assertFalse(verify_webhook_token('job-a', ''))
+        self.assertFalse(verify_webhook_token('', token))
+
+    def test_token_depends_on_secret(self):
+        token = sign_webhook_token('job-a')
+        with self.settings(FAL_WEBHOOK_SECRET='rotated'):
+            self.assertFalse(verify_webhook_token('job-a', token))
+
+    def test_url_carries_token_in_path(self):
+        job_id = '3f1c2b8e-6f1e-4c55-9d7a-0c4f3b2a1e90'
+        url = build_webhook_url(job_id)
+        self.assertEqual(
+            url, f"https://api.example.com/api/v1/jobs/webhooks/fal/{job_id}/{sign_webhook_token(job_id)}/"
+        )
+        self.assertNotIn('?', url)
+
+    def test_url_disabled_without_base(self):
+        with self.settings(FAL_WEBHOOK_BASE_URL=''):
+            self.assertIsNone(build_webhook_url('job-a'))
+
+
+@override_settings(FAL_WEBHOOK_SECRET='webhook-secret')
+class FalWebhookViewTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient()
+        self.user = User.objects.create(username='webhook')
+
+    def create_job(self, **fields):
+        defaults = dict(user=self.user, model='fal-ai/flux-2', model_type='image', provider='fal',
+                        status='SUBMITTED', external_job_id='req-1', arguments={})
+        return Job.objects.create(**{**defaults, **fields})
+
+    def post(self, job, token=None, **body):
+        url = reverse('jobs:fal-webhook', kwargs={'job_id': job.id, 'token': token or sign_webhook_token(job.id)})
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.api.post(url, body, format='json')
+
+    def test_rejects_bad_token(self):
+        job = self.create_job()
+        response = self.post(job, token='0' * 64, request_id='req-1', status='ERROR')
+        self.assertEqual(response.status_code, 403)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUBMITTED')
+
+    def test_rejects_other_request(self):
+        job = self.create_job()
+        response = self.post(job, request_id='req-other', status='ERROR')
+        self.assertEqual(response.status_code, 404)
+
+    def test_error_fails_job(self):
+        job = self.create_job()
+        response = self.post(job, request_id='req-1', status='ERROR', error='boom')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['updated'])
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIn('boom', job.error)
+
+    def test_accepts_webhook_before_submission_is_recorded(self):
+        job = self.create_job(status='IN_PROGRESS', external_job_id=None)
+        response = self.post(job, request_id='req-1', status='ERROR', error='boom')
+        self.assertEqual(response.status_code, 200)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+
+
+class SubmitRecordTests(FakeRedisMixin, TestCase):
+    """제출 응답 전에 작업이 끝난 경우 — 취소된 작업만 제공자 요청을 취소"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='submitter')
+        patcher = mock.patch.object(tasks.cancel_fal_queue_request, 'delay')
+        self.cancel = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, job, status_during_submit):
+        router = mock.Mock()
+        router.prepare_media_request.return_value = ('fal-ai/flux-2', {'prompt': 'x'})
+
+        def submit_job(*args, **kwargs):
+            Job.objects.filter(id=job.id).update(status=status_during_submit)
+            return {'request_id': 'req-1'}
+
+        fal = mock.Mock()
+        fal.submit_job.side_effect = submit_job
+        with mock.patch('weavai.apps.ai.router.ai_router', router), \
+                mock.patch.object(tasks, 'get_fal_client', return_value=fal):
+            tasks._submit_to_fal_queue(job, 'image', {'prompt': 'x'})
+
+    def create_job(self):
+        return Job.objects.create(user=self.user, model='fal-ai/flux-2', model_type='image', provider='fal',
+                                  status='IN_PROGRESS', arguments={})
+
+    def test_completed_by_webhook_is_not_cancelled(self):
+        job = self.create_job()
+        self.submit(job, 'COMPLETED')
+        self.cancel.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'COMPLETED')
+
+    def test_cancelled_during_submit_cancels_request(self):
+        job = self.create_job()
+        self.submit(job, 'CANCELLED')
+        self.cancel.assert_called_once_with(str(job.id), 'req-1', 'fal-ai/flux-2')
+
+    def test_records_submission(self):
+        job = self.create_job()
+        self.submit(job, 'IN_PROGRESS')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUBMITTED')
+        self.assertEqual(job.external_job_id, 'req-1')
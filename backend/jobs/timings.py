@@ -0,0 +1,162 @@
+# WEAV AI 작업 단계별 소요 시간 집계
+# 작업이 끝날 때마다 Redis 로그 버킷 히스토그램(일자·모델·단계별)에 누적 → p50/p95/p99는 버킷에서 계산
+
+import logging
+import math
+from datetime import timedelta
+from typing import Dict, Optional
+from django.conf import settings
+from django.utils import timezone
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+HISTOGRAM_KEY = 'jobs:latency:{day}:{model}:{phase}'  # 해시: 버킷 번호 → 건수
+OUTCOMES_KEY = 'jobs:latency:{day}:{model}:outcomes'  # 해시: completed / failed / cancelled
+MODELS_KEY = 'jobs:latency:{day}:models'              # 집합: 그날 기록된 모델
+
+# 단계: (시작 컬럼, 끝 컬럼) — queued_at이 없으면 created_at 사용
+PHASES = {
+    'queue': ('queued_at', 'started_at'),                         # 큐 대기 (워커 부족)
+    'provider': ('provider_started_at', 'provider_finished_at'),  # 제공자 처리 (Queue 모드는 폴링/웹훅 지연 포함)
+    'finalize': ('provider_finished_at', 'completed_at'),         # 결과 반영
+    'total': ('queued_at', 'completed_at'),                       # 요청부터 완료까지
+}
+INGEST_PHASE = 'ingest'  # 결과 파일 MinIO 수집 (ingest_job_artifacts 실행 시간)
+
+BUCKET_GROWTH = 1.1  # 버킷 경계 비율 (백분위 오차 10% 이내)
+PERCENTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+
+
+def _bucket(seconds: float) -> int:
+    """소요 시간(초) → 로그 버킷 번호 (버킷 i의 상한은 BUCKET_GROWTH**i ms)"""
+    ms = max(seconds * 1000, 1.0)
+    return max(0, math.ceil(math.log(ms, BUCKET_GROWTH)))
+
+
+def _bucket_upper_seconds(bucket: int) -> float:
+    return BUCKET_GROWTH ** bucket / 1000
+
+
+def _day(at=None) -> str:
+    return (at or timezone.now()).strftime('%Y%m%d')
+
+
+def _retention_seconds() -> int:
+    return (settings.JOB_LATENCY_RETENTION_DAYS + 1) * 86400
+
+
+def phase_durations(job) -> Dict[str, float]:
+    """작업의 타이밍 컬럼으로 단계별 소요 시간(초) 계산 (컬럼이 빠진 단계는 제외)"""
+    durations = {}
+    for phase, (start_field, end_field) in PHASES.items():
+        start = getattr(job, start_field) or (job.created_at if start_field == 'queued_at' else None)
+        end = getattr(job, end_field)
+        if start and end and end >= start:
+            durations[phase] = (end - start).total_seconds()
+    return durations
+
+
+def record(model: str, durations: Dict[str, float], outcome: Optional[str] = None) -> None:
+    """
+    단계별 소요 시간을 오늘 히스토그램에 누적 (Redis 장애 시 기록하지 않음)
+
+    Args:
+        model: 모델명
+        durations: 단계 → 소요 시간(초)
+        outcome: 'completed' / 'failed' / 'cancelled' 건수 집계 (없으면 건수는 갱신하지 않음)
+    """
+    day = _day()
+    ttl = _retention_seconds()
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.sadd(MODELS_KEY.format(day=day), model)
+        pipe.expire(MODELS_KEY.format(day=day), ttl)
+        for phase, seconds in durations.items():
+            key = HISTOGRAM_KEY.format(day=day, model=model, phase=phase)
+            pipe.hincrby(key, _bucket(seconds), 1)
+            pipe.expire(key, ttl)
+        if outcome:
+            key = OUTCOMES_KEY.format(day=day, model=model)
+            pipe.hincrby(key, outcome, 1)
+            pipe.expire(key, ttl)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"작업 소요 시간 기록 실패: {model} - {e}")
+
+
+def record_job(job) -> None:
+    """종료된 작업 기록 — 단계 시간은 COMPLETED만 (실패·취소는 건수만 집계)"""
+    if job.status == 'COMPLETED':
+        record(job.model, phase_durations(job), outcome='completed')
+    else:
+        record(job.model, {}, outcome='cancelled' if job.status == 'CANCELLED' else 'failed')
+
+
+def _summarize(counts: Dict[int, int]) -> Dict[str, float]:
+    """버킷 건수 → {count, p50, p95, p99} (각 백분위는 해당 버킷 상한, 초)"""
+    total = sum(counts.values())
+    summary = {'count': total}
+    cumulative = 0
+    buckets = sorted(counts.items())
+    targets = list(PERCENTILES)
+    for bucket, count in buckets:
+        cumulative += count
+        while targets and cumulative >= targets[0][1] * total:
+            summary[targets.pop(0)[0]] = round(_bucket_upper_seconds(bucket), 3)
+    return summary
+
+
+def stats(days: int = 1, model: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    최근 days일 모델·단계별 백분위
+
+    Returns:
+        {모델: {"completed": n, "failed": n, "cancelled": n, "phases": {단계: {"count", "p50", "p95", "p99"}}}}
+
+    Raises:
+        redis.RedisError: Redis 조회 실패
+    """
+    client = get_redis()
+    today = timezone.now()
+    day_keys = [_day(today - timedelta(days=offset)) for offset in range(days)]
+
+    pipe = client.pipeline(transaction=False)
+    for day in day_keys:
+        pipe.smembers(MODELS_KEY.format(day=day))
+    models_by_day = pipe.execute()
+
+    phases = list(PHASES) + [INGEST_PHASE]
+    requests = []
+    pipe = client.pipeline(transaction=False)
+    for day, members in zip(day_keys, models_by_day):
+        for name in members:
+            name = name.decode('utf-8') if isinstance(name, bytes) else name
+            if model and name != model:
+                continue
+            pipe.hgetall(OUTCOMES_KEY.format(day=day, model=name))
+            requests.append((name, None))
+            for phase in phases:
+                pipe.hgetall(HISTOGRAM_KEY.format(day=day, model=name, phase=phase))
+                requests.append((name, phase))
+
+    merged: Dict[str, Dict] = {}
+    for (name, phase), values in zip(requests, pipe.execute() if requests else []):
+        entry = merged.setdefault(name, {'completed': 0, 'failed': 0, 'cancelled': 0, 'buckets': {}})
+        for field, count in values.items():
+            field = field.decode('utf-8') if isinstance(field, bytes) else field
+            if phase is None:
+                entry[field] = entry.get(field, 0) + int(count)
+            else:
+                buckets = entry['buckets'].setdefault(phase, {})
+                buckets[int(field)] = buckets.get(int(field), 0) + int(count)
+
+    return {
+        name: {
+            'completed': entry['completed'],
+            'failed': entry['failed'],
+            'cancelled': entry['cancelled'],
+            'phases': {phase: _summarize(counts) for phase, counts in entry['buckets'].items() if counts},
+        }
+        for name, entry in sorted(merged.items())
+    }
@@ -7,5 +7,11 @@ app_name = 'jobs'
 
 urlpatterns = [
     path('', views.list_or_create_jobs, name='list-create'),
+    path('batch/', views.create_job_batch, name='batch'),
+    path('status/', views.job_statuses, name='status'),
+    path('stats/latency/', views.job_latency_stats, name='latency-stats'),
     path('<uuid:pk>/', views.job_detail, name='detail'),
+    path('<uuid:pk>/cancel/', views.job_cancel, name='cancel'),
+    path('<uuid:pk>/events/', views.job_events, name='events'),
+    path('webhooks/fal/<uuid:job_id>/<str:token>/', views.fal_webhook, name='fal-webhook'),
 ]
\ No newline at end of file
@@ -1,98 +1,623 @@
 # WEAV AI Jobs 앱 뷰
 # AI 작업 관리 API (fal.ai 통합) — 비동기 + 사용자별 목록/조회
 
+import asyncio
+import json
 import logging
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+import redis
+from botocore.exceptions import ClientError
+from celery import group
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes
-from .models import Job
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from weavai.apps.core import idempotency
+from weavai.apps.core.redis import get_async_redis
+from weavai.apps.core.streaming import authenticate_jwt_async, sse_event
+from weavai.apps.storage.s3 import S3Storage
+from .archive import load_archived_job
+from .fal_queue import verify_webhook_token
+from .models import ArchivedJob, Job
 from .serializers import (
     JobCreateSerializer,
     JobDetailSerializer,
     JobListSerializer,
 )
-from .tasks import run_ai_job, MAX_CONCURRENT_JOBS_PER_USER
+from . import events, slots, timings
+from .pagination import JobCursorPagination
+from .tasks import cancel_job, job_signature, _finish_fal_queue_job
 
 logger = logging.getLogger(__name__)
 
-ACTIVE_STATUSES = ('PENDING', 'IN_QUEUE', 'IN_PROGRESS')
+ACTIVE_STATUSES = events.ACTIVE_STATUSES
 
+# 상태 일괄 조회 (GET /api/v1/jobs/status/)
+MAX_STATUS_IDS = 100
+STATUS_TEXT_PREVIEW_CHARS = 200
 
-def _model_type_from_model(model: str) -> str:
-    m = (model or '').lower()
-    if any(token in m for token in ('sora', 'video')):
-        return 'video'
-    if any(token in m for token in ('flux', 'banana', 'image')):
-        return 'image'
-    return 'text'
+# 종료된 작업의 렌더링된 상세 (버전 = updated_at)
+JOB_DETAIL_CACHE_KEY = 'jobs:detail:{job_id}:{version}'
 
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def list_or_create_jobs(request):
-    """GET: 내 작업 목록. POST: 작업 생성(비동기)."""
+    """
+    GET: 내 작업 목록 (최신순 커서 페이지네이션). POST: 작업 생성(비동기).
+
+    POST에 Idempotency-Key 헤더를 주면 같은 키의 재시도는 처음 응답(같은 작업)을 반환
+    (Idempotent-Replayed: true, 다른 본문에 재사용하면 422, 처음 요청이 처리 중이면 409).
+
+    GET Query: ?status=COMPLETED,FAILED&model_type=image&ids=<id,id,...>&cursor=<next 커서>&limit=20
+    """
     if request.method == 'GET':
-        qs = Job.objects.filter(user=request.user).order_by('-created_at')
-        serializer = JobListSerializer(qs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        filters = Q(user=request.user)
+        statuses = [s for s in request.query_params.get('status', '').upper().split(',') if s]
+        if statuses:
+            filters &= Q(status__in=statuses)
+        ids = [i for i in request.query_params.get('ids', '').split(',') if i]
+        if ids:
+            try:
+                filters &= Q(id__in=[uuid.UUID(i) for i in ids[:JobCursorPagination.max_limit]])
+            except ValueError:
+                return Response({'detail': 'ids가 올바른 작업 id 목록이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        model_type = request.query_params.get('model_type')
+        if model_type:
+            if model_type not in ('text', 'image', 'video'):
+                return Response(
+                    {'detail': 'model_type은 text, image, video 중 하나여야 합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filters &= Q(model_type=model_type)
+        # 목록에 필요한 컬럼만 읽고 아티팩트 수는 같은 쿼리에서 집계 (행마다 COUNT 방지)
+        qs = Job.objects.filter(filters).only('id', 'created_at', 'status', 'provider', 'model').annotate(
+            artifact_count=Count('artifacts')
+        )
+        # 보관된 작업도 이력에 이어서 표시 (색인 테이블만 조회, 세그먼트는 읽지 않음)
+        archived = ArchivedJob.objects.filter(filters).only(
+            'id', 'created_at', 'status', 'provider', 'model', 'artifact_count'
+        )
+
+        paginator = JobCursorPagination()
+        page = paginator.paginate_querysets([qs, archived], request)
+        serializer = JobListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     # POST
     serializer = JobCreateSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    
-    model = serializer.validated_data.get('model', '')
-    model_type = _model_type_from_model(model)
-    
-    active_count = Job.objects.filter(
-        user=request.user,
-        status__in=ACTIVE_STATUSES
-    ).count()
-    if active_count >= MAX_CONCURRENT_JOBS_PER_USER:
+    # 같은 Idempotency-Key의 재시도는 새 작업을 만들지 않고 처음 응답 반환
+    return idempotency.run(request, 'jobs:create', lambda key: _create_job(request, serializer.validated_data, key))
+
+
+def _accepted_body(job) -> dict:
+    """작업 생성(202) 응답 본문"""
+    return {
+        'id': str(job.id),
+        'status': job.status,
+        'message': '작업이 큐에 등록되었습니다. GET /api/v1/jobs/<id>/ 로 상태를 확인하세요.',
+    }
+
+
+def _create_job(request, data, idempotency_key=None):
+    """
+    작업 하나 생성 (슬롯 예약 → INSERT → 큐 등록)
+
+    같은 idempotency_key의 작업이 이미 있으면 (동시 재시도, Redis 기록 만료/장애) 그 작업을 반환.
+    """
+    model_type = data['model_type']
+
+    # 슬롯은 작업 id로 먼저 예약하고 작업이 끝나면 태스크에서 반환 (동시 POST도 한도를 넘지 못함)
+    job_id = uuid.uuid4()
+    limit = slots.slot_limit(model_type)
+    acquired = slots.acquire(request.user.id, model_type, job_id)
+    if acquired is None:
+        # Redis 장애 시 DB 집계로 대체 (슬롯과 같이 모델 타입별)
+        acquired = Job.objects.filter(
+            user=request.user, model_type=model_type, status__in=ACTIVE_STATUSES
+        ).count() < limit
+    if not acquired:
         return Response(
             {
-                'detail': f'동시에 진행 가능한 작업은 최대 {MAX_CONCURRENT_JOBS_PER_USER}개입니다. 완료된 작업을 기다려 주세요.',
+                'detail': f'동시에 진행 가능한 작업은 최대 {limit}개입니다. 완료된 작업을 기다려 주세요.',
                 'error_code': 'max_concurrent_jobs',
-                'max_concurrent': MAX_CONCURRENT_JOBS_PER_USER,
+                'max_concurrent': limit,
             },
             status=status.HTTP_429_TOO_MANY_REQUESTS
         )
-    job = Job.objects.create(
-        user=request.user,
-        status='IN_QUEUE',
-        **serializer.validated_data
-    )
+    try:
+        # savepoint — 키 중복(IntegrityError) 후에도 같은 트랜잭션에서 기존 작업을 조회할 수 있도록
+        with transaction.atomic():
+            job = Job.objects.create(
+                id=job_id,
+                user=request.user,
+                status='IN_QUEUE',
+                queued_at=timezone.now(),
+                idempotency_key=idempotency_key,
+                **data
+            )
+    except IntegrityError:
+        slots.release(request.user.id, model_type, job_id)
+        existing = Job.objects.filter(user=request.user, idempotency_key=idempotency_key).first() if idempotency_key else None
+        if existing is None:
+            raise
+        return idempotency.replayed(status.HTTP_202_ACCEPTED, _accepted_body(existing))
+    except Exception:
+        slots.release(request.user.id, model_type, job_id)
+        raise
     logger.info(f"새 AI 작업 생성(비동기): {job.id} user={request.user.username}")
-    run_ai_job.delay(str(job.id))
+    job_signature(job.id, model_type).apply_async()  # 모델 타입별 큐로 라우팅
+    return Response(_accepted_body(job), status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_job_batch(request):
+    """
+    작업 일괄 생성 (비동기) — 검증·슬롯 확보·INSERT·큐 등록을 한 번에
+
+    Request Body:
+    {
+        "jobs": [{"provider": "fal", "model": "...", "arguments": {...}, "store_result": true}, ...]
+    }  (최대 JOB_BATCH_MAX_SIZE개)
+
+    Response (202):
+    {
+        "ids": ["job_id", ...],   # 요청 순서와 동일
+        "status": "IN_QUEUE",
+        "status_url": "이 작업들의 상태를 한 번에 조회하는 URL"
+    }
+    모든 작업의 슬롯을 확보하지 못하면 아무 작업도 만들지 않고 429.
+    Idempotency-Key 헤더는 작업 생성과 동일하게 처리 (재시도 시 같은 ids 반환).
+    """
+    specs = request.data.get('jobs') if isinstance(request.data, dict) else None
+    if not isinstance(specs, list) or not specs:
+        return Response({'detail': 'jobs 배열이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(specs) > settings.JOB_BATCH_MAX_SIZE:
+        return Response(
+            {'detail': f'한 번에 생성할 수 있는 작업은 최대 {settings.JOB_BATCH_MAX_SIZE}개입니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    serializer = JobCreateSerializer(data=specs, many=True)
+    serializer.is_valid(raise_exception=True)
+    # 같은 Idempotency-Key의 재시도는 새 작업을 만들지 않고 처음 응답 반환
+    return idempotency.run(
+        request, 'jobs:batch', lambda key: _create_job_batch(request, serializer.validated_data, key)
+    )
+
+
+def _batch_body(request, ids: list) -> dict:
+    """일괄 생성(202) 응답 본문"""
+    status_url = request.build_absolute_uri(f"{reverse('jobs:status')}?{urlencode({'ids': ','.join(ids)})}")
+    return {'ids': ids, 'status': 'IN_QUEUE', 'status_url': status_url}
+
+
+def _create_job_batch(request, validated_data: list, idempotency_key=None):
+    """
+    작업 일괄 생성 (슬롯 일괄 예약 → bulk INSERT → group 등록)
+
+    idempotency_key가 있으면 작업마다 '<키>#<순번>'으로 저장 — 같은 키로 이미 만든 작업이 있으면 그 id 목록을 반환.
+    """
+    entries = [(data['model_type'], uuid.uuid4()) for data in validated_data]
+
+    acquired = slots.acquire_many(request.user.id, entries)
+    if acquired is None:
+        # Redis 장애 시 DB 집계로 대체 (슬롯과 같이 모델 타입별)
+        requested = Counter(model_type for model_type, _ in entries)
+        active = dict(
+            Job.objects
+            .filter(user=request.user, model_type__in=requested, status__in=ACTIVE_STATUSES)
+            .values_list('model_type')
+            .annotate(count=Count('id'))
+        )
+        acquired = all(
+            active.get(model_type, 0) + n <= slots.slot_limit(model_type) for model_type, n in requested.items()
+        )
+    if not acquired:
+        limits = {model_type: slots.slot_limit(model_type) for model_type, _ in entries}
+        return Response(
+            {
+                'detail': '동시에 진행 가능한 작업 수를 초과합니다. 완료된 작업을 기다리거나 개수를 줄여 주세요.',
+                'error_code': 'max_concurrent_jobs',
+                'max_concurrent': limits,
+            },
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    queued_at = timezone.now()
+    keys = [f"{idempotency_key}#{index}" if idempotency_key else None for index in range(len(entries))]
+    jobs = [
+        Job(id=job_id, user=request.user, status='IN_QUEUE', queued_at=queued_at, idempotency_key=key, **data)
+        for (_, job_id), key, data in zip(entries, keys, validated_data)
+    ]
+    try:
+        with transaction.atomic():
+            Job.objects.bulk_create(jobs)
+    except IntegrityError:
+        slots.release_many(request.user.id, entries)
+        if not idempotency_key:
+            raise
+        existing = dict(
+            Job.objects.filter(user=request.user, idempotency_key__in=keys).values_list('idempotency_key', 'id')
+        )
+        if len(existing) != len(keys):
+            raise
+        return idempotency.replayed(status.HTTP_202_ACCEPTED, _batch_body(request, [str(existing[key]) for key in keys]))
+    except Exception:
+        slots.release_many(request.user.id, entries)
+        raise
+
+    # 한 번의 브로커 왕복으로 등록, 각 작업은 모델 타입별 큐로 라우팅
+    group(job_signature(job_id, model_type) for model_type, job_id in entries).apply_async()
+
+    ids = [str(job_id) for _, job_id in entries]
+    logger.info(f"AI 작업 일괄 생성(비동기): {len(ids)}건 user={request.user.username}")
+    return Response(_batch_body(request, ids), status=status.HTTP_202_ACCEPTED)
+
+
+def _result_summary(job) -> dict:
+    """상태 목록용 결과 요약 (전체 상세는 GET /api/v1/jobs/<id>/)"""
+    if job.status == 'FAILED':
+        return {'error': job.error}
+    if job.status != 'COMPLETED' or not job.result_json:
+        return None
+    result = job.result_json
+    summary = {'type': job.model_type}
+    if result.get('url'):
+        summary['url'] = result['url']
+        summary['count'] = len(result.get('urls') or [result['url']])
+    if result.get('text'):
+        summary['text'] = result['text'][:STATUS_TEXT_PREVIEW_CHARS]
+    return summary
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_statuses(request):
+    """
+    여러 작업 상태 한 번에 조회 (작업별 폴링 대체)
+
+    Query: ?ids=<id,id,...>(최대 MAX_STATUS_IDS개)&since=<이전 응답의 server_time>
+        since를 주면 그 이후 바뀐 작업만 반환
+
+    Response:
+    {
+        "jobs": [{"id", "status", "updated_at", "result": 요약 또는 null}, ...],
+        "server_time": "다음 요청의 since로 사용"
+    }
+    """
+    ids = [i for i in request.query_params.get('ids', '').split(',') if i]
+    if not ids:
+        return Response({'detail': 'ids가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > MAX_STATUS_IDS:
+        return Response({'detail': f'ids는 최대 {MAX_STATUS_IDS}개입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        ids = [uuid.UUID(i) for i in ids]
+    except ValueError:
+        return Response({'detail': 'ids가 올바른 작업 id 목록이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 조회 전에 시각을 잡아야 조회 중 바뀐 작업을 다음 요청에서 놓치지 않음
+    server_time = timezone.now()
+    qs = Job.objects.filter(user=request.user, id__in=ids)
+    since = request.query_params.get('since')
+    if since:
+        since_dt = parse_datetime(since.replace(' ', '+'))  # 인코딩하지 않은 '+09:00'은 공백으로 들어옴
+        if since_dt is None:
+            return Response({'detail': 'since가 올바른 ISO 8601 시각이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(updated_at__gt=since_dt)
+
+    jobs = qs.only('id', 'status', 'updated_at', 'model_type', 'result_json', 'error')
     return Response(
         {
-            'id': str(job.id),
-            'status': job.status,
-            'message': '작업이 큐에 등록되었습니다. GET /api/v1/jobs/<id>/ 로 상태를 확인하세요.',
+            'jobs': [
+                {
+                    'id': str(job.id),
+                    'status': job.status,
+                    'updated_at': job.updated_at.isoformat(),
+                    'result': _result_summary(job),
+                }
+                for job in jobs
+            ],
+            'server_time': server_time.isoformat(),
         },
-        status=status.HTTP_202_ACCEPTED
+        status=status.HTTP_200_OK
     )
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def job_latency_stats(request):
+    """
+    모델·단계별 소요 시간 백분위 (관리자 전용, 워커 풀 크기 조정·제공자 지연 감시용)
+
+    Query: ?days=1 (최근 며칠, 최대 JOB_LATENCY_RETENTION_DAYS)&model=<모델명>
+
+    Response:
+    {"days": 1, "models": {"fal-ai/flux-2": {"completed": 120, "failed": 3,
+        "phases": {"queue": {"count": 120, "p50": 0.8, "p95": 4.2, "p99": 9.1}, "provider": {...}, ...}}}}
+    """
+    try:
+        days = int(request.query_params.get('days', 1))
+    except ValueError:
+        days = 1
+    days = max(1, min(days, settings.JOB_LATENCY_RETENTION_DAYS))
+    try:
+        models = timings.stats(days=days, model=request.query_params.get('model') or None)
+    except redis.RedisError as e:
+        logger.error(f"작업 소요 시간 통계 조회 실패: {e}")
+        return Response(
+            {'error': '소요 시간 통계를 조회할 수 없습니다.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return Response({'days': days, 'models': models}, status=status.HTTP_200_OK)
+
+
 def _detail_payload(job):
     """상세 응답에 result 필드 추가 (폴링 시 프론트 호환)"""
     serializer = JobDetailSerializer(job)
     data = dict(serializer.data)
     if job.status == 'COMPLETED' and job.result_json:
-        model_type = _model_type_from_model(job.model)
-        data['result'] = {**job.result_json, 'type': model_type}
+        data['result'] = {**job.result_json, 'type': job.model_type}
+    return data
+
+
+def _job_version(updated_at) -> str:
+    """작업 버전 (updated_at 마이크로초) — ETag와 상세 캐시 키에 사용"""
+    return str(int(updated_at.timestamp() * 1_000_000))
+
+
+def _detail_cache_ttl(job) -> int:
+    """상세 캐시 TTL (presigned URL이 만료되기 전에 캐시도 만료)"""
+    ttl = settings.JOB_DETAIL_CACHE_TTL
+    expirations = [a.presigned_url_expires_at for a in job.artifacts.all() if a.presigned_url_expires_at]
+    if expirations:
+        ttl = min(ttl, int((min(expirations) - timezone.now()).total_seconds()) - 60)
+    return ttl
+
+
+def _render_detail(job_id, job_status: str, updated_at, archived: ArchivedJob = None) -> dict:
+    """
+    상세 응답 본문
+
+    COMPLETED/FAILED 작업은 (작업 id, updated_at) 키로 렌더링 결과를 캐시.
+    작업이 바뀌면 updated_at이 바뀌어 새 키를 쓰므로 별도 무효화가 필요 없음.
+    보관된 작업(archived)은 MinIO 세그먼트에서 레코드 하나만 읽어 같은 형식으로 렌더링.
+
+    Raises:
+        ClientError: 보관 세그먼트 읽기 실패
+    """
+    terminal = job_status in events.TERMINAL_STATUSES
+    key = JOB_DETAIL_CACHE_KEY.format(job_id=job_id, version=_job_version(updated_at))
+    if terminal:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    if archived is not None:
+        job = load_archived_job(S3Storage(), archived)
+    else:
+        job = Job.objects.prefetch_related('artifacts').get(id=job_id)
+    data = _detail_payload(job)
+    if terminal and job.updated_at == updated_at:
+        ttl = _detail_cache_ttl(job)
+        if ttl > 0:
+            cache.set(key, data, timeout=ttl)
     return data
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def job_detail(request, pk):
-    """작업 상세 (본인 작업만). COMPLETED 시 result 포함."""
+    """
+    작업 상세 (본인 작업만). COMPLETED 시 result 포함.
+
+    ETag/Last-Modified 조건부 요청 지원 — 변경이 없으면 본문 없이 304.
+    """
+    archived = None
+    row = Job.objects.filter(id=pk, user=request.user).values_list('status', 'updated_at').first()
+    if row is None:
+        # 보관된 작업은 색인으로 확인 (본문은 변경이 있을 때만 세그먼트에서 읽음)
+        archived = ArchivedJob.objects.filter(id=pk, user=request.user).first()
+        if archived is None:
+            return Response(
+                {'detail': '작업을 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        row = (archived.status, archived.updated_at)
+    job_status, updated_at = row
+
+    etag = quote_etag(f"{pk}-{_job_version(updated_at)}")
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(updated_at.timestamp()),
+        'Cache-Control': 'private, no-cache',  # 브라우저 캐시는 항상 재검증
+    }
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        not_modified = etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+    else:
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+        not_modified = if_modified_since is not None and int(updated_at.timestamp()) <= if_modified_since
+    if not_modified:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     try:
-        job = Job.objects.get(id=pk, user=request.user)
-    except Job.DoesNotExist:
+        data = _render_detail(pk, job_status, updated_at, archived=archived)
+    except ClientError as e:
+        logger.error(f"보관된 작업 읽기 실패: {pk} - {e}")
         return Response(
-            {'detail': '작업을 찾을 수 없습니다.'},
-            status=status.HTTP_404_NOT_FOUND
+            {'detail': '보관된 작업을 불러오지 못했습니다. 잠시 후 다시 시도해 주세요.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
         )
-    return Response(_detail_payload(job), status=status.HTTP_200_OK)
+    return Response(data, status=status.HTTP_200_OK, headers=headers)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def job_cancel(request, pk):
+    """
+    작업 취소 (본인 작업만) — 동시 실행 슬롯은 즉시 반환
+
+    시작 전이면 큐 메시지를 revoke하고, FAL Queue에 제출된 요청은 제공자에도 취소 요청.
+    동기 호출 중인 작업은 CANCELLED로 바꾸고 워커가 끝날 때 결과를 버림.
+
+    Response:
+        200 {"id", "status": "CANCELLED"} / 이미 종료된 작업 409 {"detail", "status"}
+    """
+    job = Job.objects.filter(id=pk, user=request.user).only('id', 'user_id', 'status', 'model', 'model_type', 'error').first()
+    if job is None:
+        archived_status = ArchivedJob.objects.filter(id=pk, user=request.user).values_list('status', flat=True).first()
+        if archived_status is None:
+            return Response({'detail': '작업을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {'detail': '이미 종료된 작업은 취소할 수 없습니다.', 'status': archived_status},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    if not cancel_job(job):
+        job.refresh_from_db(fields=['status'])
+        return Response(
+            {'detail': '이미 종료된 작업은 취소할 수 없습니다.', 'status': job.status},
+            status=status.HTTP_409_CONFLICT
+        )
+    logger.info(f"AI 작업 취소: {job.id} user={request.user.username}")
+    return Response({'id': str(job.id), 'status': job.status}, status=status.HTTP_200_OK)
+
+
+async def job_events(request, pk):
+    """
+    작업 상태 스트림 (Server-Sent Events, ASGI 비동기) — 상세 조회 폴링 대체
+
+    연결 직후 현재 상세를 보내고, 이후 상태가 바뀔 때마다 Redis pub/sub으로 받은 이벤트를 전달.
+    COMPLETED/FAILED/CANCELLED는 전체 상세(완료 시 result 포함)를 보낸 뒤 스트림 종료.
+
+    Response (text/event-stream):
+        event: status  data: {"id", "status", ...}  (종료 상태는 GET /api/v1/jobs/<id>/ 와 동일한 본문)
+        event: ping    data: {}                     (JOB_EVENTS_HEARTBEAT_SECONDS마다, 프록시 타임아웃 방지)
+        event: unavailable data: {"reason"}         (Redis 구독 실패 — 현재 상태만 보내고 종료, 클라이언트는 폴링으로 전환)
+    JOB_EVENTS_MAX_SECONDS가 지나면 스트림을 닫으므로 클라이언트는 다시 연결.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    user = await authenticate_jwt_async(request)
+    if user is None:
+        return JsonResponse({'detail': '자격 인증데이터(authentication credentials)가 제공되지 않았습니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+    if not await Job.objects.filter(id=pk, user=user).aexists():
+        return JsonResponse({'detail': '작업을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+    async def current_detail():
+        job_status, updated_at = await Job.objects.values_list('status', 'updated_at').aget(id=pk)
+        return await sync_to_async(_render_detail)(pk, job_status, updated_at)
+
+    async def event_stream():
+        # 구독 후 현재 상태를 조회해야 그 사이의 변경을 놓치지 않음
+        pubsub = get_async_redis().pubsub()
+        try:
+            await pubsub.subscribe(events.channel(pk))
+        except redis.RedisError as e:
+            logger.warning(f"작업 이벤트 구독 실패, 현재 상태만 전달: job={pk} - {e}")
+            await pubsub.aclose()
+            pubsub = None
+
+        try:
+            detail = await current_detail()
+            yield sse_event('status', detail)
+            if detail['status'] in events.TERMINAL_STATUSES:
+                return
+            if pubsub is None:
+                # 다시 연결해도 같은 결과이므로 클라이언트가 상세 조회 폴링으로 전환하도록 알림
+                yield sse_event('unavailable', {'reason': 'job events unavailable'})
+                return
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.JOB_EVENTS_MAX_SECONDS
+            while loop.time() < deadline:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=settings.JOB_EVENTS_HEARTBEAT_SECONDS,
+                )
+                if message is None:
+                    yield sse_event('ping', {})
+                    continue
+
+                event = json.loads(message['data'])
+                if event.get('status') in events.TERMINAL_STATUSES:
+                    yield sse_event('status', await current_detail())
+                    return
+                yield sse_event('status', event)
+        finally:
+            if pubsub is not None:
+                await pubsub.aclose()
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Nginx 응답 버퍼링 비활성화
+    return response
+
+
+# Django 4.2의 csrf_exempt 데코레이터는 코루틴 뷰를 동기 함수로 감싸므로 속성으로 직접 지정 (JWT 전용 GET)
+job_events.csrf_exempt = True
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def fal_webhook(request, job_id, token):
+    """
+    FAL Queue 완료 웹훅 (제출 시 build_webhook_url로 만든 서명 URL로 호출됨)
+
+    Path: webhooks/fal/<job_id>/<서명 토큰>/
+
+    Request Body (fal):
+    {
+        "request_id": "fal request_id",
+        "status": "OK" | "ERROR",
+        "payload": {...},  # 모델 결과
+        "error": "오류 메시지 (ERROR 시)"
+    }
+
+    빠른 작업은 워커가 SUBMITTED/external_job_id를 기록하기 전에 웹훅이 올 수 있으므로
+    아직 제출 기록이 없는 IN_PROGRESS 작업도 허용 (서명 토큰이 작업 ID를 보증).
+    """
+    if not verify_webhook_token(str(job_id), token):
+        logger.warning(f"FAL webhook signature mismatch: job={job_id}")
+        return Response({'detail': '서명이 유효하지 않습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+    request_id = request.data.get('request_id')
+    job = Job.objects.filter(
+        Q(external_job_id=request_id) | Q(status='IN_PROGRESS', external_job_id__isnull=True),
+        id=job_id,
+    ).only('id', 'status').first()
+    if job is None:
+        return Response({'detail': '작업을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+    fal_status = request.data.get('status')
+    payload = request.data.get('payload')
+    if fal_status == 'OK' and payload is None:
+        # 결과가 커서 payload가 생략된 경우 — 폴링 fallback이 결과를 조회
+        logger.warning(f"FAL webhook without payload: {job.id} - {request.data.get('payload_error')}")
+        return Response({'updated': False}, status=status.HTTP_202_ACCEPTED)
+
+    if fal_status == 'OK':
+        updated = _finish_fal_queue_job(job.id, data=payload)
+    else:
+        error = request.data.get('error') or f"FAL.ai status: {fal_status}"
+        updated = _finish_fal_queue_job(job.id, error=f"provider_error: {error}")
+
+    logger.info(f"FAL webhook 처리: {job.id} status={fal_status} updated={updated}")
+    return Response({'updated': updated}, status=status.HTTP_200_OK)
@@ -0,0 +1,171 @@
+# WEAV AI FAL.ai 비동기 클라이언트
+# ASGI 뷰에서 스레드 없이 다수의 텍스트 생성 요청을 동시에 처리 (httpx)
+
+import asyncio
+import json
+import logging
+import time
+import weakref
+from typing import AsyncIterator, Dict, Any, Optional
+import httpx
+from django.conf import settings
+from .errors import AIRequestError
+from .fal_client import FalClient
+from .schemas import TextGenerationRequest
+from .transport import TransportCall, get_transport
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 루프별 httpx 클라이언트 (커넥션 풀은 루프에 묶임)
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공용 httpx.AsyncClient (keep-alive 커넥션 풀)"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = getattr(settings, 'FAL_HTTP_ASYNC_MAX_CONNECTIONS', 200)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+class AsyncFalClient(FalClient):
+    """
+    FAL.ai API 비동기 클라이언트
+
+    payload 구성/응답 파싱은 FalClient와 공유하고 HTTP 호출만 asyncio로 수행.
+    타임아웃과 계측 훅은 동기 transport 설정(FAL_HTTP_*)을 그대로 따름.
+    """
+
+    def _timeout_for(self, endpoint: str, timeout: Optional[float] = None, fallback: str = None):
+        """(연결, 읽기) 타임아웃 — 엔드포인트 설정 > 모델 카탈로그 값(timeout) > fallback 엔드포인트 설정 > 전역 기본값"""
+        transport = get_transport()
+        default = (transport.default_timeout[0], float(timeout)) if timeout else None
+        if fallback:
+            default = transport.timeout_for(fallback, default)
+        return transport.timeout_for(endpoint, default)
+
+    async def _apost(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        transport = get_transport()
+        connect_timeout, read_timeout = self._timeout_for(endpoint, timeout)
+
+        started = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = await _get_http_client().post(
+                url,
+                headers=self._headers(),
+                json=payload,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            )
+        except httpx.HTTPError as e:
+            error = e
+            raise
+        finally:
+            transport.record(TransportCall(
+                method='POST',
+                url=url,
+                endpoint=endpoint,
+                status_code=response.status_code if response is not None else None,
+                elapsed=time.perf_counter() - started,
+                error=error,
+                timeout=read_timeout,
+            ))
+
+        return self._parse_response(response)
+
+    async def agenerate_text(self, request: TextGenerationRequest, timeout: Optional[float] = None) -> Dict[str, Any]:
+        payload = self.build_text_payload(request)
+        data = await self._apost(self.text_endpoint, payload, timeout=timeout)
+        return self.parse_text_result(payload['model'], data)
+
+    async def astream_text(self, request: TextGenerationRequest, timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        텍스트 스트리밍 생성 (fal 스트리밍 endpoint의 SSE를 토큰 단위로 중계)
+
+        fal 스트리밍 이벤트의 output은 누적 텍스트이므로 이전 이벤트와의 차이만 delta로 전달.
+
+        Yields:
+            {"type": "delta", "text": 새로 생성된 텍스트}
+            마지막에 {"type": "done", ...generate_text와 동일한 표준 결과}
+        """
+        payload = self.build_text_payload(request)
+        endpoint = f"{self.text_endpoint}/stream"
+        url = f"{self.base_url}/{endpoint}"
+        transport = get_transport()
+        connect_timeout, read_timeout = self._timeout_for(endpoint, timeout, fallback=self.text_endpoint)
+        headers = {**self._headers(), "Accept": "text/event-stream"}
+
+        started = time.perf_counter()
+        try:
+            async with _get_http_client().stream(
+                'POST',
+                url,
+                headers=headers,
+                json=payload,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            ) as response:
+                # 첫 바이트(응답 헤더)까지의 시간을 계측
+                transport.record(TransportCall(
+                    method='POST',
+                    url=url,
+                    endpoint=endpoint,
+                    status_code=response.status_code,
+                    elapsed=time.perf_counter() - started,
+                    timeout=read_timeout,
+                ))
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._parse_response(response)
+
+                output = ''
+                last_event: Dict[str, Any] = {}
+                async for line in response.aiter_lines():
+                    if not line.startswith('data:'):
+                        continue
+                    raw = line[len('data:'):].strip()
+                    if not raw:
+                        continue
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    if event.get('error'):
+                        raise AIRequestError('fal', f"FAL 스트리밍 오류: {event['error']}", 502)
+
+                    last_event = event
+                    text = event.get('output') or event.get('text') or ''
+                    if text.startswith(output):
+                        delta = text[len(output):]
+                        output = text
+                    else:
+                        # 누적이 아닌 조각 단위 이벤트
+                        delta = text
+                        output += text
+                    if delta:
+                        yield {"type": "delta", "text": delta}
+
+        except httpx.HTTPError as e:
+            transport.record(TransportCall(
+                method='POST',
+                url=url,
+                endpoint=endpoint,
+                status_code=None,
+                elapsed=time.perf_counter() - started,
+                error=e,
+                timeout=read_timeout,
+            ))
+            raise
+
+        yield {"type": "done", **self.parse_text_result(payload['model'], {**last_event, "output": output})}
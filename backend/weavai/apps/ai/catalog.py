@@ -0,0 +1,123 @@
+# WEAV AI 모델 카탈로그
+# 모델별 타입·큐·타임아웃·동시 실행 한도·기본 인자·입력 스키마 (프로세스당 한 번 구성 후 조회만)
+
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Optional, Type
+from pydantic import BaseModel
+from .schemas import (
+    TextGenerationRequest,
+    ImageGenerationRequest,
+    VideoGenerationRequest,
+    KlingVideoRequest,
+)
+
+MODEL_TYPES = ('text', 'image', 'video')
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """모델 한 개의 라우팅 메타데이터"""
+
+    id: str
+    model_type: str
+    schema: Type[BaseModel]
+    provider: str = 'fal'
+    timeout: Optional[float] = None          # 제공자 응답 읽기 타임아웃 (초, FAL_HTTP_ENDPOINT_TIMEOUTS가 우선)
+    max_concurrency: Optional[int] = None    # 사용자당 동시 작업 수 (JOB_SLOT_LIMITS가 우선)
+    default_arguments: Dict[str, Any] = field(default_factory=dict)
+    queue: str = ''                          # Celery 큐 (비우면 config_celery.AI_JOB_QUEUES에서 채움)
+
+
+# 텍스트 모델은 fal any-llm 한 엔드포인트로 호출 — 목록에 없는 'vendor/model' ID도 이 설정으로 허용
+TEXT_MODEL_DEFAULTS = dict(model_type='text', schema=TextGenerationRequest, timeout=60)
+
+MODELS = (
+    # LLM (fal any-llm)
+    ModelSpec(id='openai/gpt-4o-mini', **TEXT_MODEL_DEFAULTS),
+    ModelSpec(id='google/gemini-flash-1.5', **TEXT_MODEL_DEFAULTS),
+
+    # 이미지
+    ModelSpec(id='fal-ai/flux-2', model_type='image', schema=ImageGenerationRequest, timeout=120),
+    ModelSpec(id='fal-ai/nano-banana', model_type='image', schema=ImageGenerationRequest, timeout=120),
+
+    # 비디오
+    ModelSpec(
+        id='fal-ai/sora-2/text-to-video',
+        model_type='video',
+        schema=VideoGenerationRequest,
+        timeout=600,
+        max_concurrency=2,
+        default_arguments={'duration': '8', 'resolution': '720p', 'aspect_ratio': '16:9'},
+    ),
+    ModelSpec(
+        id='fal-ai/kling-video/v2.1/standard/image-to-video',
+        model_type='video',
+        schema=KlingVideoRequest,
+        timeout=600,
+        max_concurrency=2,
+        default_arguments={'duration': '4', 'resolution': '720p', 'aspect_ratio': '16:9'},
+    ),
+)
+
+
+class ModelCatalog:
+    """
+    모델 ID → ModelSpec 조회
+
+    'fal-ai/' 엔드포인트는 목록에 있는 모델만 허용 (타입·스키마를 알 수 없으므로 제출 시점에 거절).
+    그 외 'vendor/model' 형식 ID는 any-llm 텍스트 모델로 보고 TEXT_MODEL_DEFAULTS로 처리.
+    """
+
+    def __init__(self, specs):
+        from weavai.config_celery import AI_JOB_QUEUES
+
+        self.specs = {
+            spec.id: replace(spec, queue=spec.queue or AI_JOB_QUEUES.get(spec.model_type, ''))
+            for spec in specs
+        }
+        self._text_queue = AI_JOB_QUEUES.get('text', '')
+        # 타입별 동시 실행 한도 (모델 한도 중 가장 작은 값)
+        self.type_concurrency = {}
+        for spec in self.specs.values():
+            if spec.max_concurrency:
+                current = self.type_concurrency.get(spec.model_type)
+                self.type_concurrency[spec.model_type] = min(current or spec.max_concurrency, spec.max_concurrency)
+
+    def resolve(self, model: str) -> Optional[ModelSpec]:
+        """
+        모델 ID의 ModelSpec
+
+        Returns:
+            ModelSpec 또는 None (지원하지 않는 모델)
+        """
+        model = (model or '').strip()
+        spec = self.specs.get(model)
+        if spec is not None:
+            return spec
+        if not model or model.startswith('fal-ai/'):
+            return None
+        return ModelSpec(id=model, queue=self._text_queue, **TEXT_MODEL_DEFAULTS)
+
+    def model_type(self, model: str) -> Optional[str]:
+        spec = self.resolve(model)
+        return spec.model_type if spec else None
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ModelCatalog:
+    """
+    프로세스 공용 모델 카탈로그 (싱글톤)
+
+    Returns:
+        ModelCatalog 인스턴스
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ModelCatalog(MODELS)
+    return _catalog
@@ -0,0 +1,152 @@
+# WEAV AI 제공자 서킷 브레이커
+# (제공자, 엔드포인트)별 상태를 Redis로 모든 프로세스가 공유 — 오류율·지연이 높은 엔드포인트는
+# 타임아웃까지 기다리지 않고 바로 실패시키고, 일정 시간 후 호출 하나로 회복 여부를 확인
+
+import logging
+import math
+import time
+import redis
+from django.conf import settings
+from weavai.apps.core.redis import get_redis
+from .errors import AICircuitOpenError
+from .transport import TransportCall, register_transport_hook
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ai:circuit:'  # {provider}:{endpoint} 해시: state / opened_at / probe_until
+WINDOW_SUFFIX = ':w:'       # + 창 번호 해시: total / failures / slow
+STATE_TTL = 86400
+
+# 호출 허용 여부: 'closed' / 'probe' (half-open 확인 호출 하나) / 'open,남은 초'
+_CHECK_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'state', 'opened_at', 'probe_until')
+if not state[1] or state[1] == 'closed' then return 'closed' end
+local now = tonumber(ARGV[1])
+local open_seconds = tonumber(ARGV[2])
+if state[1] == 'open' then
+    local remaining = tonumber(state[2]) + open_seconds - now
+    if remaining > 0 then return 'open,' .. tostring(remaining) end
+    redis.call('HSET', KEYS[1], 'state', 'half_open', 'probe_until', now + open_seconds)
+    return 'probe'
+end
+local probe_until = tonumber(state[3]) or 0
+if now >= probe_until then
+    -- 확인 호출이 결과 없이 끝남 (프로세스 종료 등) — 다음 호출이 다시 확인
+    redis.call('HSET', KEYS[1], 'probe_until', now + open_seconds)
+    return 'probe'
+end
+return 'open,' .. tostring(probe_until - now)
+"""
+
+# 호출 결과 반영: 상태가 바뀌면 새 상태, 아니면 '' 반환
+# 오류율·지연율은 현재 창 + 이전 창(남은 비율만큼 가중)으로 계산 (sliding window 근사)
+_RECORD_SCRIPT = """
+local now = ARGV[1]
+local failed = ARGV[2] == '1'
+local slow = ARGV[3] == '1'
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'half_open' then
+    if failed or slow then
+        redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now)
+        redis.call('EXPIRE', KEYS[1], ARGV[9])
+        return 'open'
+    end
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+    return 'closed'
+end
+if state == 'open' then return '' end
+redis.call('HINCRBY', KEYS[2], 'total', 1)
+if failed then redis.call('HINCRBY', KEYS[2], 'failures', 1) end
+if slow then redis.call('HINCRBY', KEYS[2], 'slow', 1) end
+redis.call('EXPIRE', KEYS[2], ARGV[7])
+local current = redis.call('HMGET', KEYS[2], 'total', 'failures', 'slow')
+local previous = redis.call('HMGET', KEYS[3], 'total', 'failures', 'slow')
+local weight = tonumber(ARGV[8])
+local counts = {}
+for i = 1, 3 do
+    counts[i] = (tonumber(current[i]) or 0) + (tonumber(previous[i]) or 0) * weight
+end
+if counts[1] >= tonumber(ARGV[4])
+        and (counts[2] >= counts[1] * tonumber(ARGV[5]) or counts[3] >= counts[1] * tonumber(ARGV[6])) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now)
+    redis.call('EXPIRE', KEYS[1], ARGV[9])
+    return 'open'
+end
+return ''
+"""
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AI_CIRCUIT_BREAKER_ENABLED', True)
+
+
+def _key(provider: str, endpoint: str) -> str:
+    return f"{KEY_PREFIX}{provider}:{(endpoint or '').strip('/')}"
+
+
+def guard(provider: str, endpoint: str) -> None:
+    """
+    엔드포인트 호출 전 서킷 확인 (Redis 장애 시 확인 없이 통과)
+
+    Args:
+        provider: AI 제공자
+        endpoint: 호출할 엔드포인트 (transport 계측과 같은 이름)
+
+    Raises:
+        AICircuitOpenError: 서킷이 열려 있음 (half-open이면 확인 호출 하나만 통과)
+    """
+    if not is_enabled():
+        return
+    try:
+        script = get_redis().register_script(_CHECK_SCRIPT)
+        result = script(keys=[_key(provider, endpoint)], args=[time.time(), settings.AI_CIRCUIT_OPEN_SECONDS])
+    except redis.RedisError as e:
+        logger.warning(f"서킷 브레이커 사용 불가, 확인 없이 호출: {e}")
+        return
+    result = result.decode() if isinstance(result, bytes) else result
+    if result == 'probe':
+        logger.info(f"서킷 half-open, 확인 호출: {provider}:{endpoint}")
+    elif result.startswith('open'):
+        raise AICircuitOpenError(provider, endpoint, max(1, math.ceil(float(result.split(',')[1]))))
+
+
+def record(provider: str, endpoint: str, failed: bool, slow: bool) -> None:
+    """호출 결과를 서킷에 반영 (오류율·지연율이 기준을 넘으면 열림, half-open 확인 호출 결과로 닫힘/다시 열림)"""
+    window = settings.AI_CIRCUIT_WINDOW
+    now = time.time()
+    index = int(now // window)
+    key = _key(provider, endpoint)
+    try:
+        script = get_redis().register_script(_RECORD_SCRIPT)
+        changed = script(
+            keys=[key, f"{key}{WINDOW_SUFFIX}{index}", f"{key}{WINDOW_SUFFIX}{index - 1}"],
+            args=[
+                now, int(failed), int(slow),
+                settings.AI_CIRCUIT_MIN_CALLS, settings.AI_CIRCUIT_FAILURE_RATE, settings.AI_CIRCUIT_SLOW_RATE,
+                window * 2, 1 - (now % window) / window, STATE_TTL,
+            ],
+        )
+    except redis.RedisError as e:
+        logger.warning(f"서킷 브레이커 기록 실패: {e}")
+        return
+    changed = changed.decode() if isinstance(changed, bytes) else changed
+    if changed == 'open':
+        logger.error(f"서킷 열림: {provider}:{endpoint} ({settings.AI_CIRCUIT_OPEN_SECONDS}초간 호출 차단)")
+    elif changed == 'closed':
+        logger.warning(f"서킷 닫힘 (회복 확인): {provider}:{endpoint}")
+
+
+def _record_call(call: TransportCall) -> None:
+    """
+    transport 계측 훅: 연결 오류·타임아웃·5xx는 실패, 읽기 타임아웃의 AI_CIRCUIT_SLOW_FRACTION 이상 걸리면 지연
+
+    429는 속도 제한(rate_limit)이 처리하므로 집계하지 않고, 다른 4xx는 정상 응답으로 집계.
+    """
+    if not is_enabled() or call.status_code == 429:
+        return
+    failed = call.error is not None or (call.status_code or 0) >= 500
+    slow = bool(call.timeout) and call.elapsed >= call.timeout * settings.AI_CIRCUIT_SLOW_FRACTION
+    record(call.provider, call.endpoint, failed, slow)
+
+
+register_transport_hook(_record_call)
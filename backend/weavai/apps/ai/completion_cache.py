@@ -0,0 +1,122 @@
+# WEAV AI 텍스트 완료 캐시
+# 동일한 (모델, 시스템 프롬프트, 입력, temperature, max tokens) 요청의 응답을 Redis에 재사용
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+from django.conf import settings
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ai:completion:'
+INDEX_KEY = 'ai:completion:index'  # 정렬 집합: 캐시 키 → 저장 시각 (오래된 순 제거용)
+STATS_KEY = 'ai:completion:stats'  # 해시: hits / misses / stores / evictions
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AI_COMPLETION_CACHE_ENABLED', True)
+
+
+def make_key(provider: str, payload: Dict[str, Any]) -> str:
+    """
+    제공자 입력 payload로 캐시 키 생성
+
+    payload는 모델 기본값까지 반영된 최종 입력이므로 기본 모델이 바뀌면 키도 바뀜.
+    공백 차이만 있는 프롬프트는 같은 키가 되도록 문자열을 정규화.
+    """
+    normalized = {}
+    for field, value in payload.items():
+        if isinstance(value, str):
+            value = ' '.join(value.split())
+        elif isinstance(value, float):
+            value = round(value, 4)
+        normalized[field] = value
+    raw = json.dumps([provider, normalized], sort_keys=True, ensure_ascii=False)
+    return KEY_PREFIX + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _count(field: str, amount: int = 1) -> None:
+    try:
+        get_redis().hincrby(STATS_KEY, field, amount)
+    except Exception:
+        pass
+
+
+def lookup(key: str) -> Optional[Dict[str, Any]]:
+    """
+    캐시 조회 (Redis 장애 시 miss로 처리)
+
+    Returns:
+        캐시된 표준 응답 또는 None
+    """
+    try:
+        raw = get_redis().get(key)
+    except Exception as e:
+        logger.warning(f"완료 캐시 조회 실패: {e}")
+        return None
+
+    if raw is None:
+        _count('misses')
+        return None
+    try:
+        result = json.loads(raw)
+    except ValueError:
+        _count('misses')
+        return None
+    _count('hits')
+    return result
+
+
+def store(key: str, result: Dict[str, Any]) -> bool:
+    """
+    캐시 저장 (TTL + 항목 수 상한, 초과 시 오래된 항목부터 제거)
+
+    Returns:
+        저장 여부 (항목 크기 초과/Redis 장애 시 False)
+    """
+    raw = json.dumps(result, ensure_ascii=False)
+    if len(raw.encode('utf-8')) > getattr(settings, 'AI_COMPLETION_CACHE_MAX_ENTRY_BYTES', 65536):
+        return False
+
+    ttl = getattr(settings, 'AI_COMPLETION_CACHE_TTL', 3600)
+    max_entries = getattr(settings, 'AI_COMPLETION_CACHE_MAX_ENTRIES', 10000)
+    now = time.time()
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        pipe.set(key, raw, ex=ttl)
+        pipe.zadd(INDEX_KEY, {key: now})
+        pipe.zremrangebyscore(INDEX_KEY, '-inf', now - ttl)  # TTL로 이미 만료된 항목 정리
+        pipe.zcard(INDEX_KEY)
+        pipe.hincrby(STATS_KEY, 'stores', 1)
+        size = pipe.execute()[3]
+
+        overflow = size - max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in client.zpopmin(INDEX_KEY, overflow)]
+            if evicted:
+                client.delete(*evicted)
+                client.hincrby(STATS_KEY, 'evictions', len(evicted))
+        return True
+    except Exception as e:
+        logger.warning(f"완료 캐시 저장 실패: {e}")
+        return False
+
+
+def stats() -> Dict[str, Any]:
+    """
+    캐시 hit/miss 카운터와 현재 항목 수
+
+    Returns:
+        {"hits", "misses", "stores", "evictions", "entries", "hit_rate"}
+    """
+    client = get_redis()
+    counters = {k.decode(): int(v) for k, v in client.hgetall(STATS_KEY).items()}
+    result = {field: counters.get(field, 0) for field in ('hits', 'misses', 'stores', 'evictions')}
+    result['entries'] = client.zcard(INDEX_KEY)
+    lookups = result['hits'] + result['misses']
+    result['hit_rate'] = round(result['hits'] / lookups, 4) if lookups else 0.0
+    return result
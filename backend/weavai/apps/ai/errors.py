@@ -37,9 +37,10 @@ class AIRequestError(AIServiceError):
 
 
 class AIQuotaExceededError(AIServiceError):
-    """AI API 할당량 초과 에러"""
+    """AI API 할당량 초과 에러 (retry_after: 다시 시도할 수 있을 때까지 초, 알 수 없으면 None)"""
 
-    def __init__(self, provider: str):
+    def __init__(self, provider: str, retry_after: Optional[int] = None):
+        self.retry_after = retry_after
         super().__init__(
             f"{provider.upper()} API 할당량이 초과되었습니다",
             provider=provider,
@@ -55,4 +56,17 @@ class AIModelNotAvailableError(AIServiceError):
             f"{provider.upper()} 모델 '{model}'을 사용할 수 없습니다",
             provider=provider,
             status_code=400
-        )
\ No newline at end of file
+        )
+
+
+class AICircuitOpenError(AIRequestError):
+    """제공자 엔드포인트 서킷 열림 (최근 오류·지연이 많아 호출하지 않고 바로 실패)"""
+
+    def __init__(self, provider: str, endpoint: str, retry_after: int):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            provider,
+            f"'{endpoint}' 응답이 불안정해 호출을 일시 중단했습니다. {retry_after}초 후 다시 시도해 주세요",
+            503  # Service Unavailable
+        )
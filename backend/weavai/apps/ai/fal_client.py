@@ -2,10 +2,10 @@
 # fal.run HTTP API 기반 텍스트/이미지/비디오 생성
 
 import os
-from typing import Dict, Any
-import requests
+from typing import Dict, Any, Optional, Union
 from .schemas import TextGenerationRequest, ImageGenerationRequest, VideoGenerationRequest
 from .errors import AIProviderError, AIRequestError, AIQuotaExceededError
+from .transport import get_transport
 
 
 class FalClient:
@@ -28,10 +28,14 @@ class FalClient:
             "Content-Type": "application/json",
         }
 
-    def _post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _post(self, endpoint: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.post(url, headers=self._headers(), json=payload, timeout=60)
+        response = get_transport().request('POST', url, endpoint=endpoint, timeout=timeout,
+                                           headers=self._headers(), json=payload)
+        return self._parse_response(response)
 
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """HTTP 응답 검증 및 JSON 변환 (requests/httpx 응답 공용)"""
         if response.status_code == 401:
             raise AIProviderError('fal', 'FAL API 키가 유효하지 않습니다', status_code=401)
         if response.status_code == 429:
@@ -79,20 +83,57 @@ class FalClient:
                 return data['output']
         raise AIRequestError('fal', '비디오 URL을 찾을 수 없습니다', 500)
 
-    def generate_text(self, request: TextGenerationRequest) -> Dict[str, Any]:
-        fal_model = request.model or self.default_text_model
+    def _extract_media_urls(self, data: Dict[str, Any], key: str) -> list:
+        items = data.get(key) if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return []
+        urls = []
+        for item in items:
+            if isinstance(item, dict) and item.get('url'):
+                urls.append(item['url'])
+            elif isinstance(item, str):
+                urls.append(item)
+        return urls
+
+    def build_media_payload(self, request: Union[ImageGenerationRequest, VideoGenerationRequest]) -> Dict[str, Any]:
+        """이미지/비디오 요청을 fal 입력 payload로 변환 (동기 호출·Queue 제출 공용)"""
+        return {
+            "prompt": request.prompt,
+        }
+
+    def parse_media_result(self, model_type: str, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """fal 이미지/비디오 응답을 표준 결과로 변환 (동기 호출·Queue 결과 공용)"""
+        if model_type == 'video':
+            url = self._extract_video_url(data)
+            urls = self._extract_media_urls(data, 'videos')
+        else:
+            url = self._extract_image_url(data)
+            urls = self._extract_media_urls(data, 'images')
 
+        result = {
+            "provider": "fal",
+            "model": endpoint,
+            "url": url,
+        }
+        # 여러 개 생성된 경우 전체 URL (num_images 등)
+        if len(urls) > 1:
+            result["urls"] = urls
+        return result
+
+    def build_text_payload(self, request: TextGenerationRequest) -> Dict[str, Any]:
+        """텍스트 요청을 fal any-llm 입력 payload로 변환 (동기/비동기 공용)"""
         payload = {
             "prompt": request.input_text,
             "system_prompt": request.system_prompt,
             "temperature": request.temperature,
             "max_tokens": request.max_output_tokens,
-            "model": fal_model,
+            "model": request.model or self.default_text_model,
         }
         # 불필요한 None 제거
-        payload = {k: v for k, v in payload.items() if v is not None}
+        return {k: v for k, v in payload.items() if v is not None}
 
-        data = self._post(self.text_endpoint, payload)
+    def parse_text_result(self, fal_model: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """fal 텍스트 응답을 표준 결과로 변환 (동기/비동기 공용)"""
         output = data.get('output') or data.get('text')
         if not output:
             raise AIRequestError('fal', '텍스트 응답이 비어있습니다', 500)
@@ -105,38 +146,25 @@ class FalClient:
             "finish_reason": data.get('finish_reason'),
         }
 
-    def generate_image(self, request: ImageGenerationRequest) -> Dict[str, Any]:
+    def generate_text(self, request: TextGenerationRequest, timeout: Optional[float] = None) -> Dict[str, Any]:
+        payload = self.build_text_payload(request)
+        data = self._post(self.text_endpoint, payload, timeout=timeout)
+        return self.parse_text_result(payload['model'], data)
+
+    def generate_image(self, request: ImageGenerationRequest, timeout: Optional[float] = None) -> Dict[str, Any]:
         model = request.model
         endpoint = model or None
         if not endpoint:
             raise AIRequestError('fal', '지원하지 않는 이미지 모델', 400)
 
-        payload = {
-            "prompt": request.prompt,
-        }
-        data = self._post(endpoint, payload)
-        url = self._extract_image_url(data)
+        data = self._post(endpoint, self.build_media_payload(request), timeout=timeout)
+        return self.parse_media_result('image', endpoint, data)
 
-        return {
-            "provider": "fal",
-            "model": endpoint,
-            "url": url,
-        }
-
-    def generate_video(self, request: VideoGenerationRequest) -> Dict[str, Any]:
+    def generate_video(self, request: VideoGenerationRequest, timeout: Optional[float] = None) -> Dict[str, Any]:
         model = request.model
         endpoint = model or None
         if not endpoint:
             raise AIRequestError('fal', '지원하지 않는 비디오 모델', 400)
 
-        payload = {
-            "prompt": request.prompt,
-        }
-        data = self._post(endpoint, payload)
-        url = self._extract_video_url(data)
-
-        return {
-            "provider": "fal",
-            "model": endpoint,
-            "url": url,
-        }
+        data = self._post(endpoint, self.build_media_payload(request), timeout=timeout)
+        return self.parse_media_result('video', endpoint, data)
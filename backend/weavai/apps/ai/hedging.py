@@ -0,0 +1,183 @@
+# WEAV AI 텍스트 생성 헤징 (hedged requests)
+# 모델별 최근 응답 시간의 백분위까지 응답이 없으면 같은(또는 대체) 모델로 두 번째 요청을 보내
+# 먼저 성공한 응답을 사용 — 제공자 꼬리 지연(p99)을 줄임
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 모델별 최근 응답 시간 (초, 프로세스 로컬 — 헤지 지연 결정에만 사용)
+_latencies: Dict[str, Deque[float]] = {}
+_latencies_lock = threading.Lock()
+
+# 프로세스 공용 실행기 (prefork 워커는 fork 이후 자식마다 새로 생성)
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AI_HEDGE_ENABLED', False)
+
+
+def record_latency(model: str, seconds: float) -> None:
+    """성공한 제공자 호출의 응답 시간 기록 (최근 AI_HEDGE_SAMPLE_SIZE개 유지)"""
+    with _latencies_lock:
+        samples = _latencies.get(model)
+        if samples is None:
+            samples = _latencies[model] = deque(maxlen=settings.AI_HEDGE_SAMPLE_SIZE)
+        samples.append(seconds)
+
+
+def latency_percentile(model: str, percentile: float) -> Optional[float]:
+    """
+    모델의 최근 응답 시간 백분위 (초)
+
+    Returns:
+        백분위 값 또는 None (표본이 AI_HEDGE_MIN_SAMPLES개 미만)
+    """
+    with _latencies_lock:
+        samples = sorted(_latencies.get(model) or ())
+    if len(samples) < settings.AI_HEDGE_MIN_SAMPLES:
+        return None
+    index = min(len(samples) - 1, max(0, math.ceil(percentile * len(samples)) - 1))
+    return samples[index]
+
+
+def hedge_delay(model: str) -> Optional[float]:
+    """두 번째 요청까지 기다릴 시간 (AI_HEDGE_PERCENTILE 백분위, MIN/MAX_DELAY로 제한 — 표본이 부족하면 None)"""
+    value = latency_percentile(model, settings.AI_HEDGE_PERCENTILE)
+    if value is None:
+        return None
+    return min(max(value, settings.AI_HEDGE_MIN_DELAY), settings.AI_HEDGE_MAX_DELAY)
+
+
+def fallback_model(model: str) -> str:
+    """헤지 요청에 쓸 모델 (AI_HEDGE_FALLBACK_MODELS 'openai/gpt-4o-mini=google/gemini-flash-1.5', 없으면 같은 모델)"""
+    for entry in getattr(settings, 'AI_HEDGE_FALLBACK_MODELS', []):
+        source, _, target = str(entry).partition('=')
+        if source.strip() == model and target.strip():
+            return target.strip()
+    return model
+
+
+def timed(model: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """fn 실행 시간을 model 응답 시간으로 기록 (성공한 호출만)"""
+    started = time.perf_counter()
+    result = fn()
+    record_latency(model, time.perf_counter() - started)
+    return result
+
+
+async def atimed(model: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """timed의 asyncio 버전"""
+    started = time.perf_counter()
+    result = await fn()
+    record_latency(model, time.perf_counter() - started)
+    return result
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.AI_HEDGE_MAX_WORKERS, thread_name_prefix='ai-hedge'
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def run(model: str, primary: Callable[[], Dict[str, Any]], hedge: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    헤징 실행
+
+    primary가 hedge_delay 안에 끝나지 않으면 hedge를 추가로 실행하고 먼저 성공한 결과를 반환.
+    동기 HTTP 호출은 중단할 수 없으므로 늦은 쪽은 결과만 버림 (응답 시간은 끝날 때 기록되어 백분위에 반영).
+    표본이 부족하면 primary만 호출 스레드에서 실행.
+
+    Args:
+        model: 지연 기준 모델
+        primary: 원래 요청
+        hedge: 두 번째 요청 (같은 모델 또는 대체 모델)
+
+    Returns:
+        먼저 성공한 결과
+
+    Raises:
+        Exception: 두 요청 모두 실패 (primary 오류 우선), 또는 헤지 전에 primary가 실패
+    """
+    delay = hedge_delay(model)
+    if delay is None:
+        return primary()
+
+    executor = _get_executor()
+    first = executor.submit(primary)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+
+    logger.info(f"헤지 요청 전송: {model} ({delay:.2f}초 초과)")
+    second = executor.submit(hedge)
+    pending = {first, second}
+    errors = {}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in (first, second):
+            if future not in done:
+                continue
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()  # 실행 중이면 효과 없음 — 결과만 버림
+                if future is second:
+                    logger.info(f"헤지 요청이 먼저 응답: {model}")
+                return future.result()
+            errors[future] = future.exception()
+    raise errors.get(first) or errors[second]
+
+
+async def arun(model: str, primary: Callable[[], Awaitable[Dict[str, Any]]],
+               hedge: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """run의 asyncio 버전 (늦은 쪽 요청은 취소 — 연결을 닫아 제공자 호출도 중단)"""
+    delay = hedge_delay(model)
+    if delay is None:
+        return await primary()
+
+    first = asyncio.ensure_future(primary())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result()
+
+        logger.info(f"헤지 요청 전송: {model} ({delay:.2f}초 초과)")
+        second = asyncio.ensure_future(hedge())
+        tasks.append(second)
+        pending = set(tasks)
+        errors = {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task not in done:
+                    continue
+                if task.exception() is None:
+                    if task is second:
+                        logger.info(f"헤지 요청이 먼저 응답: {model}")
+                    return task.result()
+                errors[task] = task.exception()
+        raise errors.get(first) or errors[second]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
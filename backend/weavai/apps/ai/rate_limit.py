@@ -0,0 +1,244 @@
+# WEAV AI 제공자 호출 속도 제한 (클러스터 공용 토큰 버킷)
+# 모든 gunicorn 스레드·Celery 워커가 (제공자, 모델)별 Redis 버킷 하나를 공유하고,
+# 429를 받으면 속도를 줄였다가(곱셈 감소) 성공할 때마다 조금씩 회복(덧셈 증가)
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple
+import redis
+from django.conf import settings
+from weavai.apps.core.redis import get_async_redis, get_redis
+from .errors import AIQuotaExceededError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ai:ratelimit:'  # 해시: tokens / ts / rate / cut_at
+KEY_TTL = 3600  # 마지막 호출 후 이 시간이 지나면 버킷 초기화 (줄어든 속도도 기본값으로)
+
+# 토큰 예약: 기다릴 시간이 max_wait 이하면 토큰을 미리 차감(음수 허용)하고 대기 시간 반환 → 대기 순서대로 호출
+# 반환: "대기 초,현재 속도,예약 여부(1/0)"
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local base = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'rate')
+local rate = math.min(tonumber(state[3]) or base, base)
+local capacity = math.max(1, rate * burst)
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then wait = (1 - tokens) / rate end
+local reserved = 0
+if wait <= max_wait then
+    tokens = tokens - 1
+    reserved = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'rate', rate)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tostring(wait) .. ',' .. tostring(rate) .. ',' .. reserved
+"""
+
+# 429: 속도를 factor배로 (cooldown 안의 연속 429는 한 번만 반영), 남은 버스트 토큰도 비움
+_PENALIZE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local base = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'rate', 'cut_at', 'tokens')
+local rate = math.min(tonumber(state[1]) or base, base)
+if now - (tonumber(state[2]) or 0) < tonumber(ARGV[5]) then
+    return tostring(rate)
+end
+rate = math.max(tonumber(ARGV[4]), rate * tonumber(ARGV[3]))
+local tokens = math.min(tonumber(state[3]) or 0, 0)
+redis.call('HSET', KEYS[1], 'rate', rate, 'cut_at', now, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+return tostring(rate)
+"""
+
+# 성공: 기본 속도의 step만큼 회복
+_REWARD_SCRIPT = """
+local base = tonumber(ARGV[1])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or base)
+if rate < base then
+    rate = math.min(base, rate + base * tonumber(ARGV[2]))
+    redis.call('HSET', KEYS[1], 'rate', rate)
+end
+return tostring(rate)
+"""
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AI_RATE_LIMIT_ENABLED', False)
+
+
+def _key(provider: str, model: str) -> str:
+    return f"{KEY_PREFIX}{provider}:{model or 'default'}"
+
+
+def base_rate(model: str) -> float:
+    """
+    모델의 기본 호출 속도 (초당 요청 수)
+
+    AI_RATE_LIMITS('fal-ai/sora-2=0.5,fal-ai=20')에서 가장 긴 prefix 일치, 없으면 AI_RATE_LIMIT_DEFAULT
+    """
+    model = (model or '').strip('/')
+    matched, rate = None, float(settings.AI_RATE_LIMIT_DEFAULT)
+    for entry in getattr(settings, 'AI_RATE_LIMITS', []):
+        prefix, _, value = str(entry).partition('=')
+        prefix = prefix.strip().strip('/')
+        if not prefix or not (model == prefix or model.startswith(prefix + '/')):
+            continue
+        try:
+            if matched is None or len(prefix) > len(matched):
+                matched, rate = prefix, float(value)
+        except ValueError:
+            logger.warning(f"잘못된 AI_RATE_LIMITS 항목 무시: {entry}")
+    return rate
+
+
+def _acquire_args(model: str, max_wait: float) -> list:
+    return [time.time(), base_rate(model), settings.AI_RATE_LIMIT_BURST, max_wait, KEY_TTL]
+
+
+def _parse_acquire(raw) -> Tuple[float, float, bool]:
+    raw = raw.decode() if isinstance(raw, bytes) else raw
+    wait, rate, reserved = raw.split(',')
+    return float(wait), float(rate), reserved == '1'
+
+
+def acquire(provider: str, model: str, max_wait: float) -> float:
+    """
+    호출 토큰 하나 확보 (필요하면 대기 — 대기 순서는 예약 순)
+
+    Args:
+        provider: AI 제공자
+        model: 모델 (버킷 단위)
+        max_wait: 최대 대기 시간 (초)
+
+    Returns:
+        현재 버킷 속도 (Redis 장애 시 기본 속도 — 제한 없이 통과)
+
+    Raises:
+        AIQuotaExceededError: max_wait 안에 토큰을 확보할 수 없음
+    """
+    try:
+        script = get_redis().register_script(_ACQUIRE_SCRIPT)
+        wait, rate, reserved = _parse_acquire(script(keys=[_key(provider, model)], args=_acquire_args(model, max_wait)))
+    except redis.RedisError as e:
+        logger.warning(f"속도 제한 사용 불가, 제한 없이 호출: {e}")
+        return base_rate(model)
+    if not reserved:
+        logger.warning(f"속도 제한 대기 시간 초과: {provider}:{model} rate={rate:.2f}/s wait={wait:.1f}s")
+        raise AIQuotaExceededError(provider, retry_after=max(1, math.ceil(wait)))
+    if wait > 0:
+        time.sleep(wait)
+    return rate
+
+
+async def aacquire(provider: str, model: str, max_wait: float) -> float:
+    """acquire의 asyncio 버전 (대기 중 이벤트 루프를 막지 않음)"""
+    try:
+        script = get_async_redis().register_script(_ACQUIRE_SCRIPT)
+        raw = await script(keys=[_key(provider, model)], args=_acquire_args(model, max_wait))
+        wait, rate, reserved = _parse_acquire(raw)
+    except redis.RedisError as e:
+        logger.warning(f"속도 제한 사용 불가, 제한 없이 호출: {e}")
+        return base_rate(model)
+    if not reserved:
+        logger.warning(f"속도 제한 대기 시간 초과: {provider}:{model} rate={rate:.2f}/s wait={wait:.1f}s")
+        raise AIQuotaExceededError(provider, retry_after=max(1, math.ceil(wait)))
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return rate
+
+
+def penalize(provider: str, model: str) -> None:
+    """제공자 429 반영: 버킷 속도를 AI_RATE_LIMIT_DECREASE배로 (최소 AI_RATE_LIMIT_MIN_FRACTION × 기본 속도)"""
+    base = base_rate(model)
+    try:
+        script = get_redis().register_script(_PENALIZE_SCRIPT)
+        rate = float(script(keys=[_key(provider, model)], args=[
+            time.time(), base, settings.AI_RATE_LIMIT_DECREASE, base * settings.AI_RATE_LIMIT_MIN_FRACTION,
+            settings.AI_RATE_LIMIT_COOLDOWN, KEY_TTL,
+        ]))
+        logger.warning(f"제공자 429, 호출 속도 감소: {provider}:{model} rate={rate:.2f}/s")
+    except redis.RedisError as e:
+        logger.warning(f"속도 제한 갱신 실패: {e}")
+
+
+def reward(provider: str, model: str, rate: float) -> None:
+    """성공 반영: 줄어든 속도를 기본 속도의 AI_RATE_LIMIT_RECOVERY만큼 회복 (기본 속도면 Redis 호출 없음)"""
+    base = base_rate(model)
+    if rate >= base:
+        return
+    try:
+        script = get_redis().register_script(_REWARD_SCRIPT)
+        script(keys=[_key(provider, model)], args=[base, settings.AI_RATE_LIMIT_RECOVERY])
+    except redis.RedisError as e:
+        logger.warning(f"속도 제한 갱신 실패: {e}")
+
+
+def call(provider: str, model: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    속도 제한 안에서 제공자 호출
+
+    429(AIQuotaExceededError)를 받으면 속도를 줄이고 AI_RATE_LIMIT_MAX_WAIT 안에서 다시 시도 —
+    한도를 넘는 순간에도 요청을 바로 실패시키지 않고 줄어든 속도로 줄 세움.
+
+    Raises:
+        AIQuotaExceededError: 대기 시간 안에 호출하지 못함 (워커는 작업을 다시 큐에 넣음)
+    """
+    if not is_enabled():
+        return fn()
+    deadline = time.monotonic() + settings.AI_RATE_LIMIT_MAX_WAIT
+    while True:
+        rate = acquire(provider, model, max(0.0, deadline - time.monotonic()))
+        try:
+            result = fn()
+        except AIQuotaExceededError:
+            penalize(provider, model)
+            if time.monotonic() >= deadline:
+                raise
+            continue
+        reward(provider, model, rate)
+        return result
+
+
+async def acall(provider: str, model: str, fn: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """call의 asyncio 버전 (penalize/reward는 짧은 Redis 호출이라 동기 클라이언트 사용)"""
+    if not is_enabled():
+        return await fn()
+    deadline = time.monotonic() + settings.AI_RATE_LIMIT_MAX_WAIT
+    while True:
+        rate = await aacquire(provider, model, max(0.0, deadline - time.monotonic()))
+        try:
+            result = await fn()
+        except AIQuotaExceededError:
+            penalize(provider, model)
+            if time.monotonic() >= deadline:
+                raise
+            continue
+        reward(provider, model, rate)
+        return result
+
+
+async def astream(provider: str, model: str, events: Callable[[], AsyncIterator[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    스트리밍 호출 속도 제한 (토큰 확보 후 스트림 시작)
+
+    이미 일부를 보낸 스트림은 다시 시작할 수 없으므로 429는 속도만 줄이고 그대로 전파.
+    """
+    if not is_enabled():
+        async for event in events():
+            yield event
+        return
+    await aacquire(provider, model, settings.AI_RATE_LIMIT_MAX_WAIT)
+    try:
+        async for event in events():
+            yield event
+    except AIQuotaExceededError:
+        penalize(provider, model)
+        raise
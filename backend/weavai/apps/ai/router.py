@@ -2,10 +2,13 @@
 # 요청을 적절한 AI 클라이언트로 분배
 
 import os
-from typing import Dict, Any, Union
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+from django.conf import settings
+from . import circuit_breaker, completion_cache, hedging, rate_limit, single_flight
+from .catalog import ModelSpec, get_catalog
 from .fal_client import FalClient
 from .schemas import TextGenerationRequest, ImageGenerationRequest, VideoGenerationRequest
-from .errors import AIServiceError, AIProviderError
+from .errors import AIServiceError, AIProviderError, AIRequestError
 
 
 class AIServiceRouter:
@@ -13,6 +16,7 @@ class AIServiceRouter:
 
     def __init__(self):
         self.clients = {}
+        self.async_clients = {}
         self.default_provider = os.getenv('AI_PROVIDER_DEFAULT', 'fal')
 
     def _get_client(self, provider: str):
@@ -25,10 +29,55 @@ class AIServiceRouter:
 
         return self.clients[provider]
 
+    def _get_async_client(self, provider: str):
+        """비동기 클라이언트 인스턴스 가져오기 (Lazy Loading)"""
+        if provider not in self.async_clients:
+            if provider == 'fal':
+                from .async_fal_client import AsyncFalClient
+                self.async_clients[provider] = AsyncFalClient()
+            else:
+                raise AIProviderError(provider, f"지원하지 않는 AI 제공자: {provider}")
+
+        return self.async_clients[provider]
+
+    def _spec(self, model_type: str, arguments: Dict[str, Any]) -> Optional[ModelSpec]:
+        """arguments['model']의 카탈로그 항목 (없거나 타입이 다르면 None → 기본 스키마·타임아웃 사용)"""
+        spec = get_catalog().resolve(arguments.get('model'))
+        return spec if spec is not None and spec.model_type == model_type else None
+
+    def _hedge_request(self, request: TextGenerationRequest, model: str) -> Tuple[TextGenerationRequest, Optional[float]]:
+        """헤지 요청과 타임아웃 (AI_HEDGE_FALLBACK_MODELS에 대체 모델이 있으면 모델만 바꿈)"""
+        fallback = hedging.fallback_model(model)
+        if fallback == model:
+            spec = self._spec('text', {'model': model})
+            return request, spec.timeout if spec else None
+        spec = self._spec('text', {'model': fallback})
+        return request.model_copy(update={'model': fallback}), spec.timeout if spec else None
+
+    def _call_text(self, provider: str, client, request: TextGenerationRequest, timeout: Optional[float]) -> Dict[str, Any]:
+        """텍스트 생성 1회 호출 (서킷이 열려 있으면 바로 실패, 제공자 속도 제한 안에서, 응답 시간 기록)"""
+        model = client.build_text_payload(request)['model']
+        circuit_breaker.guard(provider, client.text_endpoint)
+        return rate_limit.call(
+            provider, model, lambda: hedging.timed(model, lambda: client.generate_text(request, timeout=timeout))
+        )
+
+    async def _acall_text(self, provider: str, client, request: TextGenerationRequest, timeout: Optional[float]) -> Dict[str, Any]:
+        """_call_text의 asyncio 버전"""
+        model = client.build_text_payload(request)['model']
+        circuit_breaker.guard(provider, client.text_endpoint)
+        return await rate_limit.acall(
+            provider, model, lambda: hedging.atimed(model, lambda: client.agenerate_text(request, timeout=timeout))
+        )
+
     def generate_text(self, provider: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
         텍스트 생성 라우팅
 
+        temperature가 0이거나 arguments['cache']가 참이면 완료 캐시를 사용 (응답에 "cached": true 표시).
+        캐시에는 요청한 모델의 응답만 저장 (헤지 대체 모델의 응답은 반환만 함).
+        AI_HEDGE_ENABLED면 최근 응답 시간 백분위까지 응답이 없을 때 같은(또는 대체) 모델로 두 번째 요청 (hedging.run).
+
         Args:
             provider: AI 제공자 ('fal')
             arguments: 요청 파라미터
@@ -37,14 +86,43 @@ class AIServiceRouter:
             Dict: 표준화된 AI 응답
         """
         try:
+            arguments = dict(arguments)
+            use_cache = bool(arguments.pop('cache', False))
+
             # 요청 데이터 검증
-            request = TextGenerationRequest(**arguments)
+            spec = self._spec('text', arguments)
+            request = (spec.schema if spec else TextGenerationRequest)(**arguments)
+            timeout = spec.timeout if spec else None
 
             # 클라이언트 가져오기
             client = self._get_client(provider)
 
-            # 텍스트 생성 호출
-            return client.generate_text(request)
+            payload = client.build_text_payload(request)
+
+            def call():
+                # 텍스트 생성 호출
+                if not hedging.is_enabled():
+                    return self._call_text(provider, client, request, timeout)
+                hedge_request, hedge_timeout = self._hedge_request(request, payload['model'])
+                return hedging.run(
+                    payload['model'],
+                    lambda: self._call_text(provider, client, request, timeout),
+                    lambda: self._call_text(provider, client, hedge_request, hedge_timeout),
+                )
+
+            if not completion_cache.is_enabled() or not (use_cache or request.temperature == 0):
+                return call()
+
+            key = completion_cache.make_key(provider, payload)
+            cached = completion_cache.lookup(key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+
+            result = call()
+            # 헤지가 대체 모델로 이겼으면 원래 모델 키에 저장하지 않음 (결정적 요청이 다른 모델 응답을 받지 않도록)
+            if result.get('model') == payload['model']:
+                completion_cache.store(key, result)
+            return result
 
         except AIServiceError:
             # 이미 커스텀 에러인 경우 그대로 전파
@@ -53,6 +131,66 @@ class AIServiceRouter:
             # 예상치 못한 에러 처리
             raise AIProviderError(provider, f"텍스트 생성 중 예상치 못한 오류: {str(e)}")
 
+    async def agenerate_text(self, provider: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        텍스트 생성 라우팅 (asyncio, ASGI 뷰용)
+
+        Args:
+            provider: AI 제공자 ('fal')
+            arguments: 요청 파라미터
+
+        Returns:
+            Dict: 표준화된 AI 응답
+        """
+        try:
+            spec = self._spec('text', arguments)
+            request = (spec.schema if spec else TextGenerationRequest)(**arguments)
+            client = self._get_async_client(provider)
+            timeout = spec.timeout if spec else None
+            if not hedging.is_enabled():
+                return await self._acall_text(provider, client, request, timeout)
+            model = client.build_text_payload(request)['model']
+            hedge_request, hedge_timeout = self._hedge_request(request, model)
+            return await hedging.arun(
+                model,
+                lambda: self._acall_text(provider, client, request, timeout),
+                lambda: self._acall_text(provider, client, hedge_request, hedge_timeout),
+            )
+
+        except AIServiceError:
+            raise
+        except Exception as e:
+            raise AIProviderError(provider, f"텍스트 생성 중 예상치 못한 오류: {str(e)}")
+
+    async def astream_text(self, provider: str, arguments: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        텍스트 스트리밍 생성 라우팅 (asyncio, SSE 뷰용)
+
+        Args:
+            provider: AI 제공자 ('fal')
+            arguments: 요청 파라미터
+
+        Yields:
+            {"type": "delta", "text": ...} 이벤트들, 마지막에 {"type": "done", ...표준 응답}
+        """
+        try:
+            spec = self._spec('text', arguments)
+            request = (spec.schema if spec else TextGenerationRequest)(**arguments)
+            client = self._get_async_client(provider)
+            circuit_breaker.guard(provider, f"{client.text_endpoint}/stream")
+            events = rate_limit.astream(
+                provider,
+                client.build_text_payload(request)['model'],
+                lambda: client.astream_text(request, timeout=spec.timeout if spec else None),
+            )
+            async for event in events:
+                yield event
+
+        except AIServiceError:
+            raise
+        except Exception as e:
+            raise AIProviderError(provider, f"텍스트 스트리밍 중 예상치 못한 오류: {str(e)}")
+
     def generate_image(self, provider: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
         이미지 생성 라우팅
@@ -66,13 +204,19 @@ class AIServiceRouter:
         """
         try:
             # 요청 데이터 검증
-            request = ImageGenerationRequest(**arguments)
+            spec = self._spec('image', arguments)
+            request = (spec.schema if spec else ImageGenerationRequest)(**arguments)
 
             # 클라이언트 가져오기
             client = self._get_client(provider)
 
-            # 이미지 생성 호출
-            return client.generate_image(request)
+            # 이미지 생성 호출 (서킷이 열려 있으면 바로 실패, 제공자 속도 제한 안에서)
+            circuit_breaker.guard(provider, request.model)
+            return rate_limit.call(
+                provider,
+                request.model,
+                lambda: client.generate_image(request, timeout=spec.timeout if spec else None),
+            )
 
         except AIServiceError:
             raise
@@ -92,20 +236,26 @@ class AIServiceRouter:
         """
         try:
             # 요청 데이터 검증
-            request = VideoGenerationRequest(**arguments)
+            spec = self._spec('video', arguments)
+            request = (spec.schema if spec else VideoGenerationRequest)(**arguments)
 
             # 클라이언트 가져오기
             client = self._get_client(provider)
 
-            # 비디오 생성 호출
-            return client.generate_video(request)
+            # 비디오 생성 호출 (서킷이 열려 있으면 바로 실패, 제공자 속도 제한 안에서)
+            circuit_breaker.guard(provider, request.model)
+            return rate_limit.call(
+                provider,
+                request.model,
+                lambda: client.generate_video(request, timeout=spec.timeout if spec else None),
+            )
 
         except AIServiceError:
             raise
         except Exception as e:
             raise AIProviderError(provider, f"비디오 생성 중 예상치 못한 오류: {str(e)}")
 
-    def route_and_run(self, provider: str, model_type: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    def route_and_run(self, provider: str, model_type: str, arguments: Dict[str, Any], user_id=None) -> Dict[str, Any]:
         """
         범용 라우팅 메소드
 
@@ -113,10 +263,19 @@ class AIServiceRouter:
             provider: AI 제공자
             model_type: 모델 타입 ('text', 'image', 'video')
             arguments: 요청 파라미터
+            user_id: 요청 사용자 (동일 요청 병합은 같은 사용자끼리만)
 
         Returns:
             Dict: 표준화된 AI 응답
         """
+        if model_type in getattr(settings, 'AI_SINGLE_FLIGHT_MODEL_TYPES', []):
+            # 동시에 들어온 동일 요청은 한 번만 제공자 호출 (다른 프로세스 포함)
+            key = single_flight.fingerprint(provider, model_type, arguments, user_id=user_id)
+            return single_flight.run(key, lambda: self._route(provider, model_type, arguments))
+        return self._route(provider, model_type, arguments)
+
+    def _route(self, provider: str, model_type: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """model_type별 생성 메소드 호출"""
         if model_type == 'text':
             return self.generate_text(provider, arguments)
         elif model_type == 'image':
@@ -127,5 +286,46 @@ class AIServiceRouter:
             raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
 
 
+    def prepare_media_request(self, provider: str, model_type: str, arguments: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Queue 제출용 이미지/비디오 요청 준비 (검증 + payload 변환)
+
+        Args:
+            provider: AI 제공자
+            model_type: 모델 타입 ('image', 'video')
+            arguments: 요청 파라미터
+
+        Returns:
+            Tuple: (endpoint, 제공자 입력 payload)
+        """
+        schema = {'image': ImageGenerationRequest, 'video': VideoGenerationRequest}.get(model_type)
+        if schema is None:
+            raise ValueError(f"Queue 제출을 지원하지 않는 모델 타입: {model_type}")
+
+        spec = self._spec(model_type, arguments)
+        request = (spec.schema if spec else schema)(**arguments)
+        if not request.model:
+            raise AIRequestError(provider, f'지원하지 않는 {model_type} 모델', 400)
+
+        client = self._get_client(provider)
+        return request.model, client.build_media_payload(request)
+
+    def parse_media_result(self, provider: str, model_type: str, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue 결과를 route_and_run과 동일한 표준 응답으로 변환
+
+        Args:
+            provider: AI 제공자
+            model_type: 모델 타입 ('image', 'video')
+            endpoint: 작업을 제출한 모델 endpoint
+            data: 제공자 결과 데이터
+
+        Returns:
+            Dict: 표준화된 AI 응답
+        """
+        client = self._get_client(provider)
+        return client.parse_media_result(model_type, endpoint, data)
+
+
 # 글로벌 라우터 인스턴스
 ai_router = AIServiceRouter()
@@ -52,3 +52,11 @@ class VideoGenerationRequest(BaseModel):
     aspect_ratio: Optional[str] = Field("16:9", pattern=r'^(16:9|9:16)$')
     style: Optional[str] = Field("realistic", max_length=50)
     model: Optional[str] = Field(None, max_length=100)
+
+
+class KlingVideoRequest(VideoGenerationRequest):
+    """Kling 비디오 생성 요청 스키마 (4/8초, 1080p 지원, 가로 비율만)"""
+
+    duration: Optional[str] = Field("8", pattern=r'^(4|8)$')
+    resolution: Optional[str] = Field("720p", pattern=r'^(720p|1080p)$')
+    aspect_ratio: Optional[str] = Field("16:9", pattern=r'^(16:9)$')
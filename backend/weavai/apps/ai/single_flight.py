@@ -0,0 +1,134 @@
+# WEAV AI 동일 생성 요청 병합 (single-flight)
+# 여러 gunicorn/Celery 프로세스가 같은 요청을 동시에 실행할 때 한 번만 제공자를 호출하고 결과를 공유
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict
+import redis
+from django.conf import settings
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'ai:flight:lock:'
+RESULT_PREFIX = 'ai:flight:result:'
+
+# 리더 락 획득: 비어 있으면 token으로 잡고, 이미 있으면 현재 리더 token 반환
+_ACQUIRE_SCRIPT = """
+local holder = redis.call('get', KEYS[1])
+if holder then return holder end
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+# 락 소유자(token)만 해제/연장 가능
+_RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+_EXTEND_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('expire', KEYS[1], ARGV[2]) end return 0"
+
+
+def fingerprint(provider: str, model_type: str, arguments: Dict[str, Any], user_id=None) -> str:
+    """요청 지문 (사용자별 — 공백 차이만 있는 프롬프트는 같은 요청으로 취급)"""
+    normalized = {
+        field: ' '.join(value.split()) if isinstance(value, str) else value
+        for field, value in arguments.items()
+        if field != 'cache'
+    }
+    raw = json.dumps([user_id, provider, model_type, normalized], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class _LeaderLease:
+    """리더 락 유지 (TTL의 1/3마다 연장 — 리더 프로세스가 죽으면 TTL 후 자동 해제되어 대기자가 승계)"""
+
+    def __init__(self, client: redis.Redis, key: str, token: str, ttl: int):
+        self.client = client
+        self.key = key
+        self.token = token
+        self.ttl = ttl
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._keep_alive, daemon=True)
+
+    def _keep_alive(self) -> None:
+        extend = self.client.register_script(_EXTEND_SCRIPT)
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                if not extend(keys=[self.key], args=[self.token, self.ttl]):
+                    return
+            except redis.RedisError as e:
+                logger.warning(f"single-flight 락 연장 실패: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        try:
+            self.client.register_script(_RELEASE_SCRIPT)(keys=[self.key], args=[self.token])
+        except redis.RedisError as e:
+            logger.warning(f"single-flight 락 해제 실패: {e}")
+        return False
+
+
+def run(key: str, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    같은 key의 동시 요청 중 하나(리더)만 fn을 실행하고 나머지는 리더 결과를 기다림
+
+    결과는 리더가 실행되는 동안 기다리던 요청에만 공유 (리더 token을 본 요청만 결과를 받음) —
+    리더가 끝난 뒤 들어온 같은 요청은 새로 실행.
+    리더가 실패하면 결과를 남기지 않고 락만 해제 → 대기 중인 요청 하나가 리더를 승계해 재시도.
+    Redis 장애나 대기 시간 초과 시에는 병합 없이 직접 실행 (fail-open).
+
+    Args:
+        key: 요청 지문 (fingerprint)
+        fn: 제공자 호출 함수 (JSON 직렬화 가능한 dict 반환)
+
+    Returns:
+        fn 결과 (다른 요청의 결과를 받은 경우 "coalesced": true 표시)
+    """
+    lock_key = LOCK_PREFIX + key
+    result_key = RESULT_PREFIX + key
+    lock_ttl = getattr(settings, 'AI_SINGLE_FLIGHT_LOCK_TTL', 30)
+    result_ttl = getattr(settings, 'AI_SINGLE_FLIGHT_RESULT_TTL', 10)
+    deadline = time.monotonic() + getattr(settings, 'AI_SINGLE_FLIGHT_WAIT_TIMEOUT', 900)
+    token = uuid.uuid4().hex
+    leaders = set()  # 기다리는 동안 본 리더 token
+    delay = 0.1
+
+    try:
+        client = get_redis()
+        acquire = client.register_script(_ACQUIRE_SCRIPT)
+        while True:
+            if leaders:
+                raw = client.get(result_key)
+                if raw is not None:
+                    shared = json.loads(raw)
+                    if shared.get('leader') in leaders:
+                        return {**shared['result'], 'coalesced': True}
+
+            holder = acquire(keys=[lock_key], args=[token, lock_ttl])
+            holder = holder.decode() if isinstance(holder, bytes) else holder
+            if holder == token:
+                break  # 리더
+            leaders.add(holder)
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"single-flight 대기 시간 초과, 직접 실행: {key[:12]}")
+                return fn()
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    except redis.RedisError as e:
+        logger.warning(f"single-flight 사용 불가, 직접 실행: {e}")
+        return fn()
+
+    with _LeaderLease(client, lock_key, token, lock_ttl):
+        result = fn()
+        try:
+            client.set(result_key, json.dumps({'leader': token, 'result': result}, ensure_ascii=False), ex=result_ttl)
+        except (redis.RedisError, TypeError, ValueError) as e:
+            logger.warning(f"single-flight 결과 공유 실패: {e}")
+    return result
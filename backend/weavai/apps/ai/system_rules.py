@@ -1,2 +1,2 @@
-def prepend_model_rule(message: str) -> str:
+def prepend_model_rule(message: str, model: str = None) -> str:
     return message
@@ -0,0 +1,120 @@
+from unittest import mock
+import redis
+from django.test import SimpleTestCase, override_settings
+from weavai.apps.ai import circuit_breaker
+from weavai.apps.ai.errors import AICircuitOpenError
+from weavai.apps.ai.transport import TransportCall
+from weavai.apps.core.testing import FakeRedisMixin
+
+NOW = 1_000_000.0
+
+
+@override_settings(
+    AI_CIRCUIT_BREAKER_ENABLED=True, AI_CIRCUIT_WINDOW=60, AI_CIRCUIT_MIN_CALLS=4, AI_CIRCUIT_FAILURE_RATE=0.5,
+    AI_CIRCUIT_SLOW_RATE=0.5, AI_CIRCUIT_SLOW_FRACTION=0.8, AI_CIRCUIT_OPEN_SECONDS=30,
+)
+class CircuitBreakerTests(FakeRedisMixin, SimpleTestCase):
+    endpoint = 'fal-ai/flux-2'
+
+    def setUp(self):
+        super().setUp()
+        self.now = NOW
+        patcher = mock.patch.object(circuit_breaker.time, 'time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, failed=False, slow=False, times=1):
+        for _ in range(times):
+            circuit_breaker.record('fal', self.endpoint, failed, slow)
+
+    def state(self):
+        value = self.redis.hget(circuit_breaker._key('fal', self.endpoint), 'state')
+        return value.decode() if value else 'closed'
+
+    def open_circuit(self):
+        self.record(failed=True, times=4)
+        self.assertEqual(self.state(), 'open')
+
+    def test_stays_closed_below_min_calls(self):
+        self.record(failed=True, times=3)
+        self.assertEqual(self.state(), 'closed')
+        circuit_breaker.guard('fal', self.endpoint)
+
+    def test_stays_closed_below_failure_rate(self):
+        self.record(times=3)
+        self.record(failed=True, times=2)
+        self.assertEqual(self.state(), 'closed')
+
+    def test_opens_on_failures_and_rejects_calls(self):
+        self.open_circuit()
+        self.now += 10
+        with self.assertRaises(AICircuitOpenError) as raised:
+            circuit_breaker.guard('fal', self.endpoint)
+        self.assertEqual(raised.exception.retry_after, 20)
+        self.assertEqual(raised.exception.status_code, 503)
+
+    def test_opens_on_slow_calls(self):
+        self.record(slow=True, times=4)
+        self.assertEqual(self.state(), 'open')
+
+    def test_half_open_allows_one_probe(self):
+        self.open_circuit()
+        self.now += 31
+        circuit_breaker.guard('fal', self.endpoint)  # 확인 호출
+        self.assertEqual(self.state(), 'half_open')
+        with self.assertRaises(AICircuitOpenError):
+            circuit_breaker.guard('fal', self.endpoint)
+
+    def test_successful_probe_closes(self):
+        self.open_circuit()
+        self.now += 31
+        circuit_breaker.guard('fal', self.endpoint)
+        self.record()
+        self.assertEqual(self.state(), 'closed')
+        circuit_breaker.guard('fal', self.endpoint)
+
+    def test_failed_probe_reopens(self):
+        self.open_circuit()
+        self.now += 31
+        circuit_breaker.guard('fal', self.endpoint)
+        self.record(failed=True)
+        self.assertEqual(self.state(), 'open')
+        with self.assertRaises(AICircuitOpenError):
+            circuit_breaker.guard('fal', self.endpoint)
+
+    def test_lost_probe_is_retried_after_timeout(self):
+        self.open_circuit()
+        self.now += 31
+        circuit_breaker.guard('fal', self.endpoint)
+        self.now += 31  # 확인 호출 결과 없음
+        circuit_breaker.guard('fal', self.endpoint)
+
+    def test_previous_window_counts_by_remaining_fraction(self):
+        next_window = (NOW // 60 + 1) * 60
+        self.record(failed=True, times=3)
+        self.now = next_window  # 이전 창 가중치 1
+        self.record(failed=True)
+        self.assertEqual(self.state(), 'open')
+
+    def test_previous_window_fades_out(self):
+        next_window = (NOW // 60 + 1) * 60
+        self.record(failed=True, times=3)
+        self.now = next_window + 59  # 이전 창 가중치 ≈ 0
+        self.record(failed=True)
+        self.assertEqual(self.state(), 'closed')
+
+    def test_transport_hook_ignores_429_and_counts_5xx(self):
+        def call(status_code):
+            return TransportCall(method='POST', url=f'https://fal.run/{self.endpoint}', endpoint=self.endpoint,
+                                 status_code=status_code, elapsed=0.1, timeout=60)
+        for _ in range(4):
+            circuit_breaker._record_call(call(429))
+        self.assertEqual(self.state(), 'closed')
+        for _ in range(4):
+            circuit_breaker._record_call(call(502))
+        self.assertEqual(self.state(), 'open')
+
+    def test_redis_outage_fails_open(self):
+        with mock.patch.object(self.redis, 'register_script', side_effect=redis.ConnectionError('down')):
+            circuit_breaker.guard('fal', self.endpoint)
+            circuit_breaker.record('fal', self.endpoint, True, False)
@@ -0,0 +1,70 @@
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from weavai.apps.ai import rate_limit
+from weavai.apps.ai.errors import AIQuotaExceededError
+from weavai.apps.core.testing import FakeRedisMixin
+
+LIMITS = dict(
+    AI_RATE_LIMIT_ENABLED=True, AI_RATE_LIMIT_DEFAULT=10, AI_RATE_LIMITS=['fal-ai=4', 'fal-ai/sora-2=0.5'],
+    AI_RATE_LIMIT_BURST=2, AI_RATE_LIMIT_MAX_WAIT=0, AI_RATE_LIMIT_DECREASE=0.5, AI_RATE_LIMIT_MIN_FRACTION=0.1,
+    AI_RATE_LIMIT_RECOVERY=0.25, AI_RATE_LIMIT_COOLDOWN=60,
+)
+
+
+@override_settings(**LIMITS)
+class RateLimitTests(FakeRedisMixin, SimpleTestCase):
+    model = 'fal-ai/flux-2'
+
+    def rate(self):
+        return float(self.redis.hget(rate_limit._key('fal', self.model), 'rate'))
+
+    def test_base_rate_uses_longest_prefix(self):
+        self.assertEqual(rate_limit.base_rate('fal-ai/sora-2/text-to-video'), 0.5)
+        self.assertEqual(rate_limit.base_rate('fal-ai/flux-2'), 4)
+        self.assertEqual(rate_limit.base_rate('openai/gpt-4o'), 10)
+        self.assertEqual(rate_limit.base_rate('fal-ai-other/x'), 10)
+
+    def test_burst_then_rejects_with_retry_after(self):
+        for _ in range(8):  # 4/s × 2초 버스트
+            rate_limit.acquire('fal', self.model, max_wait=0)
+        with self.assertRaises(AIQuotaExceededError) as raised:
+            rate_limit.acquire('fal', self.model, max_wait=0)
+        self.assertEqual(raised.exception.retry_after, 1)
+
+    def test_429_halves_rate_once_per_cooldown(self):
+        rate_limit.acquire('fal', self.model, max_wait=0)
+        rate_limit.penalize('fal', self.model)
+        self.assertEqual(self.rate(), 2)
+        rate_limit.penalize('fal', self.model)  # 같은 cooldown 안
+        self.assertEqual(self.rate(), 2)
+
+    def test_rate_has_floor(self):
+        with override_settings(AI_RATE_LIMIT_COOLDOWN=0):
+            for _ in range(10):
+                rate_limit.penalize('fal', self.model)
+        self.assertAlmostEqual(self.rate(), 0.4)
+
+    def test_success_recovers_to_base(self):
+        rate_limit.penalize('fal', self.model)
+        for _ in range(3):
+            rate_limit.reward('fal', self.model, self.rate())
+        self.assertEqual(self.rate(), 4)
+
+    def test_call_retries_after_provider_429(self):
+        fn = mock.Mock(side_effect=[AIQuotaExceededError('fal'), {'text': 'ok'}])
+        with override_settings(AI_RATE_LIMIT_MAX_WAIT=5):
+            self.assertEqual(rate_limit.call('fal', self.model, fn), {'text': 'ok'})
+        self.assertEqual(fn.call_count, 2)
+        self.assertLess(self.rate(), 4)
+
+    def test_disabled_calls_directly(self):
+        fn = mock.Mock(return_value={'text': 'ok'})
+        with override_settings(AI_RATE_LIMIT_ENABLED=False):
+            rate_limit.call('fal', self.model, fn)
+        self.assertEqual(self.redis.keys(), [])
+
+    def test_disabled_by_default(self):
+        with self.settings():
+            del settings.AI_RATE_LIMIT_ENABLED
+            self.assertFalse(rate_limit.is_enabled())
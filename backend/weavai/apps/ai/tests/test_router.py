@@ -0,0 +1,57 @@
+import threading
+from django.test import SimpleTestCase, override_settings
+from weavai.apps.ai import completion_cache, hedging
+from weavai.apps.ai.router import AIServiceRouter
+from weavai.apps.core.testing import FakeRedisMixin
+
+PRIMARY = 'openai/gpt-4o-mini'
+FALLBACK = 'google/gemini-flash-1.5'
+
+
+class SlowPrimaryClient:
+    """요청한 모델은 release될 때까지 응답하지 않고 대체 모델은 바로 응답하는 텍스트 클라이언트"""
+    text_endpoint = 'fal-ai/any-llm'
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def build_text_payload(self, request):
+        return {'prompt': request.input_text, 'temperature': request.temperature, 'model': request.model or PRIMARY}
+
+    def generate_text(self, request, timeout=None):
+        model = self.build_text_payload(request)['model']
+        if model == PRIMARY:
+            self.release.wait(5)
+        return {'provider': 'fal', 'model': model, 'text': f'from {model}'}
+
+
+@override_settings(
+    AI_HEDGE_ENABLED=True, AI_HEDGE_MIN_SAMPLES=1, AI_HEDGE_MIN_DELAY=0.01, AI_HEDGE_MAX_DELAY=0.05,
+    AI_HEDGE_FALLBACK_MODELS=[f'{PRIMARY}={FALLBACK}'], AI_COMPLETION_CACHE_ENABLED=True,
+)
+class GenerateTextHedgeCacheTests(FakeRedisMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = SlowPrimaryClient()
+        self.addCleanup(self.client.release.set)
+        self.router = AIServiceRouter()
+        self.router.clients['fal'] = self.client
+        hedging.record_latency(PRIMARY, 0.01)
+        self.addCleanup(hedging._latencies.pop, PRIMARY, None)
+
+    def generate(self):
+        return self.router.generate_text('fal', {'input_text': 'hi', 'model': PRIMARY, 'temperature': 0})
+
+    def test_fallback_answer_is_not_cached(self):
+        self.assertEqual(self.generate()['model'], FALLBACK)
+        self.assertEqual(self.redis.zcard(completion_cache.INDEX_KEY), 0)
+
+        # 다음 결정적 요청은 캐시가 아니라 다시 제공자로 감
+        self.client.release.set()
+        result = self.generate()
+        self.assertNotIn('cached', result)
+
+    def test_primary_answer_is_cached(self):
+        self.client.release.set()
+        self.assertEqual(self.generate()['model'], PRIMARY)
+        self.assertEqual(self.generate(), {'provider': 'fal', 'model': PRIMARY, 'text': f'from {PRIMARY}', 'cached': True})
@@ -0,0 +1,72 @@
+import json
+import threading
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from weavai.apps.ai import single_flight
+from weavai.apps.core.testing import FakeRedisMixin
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_whitespace_and_cache_flag_ignored(self):
+        a = single_flight.fingerprint('fal', 'image', {'prompt': 'a  cat', 'cache': True}, user_id=1)
+        b = single_flight.fingerprint('fal', 'image', {'prompt': 'a cat'}, user_id=1)
+        self.assertEqual(a, b)
+
+    def test_scoped_to_user(self):
+        arguments = {'prompt': 'a cat'}
+        self.assertNotEqual(
+            single_flight.fingerprint('fal', 'image', arguments, user_id=1),
+            single_flight.fingerprint('fal', 'image', arguments, user_id=2),
+        )
+
+
+@override_settings(AI_SINGLE_FLIGHT_LOCK_TTL=30, AI_SINGLE_FLIGHT_WAIT_TIMEOUT=5, AI_SINGLE_FLIGHT_RESULT_TTL=10)
+class RunTests(FakeRedisMixin, SimpleTestCase):
+    key = 'k'
+
+    def test_leader_runs_and_releases(self):
+        fn = mock.Mock(return_value={'url': 'a'})
+        self.assertEqual(single_flight.run(self.key, fn), {'url': 'a'})
+        fn.assert_called_once()
+        self.assertIsNone(self.redis.get(single_flight.LOCK_PREFIX + self.key))
+
+    def test_later_request_does_not_reuse_finished_result(self):
+        single_flight.run(self.key, lambda: {'url': 'first'})
+        self.assertEqual(single_flight.run(self.key, lambda: {'url': 'second'}), {'url': 'second'})
+
+    def run_follower(self, fn):
+        outcome = {}
+        thread = threading.Thread(target=lambda: outcome.setdefault('result', single_flight.run(self.key, fn)))
+        thread.start()
+        return thread, outcome
+
+    def wait_until_waiting(self, thread):
+        # 대기자가 리더 token을 본 뒤 (첫 대기 0.1초) 리더를 끝냄
+        thread.join(0.3)
+        self.assertTrue(thread.is_alive())
+
+    def test_waiting_follower_gets_leader_result(self):
+        lock_key = single_flight.LOCK_PREFIX + self.key
+        self.redis.set(lock_key, 'leader-token')
+        fn = mock.Mock(return_value={'url': 'own'})
+        thread, outcome = self.run_follower(fn)
+        self.wait_until_waiting(thread)
+
+        self.redis.set(single_flight.RESULT_PREFIX + self.key,
+                       json.dumps({'leader': 'leader-token', 'result': {'url': 'shared'}}))
+        self.redis.delete(lock_key)
+        thread.join(5)
+
+        self.assertEqual(outcome['result'], {'url': 'shared', 'coalesced': True})
+        fn.assert_not_called()
+
+    def test_follower_takes_over_when_leader_fails(self):
+        lock_key = single_flight.LOCK_PREFIX + self.key
+        self.redis.set(lock_key, 'leader-token')
+        thread, outcome = self.run_follower(lambda: {'url': 'retried'})
+        self.wait_until_waiting(thread)
+
+        self.redis.delete(lock_key)  # 결과 없이 해제 = 리더 실패
+        thread.join(5)
+
+        self.assertEqual(outcome['result'], {'url': 'retried'})
@@ -0,0 +1,88 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+from weavai.apps.ai import views
+from weavai.apps.ai.errors import AIQuotaExceededError, AIRequestError
+from weavai.apps.core import idempotency
+from weavai.apps.core.testing import FakeRedisMixin
+
+
+class CompleteChatStreamTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='streamer')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def post(self, body):
+        return self.client.post(reverse('ai:complete_chat_stream'), body, content_type='application/json', **self.auth)
+
+    def test_malformed_history_is_bad_request(self):
+        response = self.post({'input_text': 'hi', 'history': ['not a message']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('history', response.json()['error'])
+
+    def test_missing_input_is_bad_request(self):
+        response = self.post({'history': []})
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_jwt(self):
+        response = self.client.post(reverse('ai:complete_chat_stream'), {}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(IDEMPOTENCY_TTL=3600, IDEMPOTENCY_LOCK_TTL=60)
+class CompleteChatIdempotencyTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create(username='chatter'))
+        patcher = mock.patch.object(views.router, 'generate_text', return_value={'text': 'hello', 'provider': 'fal'})
+        self.generate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body, key='chat-1'):
+        return self.client.post(reverse('ai:complete_chat'), body, content_type='application/json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_does_not_call_provider_again(self):
+        first = self.post({'input_text': 'hi'})
+        second = self.post({'input_text': 'hi'})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second[idempotency.REPLAYED_HEADER], 'true')
+        self.generate.assert_called_once()
+
+    def test_failed_request_is_not_stored(self):
+        self.generate.side_effect = [AIRequestError('fal', 'boom'), {'text': 'hello'}]
+        self.assertEqual(self.post({'input_text': 'hi'}).status_code, 400)
+        response = self.post({'input_text': 'hi'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(idempotency.REPLAYED_HEADER, response)
+
+    def test_errors_use_error_field(self):
+        self.post({'input_text': 'hi'})
+        response = self.post({'input_text': 'bye'})
+        self.assertEqual(response.status_code, 422)
+        self.assertIn('error', response.json())
+
+
+@override_settings(AI_RATE_LIMIT_RETRY_DELAY=30)
+class QuotaExceededTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='limited')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def post(self, name):
+        return self.client.post(reverse(name), {'input_text': 'hi'}, content_type='application/json', **self.auth)
+
+    def test_sync_view_returns_429_with_retry_after(self):
+        with mock.patch.object(views.router, 'generate_text', side_effect=AIQuotaExceededError('fal', retry_after=3)):
+            response = self.post('ai:complete_chat')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3')
+
+    def test_async_view_returns_429_with_default_retry_after(self):
+        with mock.patch.object(views.router, 'agenerate_text', side_effect=AIQuotaExceededError('fal')):
+            response = self.post('ai:complete_chat_async')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
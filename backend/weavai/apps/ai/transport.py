@@ -0,0 +1,202 @@
+# WEAV AI AI 제공자 HTTP 전송 계층
+# 프로세스 공용 keep-alive 커넥션 풀 + 엔드포인트별 타임아웃 + 호출 계측 훅
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+Timeout = Tuple[float, float]  # (연결, 읽기) 초
+
+
+@dataclass
+class TransportCall:
+    """계측 훅에 전달되는 호출 정보"""
+
+    method: str
+    url: str
+    endpoint: str
+    status_code: Optional[int]
+    elapsed: float  # 응답 헤더 수신까지 걸린 시간 (초)
+    error: Optional[BaseException] = None
+    timeout: Optional[float] = None  # 적용된 읽기 타임아웃 (초)
+    provider: str = 'fal'  # 공용 transport는 fal 호출 전용
+
+
+def _parse_endpoint_timeouts(entries) -> Dict[str, Timeout]:
+    """
+    'endpoint=read' 또는 'endpoint=connect:read' 목록을 타임아웃 맵으로 변환
+
+    예: ['fal-ai/any-llm=5:60', 'fal-ai/sora=600']
+    """
+    default_connect = float(getattr(settings, 'FAL_HTTP_CONNECT_TIMEOUT', 5))
+    timeouts = {}
+    for entry in entries or []:
+        endpoint, _, value = str(entry).partition('=')
+        endpoint = endpoint.strip().strip('/')
+        if not endpoint or not value:
+            continue
+        try:
+            if ':' in value:
+                connect, read = value.split(':', 1)
+                timeouts[endpoint] = (float(connect), float(read))
+            else:
+                timeouts[endpoint] = (default_connect, float(value))
+        except ValueError:
+            logger.warning(f"잘못된 FAL_HTTP_ENDPOINT_TIMEOUTS 항목 무시: {entry}")
+    return timeouts
+
+
+class ProviderTransport:
+    """
+    AI 제공자 공용 HTTP 전송 계층
+
+    - 하나의 requests.Session을 프로세스 전체에서 공유해 TCP/TLS 연결을 재사용
+    - 커넥션 풀 크기는 동시 호출 스레드 수(FAL_HTTP_POOL_SIZE)에 맞춤
+    - 엔드포인트별 (연결, 읽기) 타임아웃 (FAL_HTTP_ENDPOINT_TIMEOUTS)
+    - 호출마다 TransportCall을 등록된 훅에 전달 (지연 측정, 서킷 브레이커 등)
+    """
+
+    def __init__(self, pool_size: int, default_timeout: Timeout,
+                 endpoint_timeouts: Optional[Dict[str, Timeout]] = None):
+        self.default_timeout = default_timeout
+        self.endpoint_timeouts = endpoint_timeouts or {}
+        self._hooks: List[Callable[[TransportCall], None]] = []
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def add_hook(self, hook: Callable[[TransportCall], None]) -> None:
+        """호출 계측 훅 등록 (훅 예외는 호출 결과에 영향 없음)"""
+        self._hooks.append(hook)
+
+    def timeout_for(self, endpoint: str, default: Optional[Timeout] = None) -> Timeout:
+        """
+        엔드포인트 타임아웃 결정
+
+        우선순위: 설정의 엔드포인트별 값(가장 긴 prefix 일치) > 호출부 기본값 > 전역 기본값
+        """
+        endpoint = (endpoint or '').strip('/')
+        matched = None
+        for prefix in self.endpoint_timeouts:
+            if endpoint == prefix or endpoint.startswith(prefix + '/'):
+                if matched is None or len(prefix) > len(matched):
+                    matched = prefix
+        if matched is not None:
+            return self.endpoint_timeouts[matched]
+        return default or self.default_timeout
+
+    def request(self, method: str, url: str, endpoint: str = '',
+                timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        """
+        풀링된 세션으로 HTTP 요청
+
+        Args:
+            method: HTTP 메소드
+            url: 요청 URL
+            endpoint: 타임아웃/계측용 엔드포인트 이름 (예: 'fal-ai/any-llm', 'queue/status')
+            timeout: 호출부 기본 타임아웃 (설정에 엔드포인트별 값이 있으면 그 값을 사용)
+            **kwargs: requests.Session.request 인자
+
+        Raises:
+            requests.RequestException: 요청 실패
+        """
+        if isinstance(timeout, (int, float)):
+            timeout = (self.default_timeout[0], float(timeout))
+        resolved_timeout = self.timeout_for(endpoint, timeout)
+
+        started = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = self.session.request(method, url, timeout=resolved_timeout, **kwargs)
+            return response
+        except requests.RequestException as e:
+            error = e
+            raise
+        finally:
+            self.record(TransportCall(
+                method=method,
+                url=url,
+                endpoint=endpoint,
+                status_code=response.status_code if response is not None else None,
+                elapsed=time.perf_counter() - started,
+                error=error,
+                timeout=resolved_timeout[1],
+            ))
+
+    def record(self, call: TransportCall) -> None:
+        """계측 훅 실행 (비동기 클라이언트도 같은 훅을 쓰도록 공개)"""
+        for hook in self._hooks:
+            try:
+                hook(call)
+            except Exception:
+                logger.exception("transport hook 실패")
+
+
+def _log_call(call: TransportCall) -> None:
+    """기본 계측 훅: 느린 호출/실패는 warning, 나머지는 debug 로그"""
+    elapsed_ms = call.elapsed * 1000
+    message = (
+        f"provider call {call.method} {call.endpoint or call.url} "
+        f"status={call.status_code} elapsed={elapsed_ms:.0f}ms"
+    )
+    if call.error is not None:
+        logger.warning(f"{message} error={call.error}")
+    elif elapsed_ms >= getattr(settings, 'FAL_HTTP_SLOW_CALL_MS', 10000):
+        logger.warning(message)
+    else:
+        logger.debug(message)
+
+
+# 프로세스 공용 인스턴스 (prefork 워커는 fork 이후 자식마다 새로 생성)
+_transport = None
+_transport_pid = None
+_transport_lock = threading.Lock()
+_registered_hooks: List[Callable[[TransportCall], None]] = [_log_call]
+
+
+def register_transport_hook(hook: Callable[[TransportCall], None]) -> None:
+    """모든 (이후 생성될 포함) 공용 transport에 계측 훅 등록"""
+    with _transport_lock:
+        if hook in _registered_hooks:
+            return
+        _registered_hooks.append(hook)
+        if _transport is not None:
+            _transport.add_hook(hook)
+
+
+def get_transport() -> ProviderTransport:
+    """
+    프로세스 공용 ProviderTransport 가져오기 (싱글톤)
+
+    Returns:
+        ProviderTransport 인스턴스
+    """
+    global _transport, _transport_pid
+    pid = os.getpid()
+    if _transport is None or _transport_pid != pid:
+        with _transport_lock:
+            if _transport is None or _transport_pid != pid:
+                transport = ProviderTransport(
+                    pool_size=getattr(settings, 'FAL_HTTP_POOL_SIZE', 16),
+                    default_timeout=(
+                        float(getattr(settings, 'FAL_HTTP_CONNECT_TIMEOUT', 5)),
+                        float(getattr(settings, 'FAL_HTTP_READ_TIMEOUT', 60)),
+                    ),
+                    endpoint_timeouts=_parse_endpoint_timeouts(getattr(settings, 'FAL_HTTP_ENDPOINT_TIMEOUTS', [])),
+                )
+                for hook in _registered_hooks:
+                    transport.add_hook(hook)
+                _transport = transport
+                _transport_pid = pid
+    return _transport
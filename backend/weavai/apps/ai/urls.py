@@ -7,4 +7,7 @@ app_name = 'ai'
 
 urlpatterns = [
     path('complete/', views.complete_chat, name='complete_chat'),
+    path('complete/async/', views.complete_chat_async, name='complete_chat_async'),
+    path('complete/stream/', views.complete_chat_stream, name='complete_chat_stream'),
+    path('cache/stats/', views.completion_cache_stats, name='completion_cache_stats'),
 ]
@@ -1,20 +1,77 @@
 # WEAV AI AI 서비스 뷰
 # 텍스트 채팅 완료 엔드포인트 (Gateway)
 
+import json
 import logging
+import time
+import uuid
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from chats.models import ChatSession
+from weavai.apps.core import idempotency
+from weavai.apps.core.streaming import authenticate_jwt_async, sse_event
+from . import completion_cache
 from .router import AIServiceRouter
 from .system_rules import prepend_model_rule
 from .schemas import TextGenerationRequest
-from .errors import AIServiceError, AIProviderError, AIRequestError
+from .errors import AIServiceError, AIProviderError, AIRequestError, AIQuotaExceededError
 
 logger = logging.getLogger(__name__)
 router = AIServiceRouter()
 
+
+def _retry_after(error: AIQuotaExceededError) -> str:
+    """한도 초과 응답의 Retry-After (초) — 속도 제한 대기 시간, 모르면 AI_RATE_LIMIT_RETRY_DELAY"""
+    return str(error.retry_after or settings.AI_RATE_LIMIT_RETRY_DELAY)
+
+
+def _build_text_arguments(data):
+    """
+    요청 본문을 라우터 인자로 변환 (동기/비동기 뷰 공용)
+
+    Returns:
+        (provider, arguments) — input_text가 비어있는지는 호출한 쪽에서 확인
+
+    Raises:
+        AIRequestError: history 형식이 올바르지 않음 (400)
+    """
+    provider = data.get('provider') or getattr(settings, 'AI_PROVIDER_DEFAULT', 'fal')
+    model = data.get('model')
+    system_prompt = data.get('system_prompt')
+    history = data.get('history') or []
+    if not isinstance(history, list) or not all(isinstance(msg, dict) for msg in history):
+        raise AIRequestError(provider, 'history는 {role, content} 객체 목록이어야 합니다.')
+
+    # provider는 fal 고정
+
+    # 히스토리 처리: 모델별 룰 적용 후 시스템 프롬프트에 통합 (향후 개선 가능)
+    system_prompt = prepend_model_rule(system_prompt, model)
+    if history:
+        history_text = '\n'.join([
+            f"{'User' if msg.get('role') == 'user' else 'Assistant'}: {msg.get('content', '')}"
+            for msg in history[-5:]  # 최근 5개만
+        ])
+        if system_prompt:
+            system_prompt = f"{system_prompt}\n\n이전 대화:\n{history_text}"
+        else:
+            system_prompt = f"이전 대화:\n{history_text}"
+
+    arguments = {
+        'input_text': data.get('input_text'),
+        'system_prompt': system_prompt,
+        'temperature': data.get('temperature', 0.7),
+        'max_output_tokens': data.get('max_output_tokens', 1024),
+        'model': model,
+        'cache': bool(data.get('cache', False)),
+    }
+    return provider, arguments
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def complete_chat(request):
@@ -29,7 +86,8 @@ def complete_chat(request):
         "system_prompt": "시스템 프롬프트 (선택)",
         "history": [{"role": "user|assistant", "content": "..."}, ...],
         "temperature": 0.7,
-        "max_output_tokens": 1024
+        "max_output_tokens": 1024,
+        "cache": false  // true면 temperature와 무관하게 완료 캐시 사용 (temperature 0은 항상 사용)
     }
     
     Response:
@@ -39,45 +97,24 @@ def complete_chat(request):
         "model": "meta-llama/llama-4-maverick",
         "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
     }
+
+    Idempotency-Key 헤더를 주면 같은 키의 재시도는 제공자를 다시 호출하지 않고 처음 응답을 반환
+    (Idempotent-Replayed: true, 다른 본문에 재사용하면 422, 처음 요청이 처리 중이면 409).
     """
+    return idempotency.run(request, 'chat:complete', lambda key: _complete_chat(request), error_field='error')
+
+
+def _complete_chat(request):
+    """complete_chat 본문 (멱등성 처리 안쪽)"""
     try:
-        provider = request.data.get('provider') or getattr(settings, 'AI_PROVIDER_DEFAULT', 'fal')
-        model = request.data.get('model')
-        input_text = request.data.get('input_text')
-        system_prompt = request.data.get('system_prompt')
-        history = request.data.get('history', [])
-        temperature = request.data.get('temperature', 0.7)
-        max_output_tokens = request.data.get('max_output_tokens', 1024)
-        
-        if not input_text:
+        provider, arguments = _build_text_arguments(request.data)
+        if not arguments['input_text']:
             return Response(
                 {'error': 'input_text가 필요합니다.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # provider는 fal 고정
-        
-        # 히스토리 처리: 모델별 룰 적용 후 시스템 프롬프트에 통합 (향후 개선 가능)
-        system_prompt = prepend_model_rule(system_prompt, model)
-        if history:
-            history_text = '\n'.join([
-                f"{'User' if msg.get('role') == 'user' else 'Assistant'}: {msg.get('content', '')}"
-                for msg in history[-5:]  # 최근 5개만
-            ])
-            if system_prompt:
-                system_prompt = f"{system_prompt}\n\n이전 대화:\n{history_text}"
-            else:
-                system_prompt = f"이전 대화:\n{history_text}"
-        
+
         # 라우터로 텍스트 생성
-        arguments = {
-            'input_text': input_text,
-            'system_prompt': system_prompt,
-            'temperature': temperature,
-            'max_output_tokens': max_output_tokens,
-            'model': model
-        }
-        
         result = router.generate_text(provider, arguments)
         if not isinstance(result, dict):
             logger.error(f"텍스트 생성 실패: provider={provider}, user={request.user.username}, result={result}")
@@ -93,6 +130,13 @@ def complete_chat(request):
         
         return Response(result, status=status.HTTP_200_OK)
         
+    except AIQuotaExceededError as e:
+        logger.warning(f"AI Quota Exceeded: {e}")
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': _retry_after(e)}
+        )
     except AIProviderError as e:
         logger.error(f"AI Provider Error: {e}")
         return Response(
@@ -111,3 +155,207 @@ def complete_chat(request):
             {'error': '서버 오류가 발생했습니다.'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def completion_cache_stats(request):
+    """
+    텍스트 완료 캐시 hit/miss 통계 (관리자 전용)
+
+    Response:
+    {"hits": 10, "misses": 5, "stores": 5, "evictions": 0, "entries": 5, "hit_rate": 0.6667}
+    """
+    try:
+        return Response(completion_cache.stats(), status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"완료 캐시 통계 조회 실패: {e}")
+        return Response(
+            {'error': '캐시 통계를 조회할 수 없습니다.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+
+async def _parse_async_request(request):
+    """
+    비동기 뷰 공통 전처리 (메소드 확인, JWT 인증, JSON 본문 파싱)
+
+    Returns:
+        (user, data, error_response) — error_response가 있으면 그대로 반환
+    """
+    if request.method != 'POST':
+        return None, None, JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    user = await authenticate_jwt_async(request)
+    if user is None:
+        return None, None, JsonResponse({'detail': '자격 인증데이터(authentication credentials)가 제공되지 않았습니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return user, None, JsonResponse({'error': '요청 본문이 올바른 JSON이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return user, data, None
+
+
+async def complete_chat_async(request):
+    """
+    텍스트 채팅 완료 (Gateway, ASGI 비동기 버전)
+
+    요청/응답 형식은 complete_chat과 동일. ASGI(uvicorn 워커)로 서빙하면 제공자 응답을 기다리는 동안
+    스레드를 점유하지 않으므로 한 프로세스가 다수의 완료 요청을 동시에 유지할 수 있음.
+    인증은 JWT(Authorization: Bearer)만 지원.
+    """
+    user, data, error_response = await _parse_async_request(request)
+    if error_response is not None:
+        return error_response
+
+    try:
+        provider, arguments = _build_text_arguments(data)
+        if not arguments['input_text']:
+            return JsonResponse(
+                {'error': 'input_text가 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = await router.agenerate_text(provider, arguments)
+        if not isinstance(result, dict):
+            logger.error(f"텍스트 생성 실패: provider={provider}, user={user.username}, result={result}")
+            return JsonResponse(
+                {'error': 'AI 응답이 비어있습니다. 잠시 후 다시 시도해주세요.'},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+
+        usage = result.get('usage') or {}
+        logger.info(
+            f"텍스트 생성 완료(async): provider={provider}, user={user.username}, tokens={usage.get('total_tokens', 0)}"
+        )
+
+        return JsonResponse(result, status=status.HTTP_200_OK)
+
+    except AIQuotaExceededError as e:
+        logger.warning(f"AI Quota Exceeded: {e}")
+        return JsonResponse(
+            {'error': str(e)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': _retry_after(e)}
+        )
+    except AIProviderError as e:
+        logger.error(f"AI Provider Error: {e}")
+        return JsonResponse(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except AIRequestError as e:
+        logger.error(f"AI Request Error: {e}")
+        return JsonResponse(
+            {'error': str(e)},
+            status=e.status_code if hasattr(e, 'status_code') else status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in complete_chat_async: {e}", exc_info=True)
+        return JsonResponse(
+            {'error': '서버 오류가 발생했습니다.'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+async def _save_chat_reply(user, chat_id, message_id, text: str) -> None:
+    """
+    스트리밍 완료 텍스트를 ChatSession에 저장
+
+    message_id(프론트의 응답 placeholder id)와 같은 메시지가 있으면 내용을 갱신하고, 없으면 응답 메시지를 추가.
+    """
+    try:
+        chat = await ChatSession.objects.aget(id=chat_id, user=user)
+    except (ChatSession.DoesNotExist, ValidationError, ValueError):
+        logger.warning(f"스트리밍 응답 저장 대상 채팅 없음: chat={chat_id}, user={user.username}")
+        return
+
+    messages = list(chat.messages or [])
+    for index, message in enumerate(messages):
+        if message_id and isinstance(message, dict) and message.get('id') == message_id:
+            messages[index] = {**message, 'content': text, 'isStreaming': False}
+            break
+    else:
+        messages.append({
+            'id': message_id or str(uuid.uuid4()),
+            'role': 'model',
+            'content': text,
+            'type': 'text',
+            'timestamp': int(time.time() * 1000),
+        })
+
+    chat.messages = messages
+    await chat.asave(update_fields=['messages', 'last_modified'])
+
+
+async def complete_chat_stream(request):
+    """
+    텍스트 채팅 완료 스트리밍 (Server-Sent Events, ASGI 비동기)
+
+    Request Body: complete_chat과 동일 +
+    {
+        "chat_id": "응답을 저장할 ChatSession id (선택)",
+        "message_id": "갱신할 응답 메시지 id (선택)"
+    }
+
+    Response (text/event-stream):
+        event: delta  data: {"text": "새로 생성된 텍스트"}
+        event: done   data: {"text": "전체 텍스트", "provider", "model", "usage", "finish_reason"}
+        event: error  data: {"error": "오류 메시지", "status": 502}
+    """
+    user, data, error_response = await _parse_async_request(request)
+    if error_response is not None:
+        return error_response
+
+    try:
+        provider, arguments = _build_text_arguments(data)
+    except AIRequestError as e:
+        logger.error(f"AI Request Error: {e}")
+        return JsonResponse(
+            {'error': str(e)},
+            status=e.status_code
+        )
+    if not arguments['input_text']:
+        return JsonResponse(
+            {'error': 'input_text가 필요합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    chat_id = data.get('chat_id')
+    message_id = data.get('message_id')
+
+    async def event_stream():
+        try:
+            async for event in router.astream_text(provider, arguments):
+                if event['type'] == 'delta':
+                    yield sse_event('delta', {'text': event['text']})
+                    continue
+
+                result = {k: v for k, v in event.items() if k != 'type'}
+                if chat_id:
+                    await _save_chat_reply(user, chat_id, message_id, result['text'])
+                usage = result.get('usage') or {}
+                logger.info(
+                    f"텍스트 스트리밍 완료: provider={provider}, user={user.username}, tokens={usage.get('total_tokens', 0)}"
+                )
+                yield sse_event('done', result)
+
+        except AIServiceError as e:
+            logger.error(f"AI Service Error (stream): {e}")
+            yield sse_event('error', {'error': str(e), 'status': e.status_code})
+        except Exception as e:
+            logger.error(f"Unexpected error in complete_chat_stream: {e}", exc_info=True)
+            yield sse_event('error', {'error': '서버 오류가 발생했습니다.', 'status': status.HTTP_500_INTERNAL_SERVER_ERROR})
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Nginx 응답 버퍼링 비활성화
+    return response
+
+
+# Django 4.2의 csrf_exempt 데코레이터는 코루틴 뷰를 동기 함수로 감싸므로 속성으로 직접 지정 (JWT 전용 뷰)
+complete_chat_async.csrf_exempt = True
+complete_chat_stream.csrf_exempt = True
@@ -0,0 +1,175 @@
+# WEAV AI 멱등성 키 (Idempotency-Key 헤더)
+# 재시도된 생성 요청은 제공자를 다시 호출하지 않고 처음 응답을 반환 — 키·요청 해시·응답을 Redis에 TTL로 저장
+
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Optional
+import redis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.response import Response
+from weavai.apps.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+KEY_PREFIX = 'idempotency:'
+KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,200}$')  # UUID 등 (':', '#'은 내부 구분자로 사용)
+
+
+class IdempotencyError(Exception):
+    """멱등성 키 요청을 처리할 수 없음 (잘못된 키 / 다른 요청에 재사용 / 처음 요청이 아직 처리 중)"""
+
+    def __init__(self, message: str, status_code: int, error_code: str):
+        self.message = message
+        self.status_code = status_code
+        self.error_code = error_code
+        super().__init__(message)
+
+
+def get_key(headers) -> Optional[str]:
+    """
+    요청 헤더의 멱등성 키
+
+    Returns:
+        키 또는 None (헤더 없음)
+
+    Raises:
+        IdempotencyError: 형식이 올바르지 않은 키 (400)
+    """
+    key = (headers.get(HEADER) or '').strip()
+    if not key:
+        return None
+    if not KEY_PATTERN.match(key):
+        raise IdempotencyError(
+            f'{HEADER}는 영문·숫자·-·_ 200자 이내여야 합니다.', 400, 'invalid_idempotency_key'
+        )
+    return key
+
+
+def request_hash(data: Any) -> str:
+    """요청 본문 해시 (키 순서와 무관)"""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _redis_key(scope: str, user_id, key: str) -> str:
+    return f"{KEY_PREFIX}{scope}:{user_id}:{key}"
+
+
+def begin(scope: str, user_id, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    멱등성 키 선점 또는 저장된 응답 조회
+
+    처음 요청이면 키를 처리 중으로 표시(IDEMPOTENCY_LOCK_TTL)하고 None 반환 →
+    호출한 쪽은 처리 후 complete(성공) 또는 abandon(실패, 같은 키로 재시도 허용)을 호출.
+    Redis 장애 시에는 멱등성 보장 없이 처리하도록 None 반환 (fail-open).
+
+    Args:
+        scope: 엔드포인트 구분 (예: 'jobs:create')
+        user_id: 사용자 id (키는 사용자별)
+        key: Idempotency-Key
+        fingerprint: request_hash(요청 본문)
+
+    Returns:
+        {"status_code", "body"} (재시도 — 처음 응답 그대로) 또는 None
+
+    Raises:
+        IdempotencyError: 같은 키로 다른 요청 (422) / 처음 요청이 아직 처리 중 (409)
+    """
+    redis_key = _redis_key(scope, user_id, key)
+    pending = json.dumps({'hash': fingerprint, 'state': 'pending'})
+    try:
+        client = get_redis()
+        if client.set(redis_key, pending, nx=True, ex=settings.IDEMPOTENCY_LOCK_TTL):
+            return None
+        raw = client.get(redis_key)
+    except redis.RedisError as e:
+        logger.warning(f"멱등성 키 조회 실패, 중복 방지 없이 처리: {scope} - {e}")
+        return None
+
+    if raw is None:
+        # 조회 사이에 만료됨 — 처음 요청처럼 처리
+        return None
+    record = json.loads(raw)
+    if record.get('hash') != fingerprint:
+        raise IdempotencyError(
+            f'같은 {HEADER}로 다른 요청을 보낼 수 없습니다.', 422, 'idempotency_key_reused'
+        )
+    if record.get('state') != 'done':
+        raise IdempotencyError(
+            f'같은 {HEADER}의 요청이 아직 처리 중입니다. 잠시 후 다시 시도해 주세요.', 409, 'idempotency_key_in_progress'
+        )
+    return {'status_code': record['status_code'], 'body': record['body']}
+
+
+def complete(scope: str, user_id, key: str, fingerprint: str, status_code: int, body: Any) -> None:
+    """처리 결과 저장 (IDEMPOTENCY_TTL 동안 같은 키의 재시도에 그대로 반환, Redis 장애 시 저장하지 않음)"""
+    record = {'hash': fingerprint, 'state': 'done', 'status_code': status_code, 'body': body}
+    try:
+        get_redis().set(
+            _redis_key(scope, user_id, key),
+            json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder),
+            ex=settings.IDEMPOTENCY_TTL,
+        )
+    except redis.RedisError as e:
+        logger.warning(f"멱등성 응답 저장 실패: {scope} - {e}")
+
+
+def abandon(scope: str, user_id, key: str) -> None:
+    """처리 중 표시 해제 (실패한 요청은 저장하지 않음 — 같은 키로 다시 시도 가능)"""
+    try:
+        get_redis().delete(_redis_key(scope, user_id, key))
+    except redis.RedisError as e:
+        logger.warning(f"멱등성 키 해제 실패: {scope} - {e}")
+
+
+def replayed(status_code: int, body: Any) -> Response:
+    """재시도 요청에 대한 응답 (처음 응답 + Idempotent-Replayed 헤더)"""
+    response = Response(body, status=status_code)
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def run(request, scope: str, handler: Callable[[Optional[str]], Response], error_field: str = 'detail') -> Response:
+    """
+    DRF 뷰 처리를 멱등성 키로 감싸기
+
+    Idempotency-Key 헤더가 없으면 handler(None)를 그대로 실행.
+    헤더가 있으면 같은 키의 재시도에는 handler를 실행하지 않고 처음 응답을 반환하며,
+    2xx 응답만 저장 (4xx/5xx·예외는 저장하지 않아 같은 키로 다시 시도 가능).
+
+    Args:
+        request: DRF 요청 (인증된 사용자)
+        scope: 엔드포인트 구분
+        handler: 멱등성 키를 받아 응답을 만드는 함수
+        error_field: 멱등성 오류 응답 본문의 메시지 필드 ('detail' / 'error')
+
+    Returns:
+        Response
+    """
+    try:
+        key = get_key(request.headers)
+        if key is not None:
+            fingerprint = request_hash(request.data)
+            record = begin(scope, request.user.id, key, fingerprint)
+    except IdempotencyError as e:
+        return Response({error_field: e.message, 'error_code': e.error_code}, status=e.status_code)
+    if key is None:
+        return handler(None)
+    if record is not None:
+        return replayed(record['status_code'], record['body'])
+
+    try:
+        response = handler(key)
+    except Exception:
+        abandon(scope, request.user.id, key)
+        raise
+    if 200 <= response.status_code < 300:
+        complete(scope, request.user.id, key, fingerprint, response.status_code, response.data)
+    else:
+        abandon(scope, request.user.id, key)
+    return response
@@ -0,0 +1,55 @@
+# WEAV AI 공용 Redis 클라이언트
+# Django 캐시 API로 표현하기 어려운 원자적 연산(정렬 집합, 해시 카운터, Lua 스크립트 등)용
+
+import asyncio
+import os
+import threading
+import weakref
+import redis
+import redis.asyncio
+from django.conf import settings
+
+# 프로세스 공용 인스턴스 (prefork 워커는 fork 이후 자식마다 새로 생성)
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+# 이벤트 루프별 비동기 클라이언트 (커넥션은 루프에 묶임)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.asyncio.Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> redis.Redis:
+    """
+    프로세스 공용 Redis 클라이언트 가져오기 (싱글톤, 커넥션 풀 공유)
+
+    Returns:
+        redis.Redis 인스턴스 (REDIS_URL)
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                    health_check_interval=30,
+                )
+                _client_pid = pid
+    return _client
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """
+    현재 이벤트 루프의 공용 비동기 Redis 클라이언트 (pub/sub 등 ASGI 뷰용)
+
+    Returns:
+        redis.asyncio.Redis 인스턴스 (REDIS_URL)
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = redis.asyncio.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=2, health_check_interval=30)
+        _async_clients[loop] = client
+    return client
@@ -0,0 +1,33 @@
+# WEAV AI 비동기 스트리밍 뷰 공용 헬퍼
+# ASGI 비동기 뷰는 DRF 데코레이터를 쓸 수 없으므로 인증/SSE 포맷을 직접 처리
+
+import json
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+
+async def authenticate_jwt_async(request):
+    """비동기 뷰용 JWT 인증 (DRF 인증 클래스를 스레드에서 실행, 실패 시 None)"""
+    try:
+        result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def is_asgi_request(request) -> bool:
+    """
+    ASGI 서버(SERVER_MODE=asgi)로 받은 요청인지 여부
+
+    WSGI(gunicorn 동기 워커)에서는 StreamingHttpResponse가 버퍼링되어 SSE가 끝날 때 한 번에 전달되므로
+    프론트엔드는 이 값이 참일 때만 스트리밍 엔드포인트를 사용.
+    """
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
@@ -0,0 +1,42 @@
+# WEAV AI 테스트 유틸리티
+# 공용 Redis 클라이언트를 fakeredis(Lua 포함)로 바꿔 Redis 없이 원자적 연산·스크립트를 검증
+
+import os
+from unittest import mock
+import fakeredis
+from django.db import connections
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from weavai.apps.core import redis as core_redis
+
+# Django 캐시(Redis)를 쓰는 코드(폴러 락 등)는 로컬 메모리 캐시로
+LOCMEM_CACHES = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+})
+
+
+class FakeRedisMixin:
+    """테스트마다 빈 fakeredis로 get_redis()를 대체 (self.redis로 직접 조회)"""
+
+    def setUp(self):
+        super().setUp()
+        self.redis = fakeredis.FakeRedis()
+        for name, value in (('_client', self.redis), ('_client_pid', os.getpid())):
+            patcher = mock.patch.object(core_redis, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    프로젝트 테스트 러너
+
+    users 0002 마이그레이션은 PostgreSQL 전용 SQL(DROP COLUMN IF EXISTS)이라 SQLite 테스트 DB에서는
+    users 앱만 마이그레이션 없이 모델로 테이블을 만듦 (0002는 스키마 상태를 바꾸지 않으므로 결과는 같음).
+    """
+
+    def setup_databases(self, **kwargs):
+        if connections['default'].vendor != 'sqlite':
+            return super().setup_databases(**kwargs)
+        with override_settings(MIGRATION_MODULES={'users': None}):
+            return super().setup_databases(**kwargs)
@@ -7,6 +7,7 @@ from rest_framework import status
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
+from .streaming import is_asgi_request
 
 
 class HealthCheckView(APIView):
@@ -17,6 +18,7 @@ class HealthCheckView(APIView):
     - 서비스 상태 확인
     - 데이터베이스 연결 상태 확인
     - 캐시(Redis) 연결 상태 확인
+    - features.sse: SSE 스트리밍 사용 가능 여부 (ASGI 서버일 때만 참 — 프론트엔드가 폴링 대신 스트림 사용)
     """
 
     # 인증 불필요 (모니터링용)
@@ -29,7 +31,8 @@ class HealthCheckView(APIView):
             'status': 'healthy',
             'timestamp': None,  # ISO 형식 타임스탬프
             'version': '1.0.0',  # API 버전
-            'services': {}
+            'services': {},
+            'features': {'sse': is_asgi_request(request)},
         }
 
         # 데이터베이스 연결 확인
@@ -2,13 +2,16 @@
 # MinIO/S3 호환 스토리지 인터페이스
 
 import boto3
+import hashlib
 import logging
 from botocore.exceptions import ClientError
 from django.conf import settings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 
 logger = logging.getLogger(__name__)
 
+DELETE_OBJECTS_MAX_KEYS = 1000  # S3 delete_objects 요청당 최대 키 수
+
 
 class S3Storage:
     """
@@ -25,6 +28,8 @@ class S3Storage:
         """
         self.bucket_name = settings.AWS_STORAGE_BUCKET_NAME
         self.presigned_url_expiration = getattr(settings, 'PRESIGNED_URL_EXPIRATION', 3600)
+        # 멀티파트 업로드 파트 크기 (S3 최소 5MB, 마지막 파트 제외)
+        self.multipart_chunk_size = max(getattr(settings, 'AWS_S3_MULTIPART_CHUNKSIZE', 8 * 1024 * 1024), 5 * 1024 * 1024)
 
         # boto3 클라이언트 생성
         self.client = boto3.client(
@@ -88,6 +93,94 @@ class S3Storage:
             logger.error(f"S3 파일 업로드 실패: {key} - {e}")
             raise
 
+    def upload_stream(self, chunks: Iterable[bytes], key: str,
+                      content_type: str = 'application/octet-stream',
+                      metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        청크 스트림을 S3에 멀티파트로 업로드 (파일 전체를 메모리에 올리지 않음)
+
+        버퍼는 최대 파트 크기까지만 유지하고, 전체 크기가 파트 크기보다 작으면 put_object 한 번으로 처리.
+
+        Args:
+            chunks: 업로드할 바이너리 청크 이터러블
+            key: S3 객체 키 (경로)
+            content_type: MIME 타입
+            metadata: 추가 메타데이터
+
+        Returns:
+            업로드 정보 (key, size, sha256)
+
+        Raises:
+            ClientError: 업로드 실패 (진행 중인 멀티파트 업로드는 중단됨)
+        """
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': key,
+            'ContentType': content_type,
+        }
+        if metadata:
+            params['Metadata'] = metadata
+        if hasattr(settings, 'AWS_S3_OBJECT_PARAMETERS'):
+            params.update(settings.AWS_S3_OBJECT_PARAMETERS)
+
+        part_size = self.multipart_chunk_size
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+
+        def _upload_part(body: bytes) -> None:
+            part_number = len(parts) + 1
+            response = self.client.upload_part(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                hasher.update(chunk)
+                size += len(chunk)
+                buffer.extend(chunk)
+
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        upload_id = self.client.create_multipart_upload(**params)['UploadId']
+                        logger.info(f"S3 멀티파트 업로드 시작: {key}")
+                    _upload_part(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+
+            if upload_id is None:
+                # 파트 크기보다 작은 파일은 단일 업로드
+                self.client.put_object(Body=bytes(buffer), **params)
+            else:
+                if buffer:
+                    _upload_part(bytes(buffer))
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts},
+                )
+
+            logger.info(f"S3 스트림 업로드 성공: {key} ({size} bytes, {max(len(parts), 1)} parts)")
+            return {'key': key, 'size': size, 'sha256': hasher.hexdigest()}
+
+        except Exception as e:
+            logger.error(f"S3 스트림 업로드 실패: {key} - {e}")
+            if upload_id is not None:
+                try:
+                    self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+                except ClientError as abort_error:
+                    logger.warning(f"S3 멀티파트 업로드 중단 실패: {key} - {abort_error}")
+            raise
+
     def download_file(self, key: str) -> bytes:
         """
         S3에서 파일 다운로드
@@ -115,6 +208,33 @@ class S3Storage:
             logger.error(f"S3 파일 다운로드 실패: {key} - {e}")
             raise
 
+    def download_range(self, key: str, offset: int, length: int) -> bytes:
+        """
+        S3 객체의 일부 바이트만 다운로드 (Range 요청)
+
+        Args:
+            key: S3 객체 키
+            offset: 시작 바이트 위치
+            length: 읽을 바이트 수
+
+        Returns:
+            요청한 구간의 바이너리 데이터
+
+        Raises:
+            ClientError: 다운로드 실패
+        """
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Range=f"bytes={offset}-{offset + length - 1}",
+            )
+            return response['Body'].read()
+
+        except ClientError as e:
+            logger.error(f"S3 파일 구간 다운로드 실패: {key} ({offset}+{length}) - {e}")
+            raise
+
     def delete_file(self, key: str) -> None:
         """
         S3에서 파일 삭제
@@ -136,6 +256,38 @@ class S3Storage:
             logger.error(f"S3 파일 삭제 실패: {key} - {e}")
             raise
 
+    def delete_files(self, keys: Iterable[str]) -> List[str]:
+        """
+        여러 파일을 delete_objects로 일괄 삭제 (요청당 최대 1000개)
+
+        Args:
+            keys: S3 객체 키 목록
+
+        Returns:
+            삭제에 실패한 키 목록 (없는 키는 성공으로 처리됨)
+        """
+        keys = list(keys)
+        failed = []
+        for start in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS):
+            chunk = keys[start:start + DELETE_OBJECTS_MAX_KEYS]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True},
+                )
+            except ClientError as e:
+                logger.error(f"S3 일괄 삭제 실패: {len(chunk)}개 - {e}")
+                failed.extend(chunk)
+                continue
+
+            errors = response.get('Errors') or []
+            for error in errors:
+                logger.warning(f"S3 파일 삭제 실패: {error.get('Key')} - {error.get('Code')} {error.get('Message')}")
+            failed.extend(error.get('Key') for error in errors)
+
+        logger.debug(f"S3 일괄 삭제: {len(keys) - len(failed)}/{len(keys)}개 성공")
+        return failed
+
     def generate_presigned_url(self, key: str, expiration: Optional[int] = None) -> str:
         """
         S3 객체에 대한 임시 접근 URL 생성
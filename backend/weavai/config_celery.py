@@ -25,13 +25,53 @@ app.conf.beat_schedule = {
         'task': 'jobs.tasks.cleanup_old_jobs',
         'schedule': crontab(hour=0, minute=0),  # 매일 00:00
     },
+    # 매일 00:30에 오래된 종료 작업을 MinIO 세그먼트로 보관
+    'archive-old-jobs': {
+        'task': 'jobs.tasks.archive_old_jobs',
+        'schedule': crontab(hour=0, minute=30),  # 매일 00:30
+    },
+    # FAL Queue에 제출된 작업 상태를 일괄 폴링
+    'poll-fal-queue-jobs': {
+        'task': 'jobs.tasks.poll_fal_queue_jobs',
+        'schedule': float(os.getenv('FAL_QUEUE_POLL_INTERVAL', '10')),  # 기본 10초
+    },
+    # heartbeat가 끊긴 실행 중 작업 회수 (워커 유실 대비)
+    'reap-stuck-jobs': {
+        'task': 'jobs.tasks.reap_stuck_jobs',
+        'schedule': float(os.getenv('JOB_REAPER_INTERVAL', '60')),  # 기본 60초
+    },
 }
 
 # ===== 작업 라우팅 =====
-# 특정 작업을 특정 큐로 라우팅
-app.conf.task_routes = {
-    'jobs.tasks.cleanup_old_jobs': {'queue': 'maintenance'},
+# AI 작업은 모델 타입별 큐로 분리 (긴 비디오 작업이 짧은 텍스트 작업을 막지 않도록)
+# 워커 프로필은 infra/docker-compose.yml의 worker-text/worker-image/worker-video 참고
+AI_JOB_QUEUES = {
+    'text': 'ai_text',
+    'image': 'ai_image',
+    'video': 'ai_video',
 }
+# false면 모든 AI 작업을 기본 큐(celery)로 보냄 (단일 워커 개발 환경용)
+AI_JOB_QUEUE_ROUTING = os.getenv('AI_JOB_QUEUE_ROUTING', 'true').lower() == 'true'
+
+
+def route_ai_job(name, args, kwargs, options, task=None, **kw):
+    """run_ai_job을 model_type 인자에 맞는 큐로 라우팅 (model_type 없는 호출은 기본 큐)"""
+    if name != 'jobs.tasks.run_ai_job' or not AI_JOB_QUEUE_ROUTING:
+        return None
+    queue = AI_JOB_QUEUES.get((kwargs or {}).get('model_type'))
+    return {'queue': queue} if queue else None
+
+
+# 특정 작업을 특정 큐로 라우팅
+app.conf.task_routes = (
+    route_ai_job,
+    {
+        'jobs.tasks.cleanup_old_jobs': {'queue': 'maintenance'},
+        'jobs.tasks.archive_old_jobs': {'queue': 'maintenance'},
+        'jobs.tasks.reap_stuck_jobs': {'queue': 'maintenance'},
+        'jobs.tasks.cancel_fal_queue_request': {'queue': 'maintenance'},
+    },
+)
 
 # ===== 작업 설정 =====
 app.conf.task_acks_late = True          # 작업 완료 후 ACK
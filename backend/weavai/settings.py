@@ -4,6 +4,7 @@ Replace this with actual settings after setup.
 """
 
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from decouple import config, Csv
 import os
 
@@ -108,6 +109,9 @@ else:
         }
     }
 
+# 테스트 러너 (SQLite 테스트 DB에서는 PostgreSQL 전용 users 마이그레이션을 건너뜀)
+TEST_RUNNER = 'weavai.apps.core.testing.TestRunner'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -144,6 +148,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CORS settings
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://127.0.0.1:3000', cast=Csv())
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 # REST Framework
 REST_FRAMEWORK = {
@@ -206,9 +212,114 @@ AWS_LOCATION = 'media'
 # Use S3 for media files
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
+# 결과 파일 수집 (제공자 URL → MinIO 스트리밍)
+AWS_S3_MULTIPART_CHUNKSIZE = config('AWS_S3_MULTIPART_CHUNKSIZE', default=8 * 1024 * 1024, cast=int)  # 파트 크기 = 워커 버퍼 상한
+ARTIFACT_INGEST_CONCURRENCY = config('ARTIFACT_INGEST_CONCURRENCY', default=4, cast=int)  # 작업당 동시 수집 수
+
 # AI Service API Keys
 FAL_KEY = config('FAL_KEY', default='')
 
+# AI 제공자 HTTP 전송 계층 (FalClient·FalQueueClient 공용 keep-alive 커넥션 풀)
+# 풀 크기는 한 프로세스에서 동시에 제공자를 호출하는 스레드 수 이상 (Gunicorn 스레드, 폴러/수집 스레드 풀)
+FAL_HTTP_POOL_SIZE = config('FAL_HTTP_POOL_SIZE', default=16, cast=int)
+FAL_HTTP_CONNECT_TIMEOUT = config('FAL_HTTP_CONNECT_TIMEOUT', default=5, cast=float)
+FAL_HTTP_READ_TIMEOUT = config('FAL_HTTP_READ_TIMEOUT', default=60, cast=float)
+# 엔드포인트별 타임아웃 'endpoint=read' 또는 'endpoint=connect:read' (예: fal-ai/any-llm=5:60,queue/status=3:10)
+FAL_HTTP_ENDPOINT_TIMEOUTS = config('FAL_HTTP_ENDPOINT_TIMEOUTS', default='', cast=Csv())
+FAL_HTTP_SLOW_CALL_MS = config('FAL_HTTP_SLOW_CALL_MS', default=10000, cast=int)  # 이 시간 이상 걸린 호출은 warning 로그
+FAL_HTTP_ASYNC_MAX_CONNECTIONS = config('FAL_HTTP_ASYNC_MAX_CONNECTIONS', default=200, cast=int)  # ASGI 비동기 클라이언트 (이벤트 루프당)
+
+# 텍스트 완료 캐시 (temperature 0 또는 cache=true 요청만, Redis)
+AI_COMPLETION_CACHE_ENABLED = config('AI_COMPLETION_CACHE_ENABLED', default=True, cast=bool)
+AI_COMPLETION_CACHE_TTL = config('AI_COMPLETION_CACHE_TTL', default=3600, cast=int)  # 초
+AI_COMPLETION_CACHE_MAX_ENTRIES = config('AI_COMPLETION_CACHE_MAX_ENTRIES', default=10000, cast=int)  # 초과 시 오래된 항목부터 제거
+AI_COMPLETION_CACHE_MAX_ENTRY_BYTES = config('AI_COMPLETION_CACHE_MAX_ENTRY_BYTES', default=65536, cast=int)  # 이보다 큰 응답은 캐시하지 않음
+
+# 동일 생성 요청 병합 (single-flight, 프로세스 간 Redis 락)
+AI_SINGLE_FLIGHT_MODEL_TYPES = config('AI_SINGLE_FLIGHT_MODEL_TYPES', default='image,video', cast=Csv())  # 비우면 비활성화
+AI_SINGLE_FLIGHT_LOCK_TTL = config('AI_SINGLE_FLIGHT_LOCK_TTL', default=30, cast=int)  # 리더 락 TTL (초, 실행 중 자동 연장)
+AI_SINGLE_FLIGHT_WAIT_TIMEOUT = config('AI_SINGLE_FLIGHT_WAIT_TIMEOUT', default=900, cast=int)  # 대기자 최대 대기 (초)
+AI_SINGLE_FLIGHT_RESULT_TTL = config('AI_SINGLE_FLIGHT_RESULT_TTL', default=10, cast=int)  # 대기 중이던 요청이 결과를 가져갈 시간 (초, 대기자 폴링 간격 1초보다 길게)
+
+# 제공자 호출 속도 제한 (제공자·모델별 Redis 토큰 버킷, 모든 워커 공용 — 429를 받으면 속도를 줄였다가 성공할 때마다 회복)
+AI_RATE_LIMIT_ENABLED = config('AI_RATE_LIMIT_ENABLED', default=False, cast=bool)  # 제공자 한도(AI_RATE_LIMITS)를 확인한 뒤 켤 것
+AI_RATE_LIMIT_DEFAULT = config('AI_RATE_LIMIT_DEFAULT', default=10, cast=float)  # 모델당 초당 요청 수
+AI_RATE_LIMITS = config('AI_RATE_LIMITS', default='', cast=Csv())  # 모델(prefix)별 초당 요청 수 'fal-ai/sora-2=0.5,openai=20'
+AI_RATE_LIMIT_BURST = config('AI_RATE_LIMIT_BURST', default=2, cast=float)  # 버킷 크기 (초 단위 — 속도 × 이 값만큼 몰아서 호출 가능)
+AI_RATE_LIMIT_MAX_WAIT = config('AI_RATE_LIMIT_MAX_WAIT', default=20, cast=float)  # 토큰 대기 최대 시간 (초, 넘으면 작업은 큐로 되돌림)
+AI_RATE_LIMIT_DECREASE = config('AI_RATE_LIMIT_DECREASE', default=0.5, cast=float)  # 429마다 속도 × 이 값
+AI_RATE_LIMIT_MIN_FRACTION = config('AI_RATE_LIMIT_MIN_FRACTION', default=0.05, cast=float)  # 줄어든 속도의 하한 (기본 속도 대비)
+AI_RATE_LIMIT_RECOVERY = config('AI_RATE_LIMIT_RECOVERY', default=0.05, cast=float)  # 성공마다 기본 속도의 이 비율만큼 회복
+AI_RATE_LIMIT_COOLDOWN = config('AI_RATE_LIMIT_COOLDOWN', default=1, cast=float)  # 이 시간 안의 연속 429는 한 번만 감소 (초)
+AI_RATE_LIMIT_RETRY_DELAY = config('AI_RATE_LIMIT_RETRY_DELAY', default=30, cast=int)  # 한도 초과 작업 재실행 대기 (초, 재시도마다 2배)
+
+# 텍스트 생성 헤징 (모델별 최근 응답 시간 백분위까지 응답이 없으면 두 번째 요청, 먼저 성공한 응답 사용)
+AI_HEDGE_ENABLED = config('AI_HEDGE_ENABLED', default=False, cast=bool)
+AI_HEDGE_PERCENTILE = config('AI_HEDGE_PERCENTILE', default=0.95, cast=float)  # 이 백분위 응답 시간이 지나면 헤지 요청
+AI_HEDGE_MIN_DELAY = config('AI_HEDGE_MIN_DELAY', default=0.5, cast=float)  # 헤지 대기 하한 (초)
+AI_HEDGE_MAX_DELAY = config('AI_HEDGE_MAX_DELAY', default=30, cast=float)  # 헤지 대기 상한 (초)
+AI_HEDGE_SAMPLE_SIZE = config('AI_HEDGE_SAMPLE_SIZE', default=200, cast=int)  # 모델별 최근 응답 시간 표본 수 (프로세스별)
+AI_HEDGE_MIN_SAMPLES = config('AI_HEDGE_MIN_SAMPLES', default=20, cast=int)  # 표본이 이보다 적으면 헤징하지 않음
+AI_HEDGE_FALLBACK_MODELS = config('AI_HEDGE_FALLBACK_MODELS', default='', cast=Csv())  # 헤지 요청 대체 모델 'openai/gpt-4o-mini=google/gemini-flash-1.5' (없으면 같은 모델)
+AI_HEDGE_MAX_WORKERS = config('AI_HEDGE_MAX_WORKERS', default=32, cast=int)  # 동기 헤징 스레드 수 (프로세스별)
+
+# 제공자 서킷 브레이커 (제공자·엔드포인트별 Redis 상태 공유 — 오류·지연이 많으면 타임아웃까지 기다리지 않고 바로 503)
+AI_CIRCUIT_BREAKER_ENABLED = config('AI_CIRCUIT_BREAKER_ENABLED', default=True, cast=bool)
+AI_CIRCUIT_WINDOW = config('AI_CIRCUIT_WINDOW', default=60, cast=int)  # 오류율 집계 구간 (초)
+AI_CIRCUIT_MIN_CALLS = config('AI_CIRCUIT_MIN_CALLS', default=10, cast=int)  # 구간 내 이 횟수 이상 호출됐을 때만 판단
+AI_CIRCUIT_FAILURE_RATE = config('AI_CIRCUIT_FAILURE_RATE', default=0.5, cast=float)  # 연결 오류·타임아웃·5xx 비율
+AI_CIRCUIT_SLOW_RATE = config('AI_CIRCUIT_SLOW_RATE', default=0.5, cast=float)  # 느린 호출 비율
+AI_CIRCUIT_SLOW_FRACTION = config('AI_CIRCUIT_SLOW_FRACTION', default=0.8, cast=float)  # 읽기 타임아웃의 이 비율 이상 걸리면 느린 호출
+AI_CIRCUIT_OPEN_SECONDS = config('AI_CIRCUIT_OPEN_SECONDS', default=30, cast=int)  # 열린 뒤 확인 호출(half-open)까지 (초)
+
+# 멱등성 키 (Idempotency-Key 헤더 — 작업 생성·일괄 생성, 텍스트 완료 재시도는 처음 응답 반환)
+IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=86400, cast=int)  # 응답 보관 (초)
+IDEMPOTENCY_LOCK_TTL = config('IDEMPOTENCY_LOCK_TTL', default=300, cast=int)  # 처리 중 표시 (초, 가장 긴 동기 완료 호출보다 길게)
+
+# 사용자별 동시 작업 슬롯 (Redis 세마포어, 모델 타입별 한도 'video=2,image=4' — 없는 타입은 기본값)
+MAX_CONCURRENT_JOBS_PER_USER = config('MAX_CONCURRENT_JOBS_PER_USER', default=4, cast=int)
+JOB_SLOT_LIMITS = config('JOB_SLOT_LIMITS', default='', cast=Csv())
+JOB_SLOT_LEASE_SECONDS = config('JOB_SLOT_LEASE_SECONDS', default=900, cast=int)  # 워커가 죽으면 이 시간 후 슬롯 회수 (heartbeat·reaper·폴러가 연장 — 각 주기보다 길게)
+JOB_BATCH_MAX_SIZE = config('JOB_BATCH_MAX_SIZE', default=20, cast=int)  # POST /api/v1/jobs/batch/ 한 번에 생성 가능한 작업 수
+
+# 워커 유실 감지 (실행 중 heartbeat → reap_stuck_jobs가 끊긴 작업을 재실행/실패 처리)
+JOB_HEARTBEAT_INTERVAL = config('JOB_HEARTBEAT_INTERVAL', default=30, cast=int)  # 실행 중 heartbeat 갱신 간격 (초)
+JOB_HEARTBEAT_TIMEOUT = config('JOB_HEARTBEAT_TIMEOUT', default=180, cast=int)  # 이 시간 이상 heartbeat가 없으면 유실로 판단 (초)
+JOB_HEARTBEAT_TIMEOUTS = config('JOB_HEARTBEAT_TIMEOUTS', default='', cast=Csv())  # 모델 타입별 유실 판단 시간 'video=600,image=300'
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=2, cast=int)  # 유실 시 재실행을 포함한 최대 실행 횟수
+JOB_QUEUE_MAX_AGE = config('JOB_QUEUE_MAX_AGE', default=3600, cast=int)  # PENDING/IN_QUEUE로 이 시간 넘게 시작되지 않으면 실패 처리 (초, 큐 메시지 유실 대비)
+
+# 작업 상태 스트림 (GET /api/v1/jobs/<id>/events/, Redis pub/sub → SSE)
+JOB_EVENTS_MAX_SECONDS = config('JOB_EVENTS_MAX_SECONDS', default=300, cast=int)  # 연결당 최대 유지 시간 (이후 클라이언트 재연결)
+JOB_EVENTS_HEARTBEAT_SECONDS = config('JOB_EVENTS_HEARTBEAT_SECONDS', default=15, cast=int)  # ping 간격 (nginx proxy_read_timeout보다 짧게)
+
+# 오래된 종료 작업 보관 (archive_old_jobs → MinIO gzip JSONL 세그먼트 + ArchivedJob 색인, 켜져 있으면 cleanup_old_jobs는 삭제하지 않음)
+JOB_ARCHIVE_AFTER_DAYS = config('JOB_ARCHIVE_AFTER_DAYS', default=0, cast=int)  # 생성 후 며칠 지난 작업을 보관할지 (0이면 비활성화 — 켜면 cleanup_old_jobs 삭제 대신 보관)
+JOB_ARCHIVE_SEGMENT_SIZE = config('JOB_ARCHIVE_SEGMENT_SIZE', default=500, cast=int)  # 세그먼트당 작업 수
+
+# 오래된 작업 정리 (cleanup_old_jobs, 묶음마다 커밋)
+JOB_CLEANUP_BATCH_SIZE = config('JOB_CLEANUP_BATCH_SIZE', default=1000, cast=int)  # 묶음당 작업 수 (트랜잭션 크기)
+
+# 작업 단계별 소요 시간 집계 (Redis 일자별 히스토그램, GET /api/v1/jobs/stats/latency/)
+JOB_LATENCY_RETENTION_DAYS = config('JOB_LATENCY_RETENTION_DAYS', default=7, cast=int)  # 보관 일수 (조회 가능한 최대 기간)
+
+# 종료된 작업 상세 응답 캐시 (초, presigned URL 만료 전까지만)
+JOB_DETAIL_CACHE_TTL = config('JOB_DETAIL_CACHE_TTL', default=3600, cast=int)
+
+# FAL Queue 모드: 지정한 모델 타입(image,video)은 Queue에 제출 후 워커를 바로 반환하고
+# poll_fal_queue_jobs(Beat)가 진행 중인 요청들을 한 번에 폴링해 완료 처리
+FAL_QUEUE_MODEL_TYPES = config('FAL_QUEUE_MODEL_TYPES', default='', cast=Csv())
+FAL_QUEUE_POLL_CONCURRENCY = config('FAL_QUEUE_POLL_CONCURRENCY', default=16, cast=int)  # 상태 조회 스레드 수
+FAL_QUEUE_POLL_BATCH_SIZE = config('FAL_QUEUE_POLL_BATCH_SIZE', default=500, cast=int)   # 주기당 최대 조회 작업 수
+FAL_QUEUE_POLL_LOCK_TTL = config('FAL_QUEUE_POLL_LOCK_TTL', default=300, cast=int)       # 폴러 중복 실행 방지 락 (초)
+FAL_QUEUE_MAX_AGE = config('FAL_QUEUE_MAX_AGE', default=3600, cast=int)                 # 제출 후 이 시간 안에 끝나지 않으면 실패 처리 + 제공자 취소 (초)
+
+# FAL Queue 웹훅: 외부에서 접근 가능한 API 주소를 지정하면 완료 시 fal이 직접 호출
+# (설정 시 폴링은 FAL_WEBHOOK_POLL_FALLBACK_AFTER초 이상 갱신 없는 작업만 대상으로 하는 보조 수단)
+FAL_WEBHOOK_BASE_URL = config('FAL_WEBHOOK_BASE_URL', default='')
+FAL_WEBHOOK_SECRET = config('FAL_WEBHOOK_SECRET', default='')  # 비우면 SECRET_KEY로 서명
+FAL_WEBHOOK_POLL_FALLBACK_AFTER = config('FAL_WEBHOOK_POLL_FALLBACK_AFTER', default=120, cast=int)
+
 ENFORCE_MEMBERSHIP = False
 ENABLE_BILLING = False
 
@@ -411,7 +411,7 @@ export const ChatProvider: React.FC<{ children: React.ReactNode }> = ({ children
                 if (Date.now() - startedAt > maxWaitMs) {
                     throw new Error('텍스트 생성 시간이 초과되었습니다.');
                 }
-                const detail = await aiService.getJob(jobId, controller.signal);
+                const detail = await aiService.waitForJob(jobId, maxWaitMs - (Date.now() - startedAt), controller.signal, pollIntervalMs);
                 dlog('job status', { jobId, status: detail.status });
                 if (detail.status === 'COMPLETED') {
                     const text = detail.result?.text || '';
@@ -431,16 +431,17 @@ export const ChatProvider: React.FC<{ children: React.ReactNode }> = ({ children
                     });
                     break;
                 }
-                if (detail.status === 'FAILED') {
-                    dlog('job failed', { jobId, error: detail.error });
+                if (detail.status === 'FAILED' || detail.status === 'CANCELLED') {
+                    dlog('job failed', { jobId, status: detail.status, error: detail.error });
+                    const error = detail.error || (detail.status === 'CANCELLED' ? '텍스트 생성이 취소되었습니다.' : '텍스트 생성에 실패했습니다.');
                     await applyUpdate(prev => {
-                        const next = prev.map(m => m.id === botMessageId ? { ...m, content: detail.error || '텍스트 생성에 실패했습니다.', isStreaming: false } : m);
+                        const next = prev.map(m => m.id === botMessageId ? { ...m, content: error, isStreaming: false } : m);
                         const exists = prev.some(m => m.id === botMessageId);
                         if (exists) return next;
                         return [...next, {
                             id: botMessageId,
                             role: 'model',
-                            content: detail.error || '텍스트 생성에 실패했습니다.',
+                            content: error,
                             type: 'text',
                             timestamp: Date.now(),
                             isStreaming: false
@@ -500,7 +501,7 @@ export const ChatProvider: React.FC<{ children: React.ReactNode }> = ({ children
                 if (Date.now() - startedAt > maxWaitMs) {
                     throw new Error('이미지 생성 시간이 초과되었습니다.');
                 }
-                const detail = await aiService.getJob(jobId, controller.signal);
+                const detail = await aiService.waitForJob(jobId, maxWaitMs - (Date.now() - startedAt), controller.signal, pollIntervalMs);
                 dlog('job status', { jobId, status: detail.status });
                 if (detail.status === 'COMPLETED') {
                     const url = detail.result?.url || '';
@@ -526,8 +527,8 @@ export const ChatProvider: React.FC<{ children: React.ReactNode }> = ({ children
                     });
                     break;
                 }
-                if (detail.status === 'FAILED') {
-                    const error = detail.error || '이미지 생성에 실패했습니다.';
+                if (detail.status === 'FAILED' || detail.status === 'CANCELLED') {
+                    const error = detail.error || (detail.status === 'CANCELLED' ? '이미지 생성이 취소되었습니다.' : '이미지 생성에 실패했습니다.');
                     await applyUpdate(prev => {
                         const next = prev.map(m => m.id === botMessageId ? { ...m, content: error, isStreaming: false } : m);
                         const exists = prev.some(m => m.id === botMessageId);
@@ -16,6 +16,17 @@ const checkAccess = (user: any) => {
   return true;
 };
 
+// --- Job Types ---
+// 종료 상태 (이후 상태가 바뀌지 않음 — CANCELLED는 POST /api/v1/jobs/<id>/cancel/)
+export const TERMINAL_JOB_STATUSES = ['COMPLETED', 'FAILED', 'CANCELLED'];
+export const isTerminalJobStatus = (status: string) => TERMINAL_JOB_STATUSES.includes(status);
+
+export interface JobDetail {
+  status: string;
+  result?: { text?: string; url?: string; type?: string };
+  error?: string;
+}
+
 // --- Main Service Export ---
 export const aiService = {
   /**
@@ -222,12 +233,52 @@ export const aiService = {
     return job.id;
   },
 
-  getJob: async (jobId: string, signal?: AbortSignal): Promise<{ status: string; result?: { text?: string; url?: string; type?: string }; error?: string }> => {
-    return (await apiClient.get(`/api/v1/jobs/${jobId}/`, { signal })) as {
-      status: string;
-      result?: { text?: string; url?: string; type?: string };
-      error?: string;
-    };
+  getJob: async (jobId: string, signal?: AbortSignal): Promise<JobDetail> => {
+    return (await apiClient.get(`/api/v1/jobs/${jobId}/`, { signal })) as JobDetail;
+  },
+
+  /**
+   * 작업 종료(COMPLETED/FAILED/CANCELLED)까지 대기
+   * 기본은 상세 조회 폴링 — 서버가 ASGI 모드(apiClient.supportsStreaming)일 때만 상태 스트림(SSE)으로
+   * 완료를 즉시 받고, 스트림이 끊기거나 서버가 unavailable 이벤트(Redis 구독 실패)를 보내면 폴링으로 대체.
+   * 종료 상태 없이 스트림이 닫히면 pollIntervalMs만큼 기다린 뒤 다시 연결.
+   * 제한 시간이 지나면 마지막으로 받은 상태를 반환.
+   */
+  waitForJob: async (jobId: string, timeoutMs: number, signal?: AbortSignal, pollIntervalMs: number = 1500): Promise<JobDetail> => {
+    const deadline = Date.now() + timeoutMs;
+    let last: JobDetail = { status: 'IN_QUEUE' };
+
+    if (await apiClient.supportsStreaming()) {
+      try {
+        // 서버가 일정 시간 후 스트림을 닫으면 잠시 뒤 다시 연결
+        let unavailable = false;
+        while (!unavailable && Date.now() < deadline && !signal?.aborted) {
+          const events = apiClient.stream<JobDetail>(`/api/v1/jobs/${jobId}/events/`, undefined, { method: 'GET', signal });
+          for await (const { event, data } of events) {
+            if (event === 'status') {
+              last = { ...last, ...data };
+              if (isTerminalJobStatus(last.status)) return last;
+            }
+            if (event === 'unavailable') unavailable = true;
+            if (Date.now() >= deadline) return last;
+          }
+          if (!unavailable) await new Promise(r => setTimeout(r, pollIntervalMs));
+        }
+        if (!unavailable) return last;
+        console.warn('Job event stream unavailable, falling back to polling');
+      } catch (e) {
+        if (signal?.aborted) throw e;
+        console.warn('Job event stream unavailable, falling back to polling:', e);
+      }
+    }
+
+    while (Date.now() < deadline) {
+      if (signal?.aborted) return last;
+      last = await aiService.getJob(jobId, signal);
+      if (isTerminalJobStatus(last.status)) return last;
+      await new Promise(r => setTimeout(r, pollIntervalMs));
+    }
+    return last;
   },
 
   createImageJob: async (model: AIModel, prompt: string, signal?: AbortSignal): Promise<string> => {
@@ -273,7 +324,7 @@ export const aiService = {
       if (Date.now() - startedAt > maxWaitMs) {
         throw new Error('비디오 생성 시간이 초과되었습니다.');
       }
-      const detail = (await apiClient.get(`/api/v1/jobs/${jobId}/`, { signal })) as { status: string; result?: { url?: string; text?: string }; error?: string };
+      const detail = await aiService.waitForJob(jobId, maxWaitMs - (Date.now() - startedAt), signal, pollIntervalMs);
       if (detail.status === 'COMPLETED') {
         if (detail.result?.url) return detail.result.url;
         throw new Error('비디오 생성 결과를 받지 못했습니다.');
@@ -281,6 +332,9 @@ export const aiService = {
       if (detail.status === 'FAILED') {
         throw new Error(detail.error || '비디오 생성에 실패했습니다.');
       }
+      if (detail.status === 'CANCELLED') {
+        throw new Error('비디오 생성이 취소되었습니다.');
+      }
       await new Promise(r => setTimeout(r, pollIntervalMs));
     }
   },
@@ -313,7 +367,7 @@ export const aiService = {
       if (Date.now() - startedAt > maxWaitMs) {
         throw new Error('이미지 생성 시간이 초과되었습니다.');
       }
-      const detail = (await apiClient.get(`/api/v1/jobs/${jobId}/`, { signal })) as { status: string; result?: { url?: string; text?: string }; error?: string };
+      const detail = await aiService.waitForJob(jobId, maxWaitMs - (Date.now() - startedAt), signal, pollIntervalMs);
       if (detail.status === 'COMPLETED') {
         if (detail.result?.url) return detail.result.url;
         throw new Error('이미지 생성 결과를 받지 못했습니다.');
@@ -321,13 +375,17 @@ export const aiService = {
       if (detail.status === 'FAILED') {
         throw new Error(detail.error || '이미지 생성에 실패했습니다.');
       }
+      if (detail.status === 'CANCELLED') {
+        throw new Error('이미지 생성이 취소되었습니다.');
+      }
       await new Promise(r => setTimeout(r, pollIntervalMs));
     }
   },
 
   /**
-   * Generate Text (백엔드 Gateway - 일반 POST 응답)
-   * 스트리밍 없이 전체 응답을 한 번에 받아서 반환
+   * Generate Text (백엔드 Gateway)
+   * 서버가 ASGI 모드(apiClient.supportsStreaming)면 SSE로 토큰 단위 수신,
+   * 아니면 일반 POST 응답으로 전체 텍스트를 한 번에 반환 (WSGI는 스트림을 버퍼링)
    */
   generateTextStream: async function* (model: AIModel, prompt: string, history: Message[] = [], systemInstruction?: string, user?: any, signal?: AbortSignal) {
     try {
@@ -349,8 +407,7 @@ export const aiService = {
           content: msg.content
         }));
 
-      // 백엔드 Gateway 호출
-      const result = await apiClient.post('/api/v1/chat/complete/', {
+      const body = {
         provider,
         model: model.model,
         input_text: prompt,
@@ -358,25 +415,35 @@ export const aiService = {
         history: historyArray,
         temperature: 0.7,
         max_output_tokens: 1024
-      }, { signal }) as { text?: string; error?: string };
+      };
 
-      if (result.error) {
-        yield `\n[오류: ${result.error}]`;
+      if (!(await apiClient.supportsStreaming())) {
+        const result = (await apiClient.post('/api/v1/chat/complete/', body, { signal })) as { text?: string };
+        if (signal?.aborted) return;
+        yield result.text ? result.text : `\n[오류: 응답이 비어있습니다]`;
         return;
       }
 
-      if (!result.text) {
-        yield `\n[오류: 응답이 비어있습니다]`;
-        return;
-      }
+      // 백엔드 Gateway 스트리밍 호출 (SSE)
+      const events = apiClient.stream('/api/v1/chat/complete/stream/', body, { signal });
 
-      // 전체 텍스트를 한 글자씩 yield (UX 유지)
-      // TODO: 향후 백엔드 SSE 스트리밍 지원 시 실제 스트리밍으로 변경
-      for (const char of result.text) {
+      let received = false;
+      for await (const { event, data } of events) {
         if (signal?.aborted) break;
-        yield char;
-        // 약간의 딜레이로 자연스러운 타이핑 효과
-        await new Promise(resolve => setTimeout(resolve, 10));
+        if (event === 'delta' && data?.text) {
+          received = true;
+          yield data.text as string;
+        } else if (event === 'error') {
+          yield `\n[오류: ${data?.error || 'API Error'}]`;
+          return;
+        } else if (event === 'done') {
+          if (!received && !data?.text) {
+            yield `\n[오류: 응답이 비어있습니다]`;
+          } else if (!received) {
+            yield data.text as string;
+          }
+          return;
+        }
       }
     } catch (error: any) {
       if (signal?.aborted) return;
@@ -90,6 +90,7 @@ export class APIError extends Error {
  */
 class APIClient {
     private baseURL: string;
+    private streamingSupport?: Promise<boolean>;
     
     constructor(baseURL: string) {
         this.baseURL = baseURL;
@@ -232,6 +233,90 @@ class APIClient {
     async delete<T>(endpoint: string, options?: RequestInit): Promise<T> {
         return this.request<T>('DELETE', endpoint, undefined, options);
     }
+
+    /**
+     * 서버가 SSE를 버퍼링 없이 전달하는지 (GET /api/v1/health/의 features.sse — ASGI 모드에서만 참)
+     * WSGI 서버는 스트림을 끝날 때 한 번에 보내므로 이 값이 거짓이면 폴링/일반 응답 사용.
+     * 성공한 결과만 캐시하고, 조회 실패 시 false.
+     */
+    supportsStreaming(): Promise<boolean> {
+        if (!this.streamingSupport) {
+            this.streamingSupport = this.get<{ features?: { sse?: boolean } }>('/api/v1/health/')
+                .then(health => Boolean(health?.features?.sse))
+                .catch(() => {
+                    this.streamingSupport = undefined;
+                    return false;
+                });
+        }
+        return this.streamingSupport;
+    }
+
+    /**
+     * Server-Sent Events 스트림 수신 (기본 POST, options.method로 GET 가능)
+     * 각 이벤트를 { event, data } 형태로 yield (data는 JSON 파싱)
+     */
+    async *stream<T = any>(endpoint: string, data?: any, options?: RequestInit): AsyncGenerator<{ event: string; data: T }> {
+        const url = `${this.baseURL}${endpoint}`;
+        const send = async () => fetch(url, {
+            method: options?.method || 'POST',
+            headers: {
+                ...(await this.getAuthHeaders()),
+                'Accept': 'text/event-stream',
+                ...(options?.headers || {}),
+            },
+            body: data ? JSON.stringify(data) : undefined,
+            signal: options?.signal,
+        });
+
+        let response = await send();
+        if (response.status === 401) {
+            const newToken = await tokenManager.refreshAccessToken();
+            if (!newToken) {
+                tokenManager.clearTokens();
+                throw new APIError('인증이 만료되었습니다. 다시 로그인해주세요.', 401);
+            }
+            response = await send();
+        }
+
+        if (!response.ok || !response.body) {
+            const { message, data } = await this.parseError(response);
+            throw new APIError(message, response.status, data);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                // 이벤트는 빈 줄로 구분
+                let boundary = buffer.indexOf('\n\n');
+                while (boundary !== -1) {
+                    const frame = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    boundary = buffer.indexOf('\n\n');
+
+                    let event = 'message';
+                    const dataLines: string[] = [];
+                    for (const line of frame.split('\n')) {
+                        if (line.startsWith('event:')) event = line.slice(6).trim();
+                        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+                    }
+                    if (dataLines.length === 0) continue;
+                    try {
+                        yield { event, data: JSON.parse(dataLines.join('\n')) as T };
+                    } catch {
+                        // JSON이 아닌 이벤트는 무시
+                    }
+                }
+            }
+        } finally {
+            reader.releaseLock();
+        }
+    }
 }
 
 export { API_BASE_URL };